@@ -1,6 +1,52 @@
-from webview.wireframe import WebApp
+import argparse
+import sys
+
+
+def parse_arguments():
+    '''
+    Command line options for the headless batch export, the materialized views, the profiling mode and the golden regression outputs, without options the streamlit WebApp is started.
+    '''
+    parser = argparse.ArgumentParser(description="Social Benefits dashboard, or a headless export of its figures with --export")
+    parser.add_argument("--export", metavar="OUTPUT_DIR", help="write every dashboard figure for each report variant to OUTPUT_DIR")
+    parser.add_argument("--formats", nargs="+", default=["html", "json"], choices=["html", "json", "png"], help="export file formats")
+    parser.add_argument("--regions", action="append", metavar="NAME=LAND,LAND", help="named Bundesland set, repeatable, all Bundesländer when omitted")
+    parser.add_argument("--workers", type=int, default=None, help="number of export processes")
+    parser.add_argument("--profile", metavar="OUTPUT_DIR", help="profile headless WebApp reruns and write flame graphs and a hot-function report to OUTPUT_DIR")
+    parser.add_argument("--profile-runs", type=int, default=3, help="number of profiled reruns")
+    parser.add_argument("--golden", nargs="?", const="unittests/golden", metavar="GOLDEN_DIR", help="snapshot the derived frames and figure data arrays of the pandas pipeline into GOLDEN_DIR")
+    parser.add_argument("--precompute", nargs="?", const="data/materialized_views.npz", metavar="VIEWS_FILE", help="materialize the aggregates of every sidebar combination into VIEWS_FILE")
+
+    arguments, _ = parser.parse_known_args()
+    return arguments
 
 
 if __name__ == "__main__":
-    WebApp()
+    arguments = parse_arguments()
+
+    if arguments.precompute:
+        from visualizations import pa, sub_benefits, MaterializedViews
+
+        MaterializedViews.precompute(pa, sub_benefits).save(arguments.precompute)
+    elif arguments.golden:
+        from visualizations.regression import write_golden
+
+        write_golden(arguments.golden)
+    elif arguments.profile:
+        from webview.profiling import profile_dashboard
+
+        sys.exit(profile_dashboard(arguments.profile, runs=arguments.profile_runs))
+    elif arguments.export:
+        from webview.batch import batch_export, default_variants
+
+        region_sets = {}
+        for region_set in arguments.regions or []:
+            name, _, regions = region_set.partition("=")
+            region_sets[name] = [region.strip() for region in regions.split(",") if region.strip()]
+
+        _, failures = batch_export(default_variants(region_sets), arguments.export, formats=arguments.formats, workers=arguments.workers)
+        if failures:
+            sys.exit(1)
+    else:
+        from webview.wireframe import WebApp
 
+        WebApp()
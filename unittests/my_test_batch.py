@@ -0,0 +1,79 @@
+import os
+import json
+import tempfile
+import unittest
+from unittest import mock
+from visualizations import pa
+from visualizations.views import VALUE_MEASURES
+from webview import figures
+from webview.batch import default_variants, export_variant, batch_export
+
+class TestBatchExport(unittest.TestCase):
+    """
+    Unit tests for the headless batch export of the dashboard figures
+    """
+
+    def setUp(self):
+        """
+        Setting up a temporary export folder and a boundary file for the choropleth
+        """
+        self.folder = tempfile.TemporaryDirectory()
+        self.output_dir = os.path.join(self.folder.name, "export")
+        self.geojson = os.path.join(self.folder.name, "geo.json")
+
+        features = [{"type": "Feature", "properties": {"name": land}, "geometry": {"type": "Polygon", "coordinates": [[[index, 0], [index + 1, 0], [index + 1, 1], [index, 0]]]}} for index, land in enumerate(pa.Länder_df["Länder"])]
+        with open(self.geojson, "w") as geo_file:
+            json.dump({"type": "FeatureCollection", "features": features}, geo_file)
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_default_variants(self):
+        """
+        Testing default_variants to ensure every benefit type and value measure is combined with each region set under a file system friendly name
+        """
+        variants = default_variants({"east": ["Berlin", "Sachsen"], "all": []})
+        self.assertEqual(len(variants), pa.df["PublicAssistance"].nunique() * len(VALUE_MEASURES) * 2)
+        self.assertEqual(len({variant["name"] for variant in variants}), len(variants))
+        self.assertTrue(all(" " not in variant["name"] and "/" not in variant["name"] for variant in variants))
+        self.assertEqual(variants[0]["regions"], ["Berlin", "Sachsen"])
+
+        self.assertEqual([variant["regions"] for variant in default_variants()][0], list(pa.Länder_df["Länder"].unique()))
+
+    def test_export_variant(self):
+        """
+        Testing export_variant to ensure every figure is written and a failing figure is reported without stopping the others
+        """
+        variant = default_variants()[0]
+
+        with mock.patch.object(figures, "GEOJSON_PATH", self.geojson):
+            written, failures = export_variant(variant, self.output_dir, ("json",))
+        self.assertEqual(failures, [])
+        self.assertEqual(sorted(os.path.basename(path) for path in written), sorted(f"{name}.json" for name in figures.DashboardFigures.figure_names))
+        self.assertTrue(all(os.path.getsize(path) > 0 for path in written))
+
+        with mock.patch.object(figures, "GEOJSON_PATH", os.path.join(self.folder.name, "missing.geo.json")):
+            written, failures = export_variant(variant, self.output_dir, ("json",))
+        self.assertEqual(len(written), len(figures.DashboardFigures.figure_names) - 1)
+        self.assertEqual(len(failures), 1)
+        self.assertIn(f"{variant['name']}/choropleth: FileNotFoundError", failures[0])
+
+    def test_batch_export(self):
+        """
+        Testing batch_export to ensure the worker processes write every variant and collect the failures of each variant
+        """
+        variants = default_variants({"east": ["Berlin", "Sachsen"]})[:2]
+
+        with mock.patch.object(figures, "GEOJSON_PATH", self.geojson):
+            written, failures = batch_export(variants, self.output_dir, formats=["json"], workers=2)
+        self.assertEqual(failures, [])
+        self.assertEqual(len(written), len(variants) * len(figures.DashboardFigures.figure_names))
+        self.assertEqual(sorted(os.listdir(self.output_dir)), sorted(variant["name"] for variant in variants))
+
+        with mock.patch.object(figures, "GEOJSON_PATH", os.path.join(self.folder.name, "missing.geo.json")):
+            written, failures = batch_export(variants, self.output_dir, formats=["json"], workers=2)
+        self.assertEqual(len(failures), len(variants))
+        self.assertEqual(len(written), len(variants) * (len(figures.DashboardFigures.figure_names) - 1))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,9 @@
 import unittest
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 import pandas as pd
 from visualizations import PublicAssistance, BasicSecurity
+from visualizations.eda import Dataset
 
 class TestPublicAssistance(unittest.TestCase):
     """
@@ -39,7 +42,122 @@ class TestPublicAssistance(unittest.TestCase):
         self.assertIn("Expenditure(TEUR)", grouped_df.columns)
         self.assertIn("Revenue(TEUR)", grouped_df.columns)
         self.assertIn("NetExpenditure(TEUR)", grouped_df.columns)
-        
+
+    def test_stream_processing(self):
+        """
+        Testing the stream_processing method to ensure the chunked aggregation matches the eager pipeline
+        """
+        cols = ["Expenditure(TEUR)", "Revenue(TEUR)", "NetExpenditure(TEUR)"]
+        self.pa.dtype_conversion(*cols)
+        self.pa.filter_data()
+        expected_df = self.pa.data_group(cols=cols, group_element="Länder")
+
+        streamed = PublicAssistance("data/public_assistance.csv", ";", 5, 7, chunksize=10)
+        grouped_frames = streamed.stream_processing(numeric_cols=cols, group_elements=["Länder"], columns=["Year", "Länder", "TypeCode", "PublicAssistance", *cols])
+        pd.testing.assert_frame_equal(grouped_frames["Länder"], expected_df)
+        pd.testing.assert_frame_equal(streamed.Länder_df, expected_df)
+
+    def test_reported_values(self):
+        """
+        Testing the reported_values method to ensure placeholders stay NaN, the frame survives dtype_conversion and reading it from the file gives the same frame
+        """
+        cols = ["Expenditure(TEUR)", "Revenue(TEUR)", "NetExpenditure(TEUR)"]
+        columns = ["Year", "Länder", "TypeCode", "PublicAssistance", *cols]
+        reported_df = self.pa.reported_values(cols, data=self.pa.df, columns=columns)
+        self.pa.dtype_conversion(*cols)
+        self.pa.filter_data()
+
+        self.assertIs(self.pa.reported_df, reported_df)
+        self.assertTrue(reported_df.loc[reported_df["TypeCode"] == "SOZ-04", cols].isna().all().all())
+        self.assertTrue((self.pa.df.loc[self.pa.df["TypeCode"] == "SOZ-04", cols] == 0).all().all())
+
+        streamed = PublicAssistance("data/public_assistance.csv", ";", 5, 7, chunksize=10)
+        pd.testing.assert_frame_equal(streamed.reported_values(cols, columns=columns), reported_df, check_dtype=False)
+
+    def test_stream_retained_rows(self):
+        """
+        Testing the retained rows of stream_processing to ensure they equal the eager dataframe and keep the same index layout without the Total filter
+        """
+        cols = ["Expenditure(TEUR)", "Revenue(TEUR)", "NetExpenditure(TEUR)"]
+        self.pa.dtype_conversion(*cols)
+        self.pa.filter_data()
+
+        for filter_total in (True, False):
+            streamed = PublicAssistance("data/public_assistance.csv", ";", 5, 7, chunksize=10)
+            streamed.stream_processing(numeric_cols=cols, group_elements=["Länder"], columns=["Year", "Länder", "TypeCode", "PublicAssistance", *cols], filter_total=filter_total, retain_rows=True)
+            self.assertEqual(list(streamed.df.columns), list(self.pa.df.columns))
+            pd.testing.assert_index_equal(streamed.df.index, pd.RangeIndex(len(streamed.df)))
+
+            if filter_total:
+                pd.testing.assert_frame_equal(streamed.df, self.pa.df)
+
+        with self.assertRaises(TypeError):
+            Dataset("data/public_assistance.csv", ";", 5, 7)
+
+    def test_artifact_eviction(self):
+        """
+        Testing the artifact registry to ensure the least recently used derived frame is evicted beyond the byte budget and rebuilt on access
+        """
+        cols = ["Expenditure(TEUR)", "Revenue(TEUR)", "NetExpenditure(TEUR)"]
+        self.pa.dtype_conversion(*cols)
+        self.pa.filter_data()
+        expected_df = self.pa.data_group(cols=cols, group_element="Länder")
+
+        self.pa.max_artifact_bytes = self.pa.memory_usage()
+        self.pa.data_group(cols=cols, group_element="PublicAssistance")
+
+        report = self.pa.artifact_report().set_index("artifact")
+        self.assertFalse(report.loc["Länder_df", "resident"])
+        self.assertLessEqual(self.pa.memory_usage(), self.pa.max_artifact_bytes)
+        self.assertFalse(hasattr(self.pa, "__dict__"))
+
+        pd.testing.assert_frame_equal(self.pa.Länder_df, expected_df)
+        self.assertFalse(self.pa.artifact_report().set_index("artifact").loc["PublicAssistance_df", "resident"])
+
+    def test_concurrent_artifacts(self):
+        """
+        Testing the artifact registry to ensure session threads rebuilding and evicting frames at the same time always receive the frame
+        """
+        cols = ["Expenditure(TEUR)", "Revenue(TEUR)", "NetExpenditure(TEUR)"]
+        self.pa.dtype_conversion(*cols)
+        self.pa.filter_data()
+        expected = {"Länder_df": self.pa.data_group(cols=cols, group_element="Länder")}
+        self.pa.max_artifact_bytes = self.pa.memory_usage()
+        expected["PublicAssistance_df"] = self.pa.data_group(cols=cols, group_element="PublicAssistance")
+
+        def read(name):
+            for _ in range(20):
+                pd.testing.assert_frame_equal(self.pa.artifact(name), expected[name])
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            futures = [executor.submit(read, name) for name in list(expected) * 4]
+        for future in futures:
+            self.assertIsNone(future.result())
+        self.assertLessEqual(self.pa.memory_usage(), self.pa.max_artifact_bytes)
+
+    def test_memoized_data_group(self):
+        """
+        Testing the memoized data_group to ensure results are reused for the same df_version and recomputed once filter_data mutates the dataframe
+        """
+        cols = ["Expenditure(TEUR)", "Revenue(TEUR)", "NetExpenditure(TEUR)"]
+        self.pa.dtype_conversion(*cols)
+
+        grouped_df = self.pa.data_group(cols=cols, group_element="Länder")
+        expenditure_df = self.pa.data_group(cols=cols[:1], group_element="Länder")
+        self.assertIs(self.pa.Länder_df, expenditure_df)
+
+        self.assertIs(self.pa.data_group(cols=cols, group_element="Länder"), grouped_df)
+        self.assertIs(self.pa.Länder_df, grouped_df)
+
+        version = self.pa.df_version
+        self.pa.filter_data()
+        self.assertGreater(self.pa.df_version, version)
+
+        self.assertNotIn("Total", self.pa.Länder_df["Länder"].values)
+        filtered_df = self.pa.data_group(cols=cols, group_element="Länder")
+        self.assertIsNot(filtered_df, grouped_df)
+        self.assertNotIn("Total", filtered_df["Länder"].values)
+
 class TestBasicSecurity(unittest.TestCase):
     """
     Unit tests for the BasicSecurity class.
@@ -63,6 +181,65 @@ class TestBasicSecurity(unittest.TestCase):
         pivot_table = self.bsc.pivot_table(columns=["Q1", "Q2", "Q3", "Q4"], group_element=["Länder", "Gender"], values="Total", index="Gender", column_header="Länder")
         self.assertIsNotNone(pivot_table)
         self.assertFalse(pivot_table.empty)
-        
+
+    def test_max_quarterly_assessment(self):
+        """
+        Testing the max_quarterly_assessment method to ensure the long format frame matches pd.melt and the maximum matches the quarter columns, also with a missing quarter
+        """
+        self.bsc.pivot_table(columns=["Q1", "Q2", "Q3", "Q4"], group_element=["Länder", "Gender"], values="Total", index="Gender", column_header="Länder")
+        cols = ["Länder", "Q1", "Q2", "Q3", "Q4"]
+        melted_df, max_value = self.bsc.max_quarterly_assessment(data=self.bsc.LänderGender_df, cols=cols, var_assignment="Quarter", value_name="Value")
+        expected_df = pd.melt(self.bsc.LänderGender_df[cols], id_vars=["Länder"], var_name="Quarter", value_name="Value")
+        pd.testing.assert_frame_equal(melted_df.astype({"Länder": object, "Quarter": object}), expected_df)
+        self.assertEqual(max_value, self.bsc.LänderGender_df[cols[1:]].max().max())
+
+        gaps_df = self.bsc.LänderGender_df[cols].astype({col: "float64" for col in cols[1:]})
+        gaps_df.loc[gaps_df.index[0], "Q1"] = np.nan
+        melted_df, max_value = self.bsc.max_quarterly_assessment(data=gaps_df, cols=cols, var_assignment="Quarter", value_name="Value")
+        self.assertEqual(max_value, gaps_df[cols[1:]].max().max())
+        self.assertEqual(melted_df["Value"].isna().sum(), 1)
+
+    def test_period_aggregation(self):
+        """
+        Testing the period_aggregation method to ensure every reference period is ingested, the streamed sums match the reference year quarters and the periods_df of file_processing, and the unreported quarters stay missing
+        """
+        read_df = self.bsc.periods_df
+        periods_df = self.bsc.period_aggregation(breakdowns=["Gender"], chunksize=5)
+        self.assertEqual(periods_df["Period"].nunique(), 40)
+        self.assertNotIn("Total", periods_df["Gender"].values)
+        streamed_q1 = periods_df.loc[periods_df["Period"] == "2022-Q1", "Value"].sum()
+        self.assertEqual(streamed_q1, self.bsc.df["Q1"].sum())
+        pd.testing.assert_frame_equal(periods_df, read_df)
+        self.assertTrue(periods_df.loc[periods_df["Period"] == "2024-Q4", "Value"].isna().all())
+
+    def test_pivot_table_artifact(self):
+        """
+        Testing that the pivot table is registered as pivot_df, rebuilt after eviction, and that pivot_table stays callable
+        """
+        kwargs = dict(columns=["Q1", "Q2", "Q3", "Q4"], group_element=["Länder", "Gender"], values="Total", index="Gender", column_header="Länder")
+        expected_df = self.bsc.pivot_table(**kwargs)
+        self.assertIs(self.bsc.pivot_df, expected_df)
+        self.assertIs(self.bsc.pivot_table(**kwargs), expected_df)
+
+        self.bsc.evict("pivot_df")
+        self.bsc.evict("LänderGender_df")
+        pd.testing.assert_frame_equal(self.bsc.pivot_df, expected_df)
+        self.assertIn("LänderGender_df", self.bsc.artifacts)
+
+    def test_df_change_rebuilds_artifacts(self):
+        """
+        Testing that assigning a new df drops the frames derived from the previous one, rebuilds them from the new df and keeps the periods_df read from the file
+        """
+        kwargs = dict(columns=["Q1", "Q2", "Q3", "Q4"], group_element=["Länder", "Gender"], values="Total", index="Gender", column_header="Länder")
+        self.bsc.pivot_table(**kwargs)
+        periods_df = self.bsc.periods_df
+
+        self.bsc.df = self.bsc.df[self.bsc.df["Länder"] == "Berlin"]
+        self.assertNotIn("pivot_df", self.bsc.artifacts)
+        self.assertEqual(list(self.bsc.pivot_df.columns), ["Berlin"])
+        self.assertEqual(list(self.bsc.LänderGender_df["Länder"].unique()), ["Berlin"])
+        self.assertEqual(list(self.bsc.pivot_table(**kwargs).columns), ["Berlin"])
+        self.assertIs(self.bsc.periods_df, periods_df)
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,86 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+from visualizations import pa, bsc, sub_benefits, registry, Visuals, JoinedGrid, Snapshot
+
+class TestJoinedGrid(unittest.TestCase):
+    """
+    Unit tests for the JoinedGrid aligning the three datasets, compared against pandas merges of the dataframes
+    """
+
+    def setUp(self):
+        """
+        Setting up the test environment with the grid of the processed datasets
+        """
+        self.grid = JoinedGrid.build(pa, bsc, sub_benefits)
+
+    def test_net_per_recipient(self):
+        """
+        Testing the per-recipient metric to ensure it matches the merge of the subsistence expenditure and recipients
+        """
+        expenditure = pa.df[pa.df["TypeCode"] == "SOZ-03"][["Länder", "Year", "NetExpenditure(TEUR)"]]
+        merged = expenditure.merge(sub_benefits.df[["Länder", "Year", "Total"]], on=["Länder", "Year"])
+        merged["subsistence_net_per_recipient"] = merged["NetExpenditure(TEUR)"] * 1000 / merged["Total"]
+
+        joined = self.grid.frame("subsistence_net_per_recipient")
+        pd.testing.assert_frame_equal(
+            joined.sort_values("Länder", ignore_index=True)[["Länder", "Year", "subsistence_net_per_recipient"]],
+            merged.sort_values("Länder", ignore_index=True)[["Länder", "Year", "subsistence_net_per_recipient"]],
+            check_dtype=False
+        )
+
+    def test_growth(self):
+        """
+        Testing the year-over-year growth to ensure it matches pct_change of the recipients and the quarterly means of the basic security benefits
+        """
+        berlin = list(self.grid.laender).index("Berlin")
+        recipients = sub_benefits.df[sub_benefits.df["Länder"] == "Berlin"].set_index("Year")["Total"]
+
+        growth = pd.Series(self.grid.metric("subsistence_recipients_growth")[berlin], index=self.grid.years)
+        expected = recipients.pct_change() * 100
+        expected = expected.where(recipients.shift() > 0)
+        np.testing.assert_allclose(growth.loc[expected.index[1:]], expected.iloc[1:])
+
+        periods = bsc.periods_df[bsc.periods_df["Länder"] == "Berlin"]
+        mean_2016 = periods[periods["Period"].str.startswith("2016")]["Value"].sum() / 4
+        self.assertAlmostEqual(self.grid.metric("basic_security_recipients")[berlin, 2016 - self.grid.years[0]], mean_2016)
+        self.assertTrue(np.isnan(self.grid.metric("basic_security_recipients")[berlin, 2010 - self.grid.years[0]]))
+
+    def test_placeholders(self):
+        """
+        Testing that GENESIS placeholders stay missing: the basic security mean covers only the reported quarters and metrics without any value are not offered
+        """
+        berlin = list(self.grid.laender).index("Berlin")
+        periods = bsc.periods_df[bsc.periods_df["Länder"] == "Berlin"]
+        reported_2024 = periods[periods["Period"].str.startswith("2024")].groupby("Period")["Value"].sum(min_count=1).dropna()
+        self.assertEqual(len(reported_2024), 1)
+        self.assertAlmostEqual(self.grid.metric("basic_security_recipients")[berlin, 2024 - self.grid.years[0]], reported_2024.mean())
+
+        self.assertTrue(np.isnan(self.grid.metric("basic_security_net_expenditure")).all())
+        self.assertTrue(np.isnan(self.grid.metric("subsistence_recipients")[list(self.grid.laender).index("Bremen"), 2005 - self.grid.years[0]]))
+
+        metrics = self.grid.available_metrics()
+        self.assertNotIn("basic_security_net_per_recipient", metrics)
+        self.assertNotIn("net_expenditure_growth", metrics)
+        self.assertIn("subsistence_net_per_recipient", metrics)
+
+    def test_snapshot_cache_and_chart(self):
+        """
+        Testing the Snapshot to ensure the grid is built once per dataset version, also by concurrent sessions, and the heatmap is limited to the chosen states, empty for an empty selection
+        """
+        snapshot = registry.snapshot()
+        self.assertIs(snapshot.joined(), snapshot.joined())
+
+        heatmap = Visuals().joined_metric_heatmap(grid=snapshot.joined(), metric="subsistence_recipients", title="Recipients", chosen_states=["Berlin", "Bayern"])
+        self.assertEqual(list(heatmap.data[0].y), ["Bayern", "Berlin"])
+        self.assertEqual(heatmap.data[0].z.shape, (2, len(sub_benefits.df["Year"].unique())))
+        self.assertEqual(Visuals().joined_metric_heatmap(grid=snapshot.joined(), metric="subsistence_recipients", title="Recipients", chosen_states=[]).data[0].z.size, 0)
+
+        fresh = Snapshot(pa=snapshot.pa, bsc=snapshot.bsc, sub_benefits=snapshot.sub_benefits, melted_df=snapshot.melted_df, max_quarterly_value=snapshot.max_quarterly_value)
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            grids = list(executor.map(lambda _: fresh.joined(), range(8)))
+        self.assertTrue(all(grid is grids[0] for grid in grids))
+
+if __name__ == "__main__":
+    unittest.main()
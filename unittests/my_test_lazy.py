@@ -0,0 +1,62 @@
+import unittest
+import importlib.util
+import pandas as pd
+from visualizations import PublicAssistance, BasicSecurity
+
+@unittest.skipUnless(importlib.util.find_spec("polars"), "polars is not installed")
+class TestLazyDataset(unittest.TestCase):
+    """
+    Unit tests for the Polars LazyDataset, compared against the pandas pipeline
+    """
+
+    def test_public_assistance(self):
+        """
+        Testing the lazy public assistance chain to ensure the collected frames match the eager pipeline
+        """
+        from visualizations.lazy import LazyDataset
+
+        cols = ["Expenditure(TEUR)", "Revenue(TEUR)", "NetExpenditure(TEUR)"]
+        columns = ["Year", "Länder", "TypeCode", "PublicAssistance", *cols]
+
+        pa = PublicAssistance("data/public_assistance.csv", ";", 5, 7)
+        pa.file_processing(columns)
+        pa.dtype_conversion(*cols)
+        pa.filter_data()
+        expected_df = pa.data_group(cols=cols, group_element="Länder")
+
+        lazy_pa = LazyDataset(PublicAssistance("data/public_assistance.csv", ";", 5, 7))
+        lazy_pa.file_processing(columns)
+        lazy_pa.dtype_conversion(*cols)
+        lazy_pa.filter_data()
+        lazy_pa.data_group(cols=cols, group_element="Länder")
+        collected = lazy_pa.to_pandas()
+
+        pd.testing.assert_frame_equal(collected.df, pa.df)
+        pd.testing.assert_frame_equal(collected.Länder_df, expected_df)
+
+    def test_basic_security_pivot(self):
+        """
+        Testing the lazy basic security chain to ensure the projected reference year periods and the pivot table match the eager pipeline
+        """
+        from visualizations.lazy import LazyDataset
+
+        quarters = ["Q1", "Q2", "Q3", "Q4"]
+        bsc = BasicSecurity("data/basic_security_benefits.csv", ";", skiprows=6, skipfooter=4)
+        bsc.file_processing(["Länder", "Gender", *quarters])
+        bsc.dtype_conversion(*quarters)
+        bsc.filter_data()
+        expected_df = bsc.pivot_table(columns=quarters, group_element=["Länder", "Gender"], values="Total", index="Gender", column_header="Länder")
+
+        lazy_bsc = LazyDataset(BasicSecurity("data/basic_security_benefits.csv", ";", skiprows=6, skipfooter=4))
+        lazy_bsc.file_processing(["Länder", "Gender", *quarters])
+        lazy_bsc.dtype_conversion(*quarters)
+        lazy_bsc.filter_data()
+        lazy_bsc.pivot_table(columns=quarters, group_element=["Länder", "Gender"], values="Total", index="Gender", column_header="Länder")
+        collected = lazy_bsc.to_pandas()
+
+        pd.testing.assert_frame_equal(collected.df, bsc.df)
+        pd.testing.assert_frame_equal(collected.LänderGender_df, bsc.LänderGender_df)
+        pd.testing.assert_frame_equal(collected.pivot_df, expected_df)
+
+if __name__ == "__main__":
+    unittest.main()
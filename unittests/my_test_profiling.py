@@ -0,0 +1,143 @@
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+from webview.profiling import SECTIONS, SectionProfiler, component, import_time_report, profile_dashboard, write_report
+
+class SampleApp:
+    """
+    Stand-in for the WebApp sections
+    """
+    def establish_top_wireframe(self):
+        time.sleep(0.05)
+        return [0] * 100_000
+
+    def middle_wireframe(self):
+        return sorted(range(10_000), reverse=True)
+
+    def second_dataset(self):
+        return None
+
+    def thirdataset(self, data=None):
+        return data
+
+    def joined_datasets(self):
+        return None
+
+class TestSectionProfiler(unittest.TestCase):
+    """
+    Unit tests for the profiling harness of the WebApp sections
+    """
+
+    def test_profile_report(self):
+        """
+        Testing the SectionProfiler to ensure every section is timed, sampled and allocation tracked and the report files are written
+        """
+        profiler = SectionProfiler(interval=0.001)
+        originals = profiler.instrument(SampleApp)
+        profiler.start()
+        try:
+            app = SampleApp()
+            for _ in range(2):
+                app.establish_top_wireframe()
+                app.middle_wireframe()
+                app.second_dataset()
+                app.thirdataset(data=[1])
+                app.joined_datasets()
+        finally:
+            profiler.stop()
+            for section, method in originals.items():
+                setattr(SampleApp, section, method)
+
+        self.assertEqual(len(profiler.wall_times["establish_top_wireframe"]), 2)
+        self.assertGreater(sum(profiler.samples["establish_top_wireframe"].values()), 0)
+        self.assertGreater(profiler.memory["establish_top_wireframe"][0]["peak"], 100_000 * 8 - 1)
+
+        with tempfile.TemporaryDirectory() as folder:
+            report = write_report(profiler, folder)
+            self.assertTrue(os.path.exists(os.path.join(folder, "flamegraph_establish_top_wireframe.html")))
+            self.assertTrue(os.path.exists(os.path.join(folder, "middle_wireframe.prof")))
+            with open(report) as report_file:
+                self.assertIn("Top 30 functions by own time", report_file.read())
+
+    def test_section_failure(self):
+        """
+        Testing the SectionProfiler to ensure a raising section is recorded as a failure and the following sections are still profiled
+        """
+        def middle_wireframe(self):
+            raise ValueError("missing column")
+
+        profiler = SectionProfiler(interval=0.001, track_allocations=False)
+        with mock.patch.object(SampleApp, "middle_wireframe", middle_wireframe):
+            originals = profiler.instrument(SampleApp)
+            profiler.start()
+            try:
+                app = SampleApp()
+                for section in SECTIONS:
+                    getattr(app, section)()
+            finally:
+                profiler.stop()
+                for section, method in originals.items():
+                    setattr(SampleApp, section, method)
+
+        self.assertEqual(profiler.failures["middle_wireframe"], [(1, "ValueError: missing column")])
+        self.assertEqual(len(profiler.wall_times["joined_datasets"]), 1)
+
+        with tempfile.TemporaryDirectory() as folder:
+            with open(write_report(profiler, folder)) as report_file:
+                self.assertIn("Section middle_wireframe failed in run 1: ValueError: missing column", report_file.read())
+
+    def test_stop_before_start(self):
+        """
+        Testing the SectionProfiler to ensure stopping a profiler that was not started raises a clear error
+        """
+        with self.assertRaisesRegex(RuntimeError, "before start"):
+            SectionProfiler(track_allocations=False).stop()
+
+    def test_profile_dashboard_status(self):
+        """
+        Testing profile_dashboard to ensure a failing WebApp section gives a non-zero exit status while the remaining sections are profiled
+        """
+        from webview.wireframe import WebApp
+
+        def second_dataset(self):
+            raise RuntimeError("broken section")
+
+        with tempfile.TemporaryDirectory() as folder, mock.patch.object(WebApp, "second_dataset", second_dataset):
+            status = profile_dashboard(folder, runs=1, track_allocations=False)
+            self.assertEqual(status, 1)
+            self.assertTrue(os.path.exists(os.path.join(folder, "joined_datasets.prof")))
+            with open(os.path.join(folder, "report.txt")) as report_file:
+                self.assertIn("Section second_dataset failed in run 1: RuntimeError: broken section", report_file.read())
+
+    def test_component(self):
+        """
+        Testing the component attribution of source files
+        """
+        self.assertEqual(component(os.path.join("root", "package", "visualizations", "eda.py")), "eda.py")
+        self.assertEqual(component(os.path.join("site-packages", "plotly", "io", "_json.py")), "json")
+        self.assertEqual(component("~"), "builtins")
+
+    def test_import_time_report(self):
+        """
+        Testing the import_time_report function to ensure the -X importtime output of a fresh interpreter is summarized
+        """
+        with tempfile.TemporaryDirectory() as folder:
+            with open(import_time_report(folder, module="json")) as report_file:
+                report = report_file.read()
+            self.assertIn("Total:", report)
+            self.assertIn("json.decoder", report)
+
+    def test_lazy_package_import(self):
+        """
+        Testing a fresh import of the visualizations package to ensure the pipeline, pandas and plotly are only loaded on first use
+        """
+        script = "import sys, visualizations; print(sorted(module for module in ('pandas', 'plotly', 'duckdb', 'polars', 'visualizations.eda', 'visualizations.plots') if module in sys.modules))"
+        result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.strip(), "[]")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import unittest
+import importlib.util
+import pandas as pd
+from visualizations import PublicAssistance, BasicSecurity, Subsistence
+
+@unittest.skipUnless(importlib.util.find_spec("duckdb"), "duckdb is not installed")
+class TestQueryEngine(unittest.TestCase):
+    """
+    Unit tests for the DuckDB QueryEngine, compared against the pandas backend
+    """
+
+    def setUp(self):
+        """
+        Setting up the test environment by registering the datasets with the QueryEngine and processing the same files with the pandas backend
+        """
+        from visualizations.queries import QueryEngine
+
+        self.engine = QueryEngine()
+        self.cols = ["Expenditure(TEUR)", "Revenue(TEUR)", "NetExpenditure(TEUR)"]
+        self.columns = ["Year", "Länder", "TypeCode", "PublicAssistance", *self.cols]
+
+        self.pa = PublicAssistance("data/public_assistance.csv", ";", 5, 7)
+        self.pa.file_processing(self.columns)
+        self.pa.dtype_conversion(*self.cols)
+        self.pa.filter_data()
+
+        self.duck_pa = PublicAssistance("data/public_assistance.csv", ";", 5, 7)
+        self.engine.register_public_assistance(self.duck_pa, self.columns)
+
+    def test_register_public_assistance(self):
+        """
+        Testing the register_public_assistance method to ensure the registered table matches the pandas processed dataframe
+        """
+        pd.testing.assert_frame_equal(self.duck_pa.df, self.pa.df)
+
+    def test_data_group(self):
+        """
+        Testing the data_group method to ensure the grouped query matches Dataset.data_group
+        """
+        expected_df = self.pa.data_group(cols=self.cols, group_element="Länder")
+        grouped_df = self.engine.data_group("public_assistance", cols=self.cols, group_element="Länder", dataset=self.duck_pa)
+        pd.testing.assert_frame_equal(grouped_df, expected_df)
+        pd.testing.assert_frame_equal(self.duck_pa.Länder_df, expected_df)
+
+    def test_select(self):
+        """
+        Testing the select method to ensure pushed down predicates match the pandas boolean filters
+        """
+        regions = ["Bayern", "Berlin"]
+        filtered_df = self.engine.select("public_assistance", equals={"PublicAssistance": "Subsistence payments"}, isin={"Länder": regions})
+        expected_df = self.pa.df[(self.pa.df["PublicAssistance"] == "Subsistence payments") & self.pa.df["Länder"].isin(regions)]
+        pd.testing.assert_frame_equal(filtered_df, expected_df)
+
+    def test_pivot_table(self):
+        """
+        Testing the pivot_table method to ensure the pivot query matches BasicSecurity.pivot_table
+        """
+        bsc = BasicSecurity("data/basic_security_benefits.csv", ";", skiprows=6, skipfooter=4)
+        bsc.file_processing(["Länder", "Gender", "Q1", "Q2", "Q3", "Q4"])
+        bsc.dtype_conversion("Q1", "Q2", "Q3", "Q4")
+        bsc.filter_data()
+        expected_df = bsc.pivot_table(columns=["Q1", "Q2", "Q3", "Q4"], group_element=["Länder", "Gender"], values="Total", index="Gender", column_header="Länder")
+
+        duck_bsc = BasicSecurity("data/basic_security_benefits.csv", ";", skiprows=6, skipfooter=4)
+        self.engine.register_basic_security(duck_bsc, ["Länder", "Gender", "Q1", "Q2", "Q3", "Q4"])
+        pivot_table = self.engine.pivot_table("basic_security", columns=["Q1", "Q2", "Q3", "Q4"], group_element=["Länder", "Gender"], values="Total", index="Gender", column_header="Länder", dataset=duck_bsc)
+
+        pd.testing.assert_frame_equal(duck_bsc.df, bsc.df)
+        pd.testing.assert_frame_equal(pivot_table, expected_df)
+        pd.testing.assert_frame_equal(duck_bsc.LänderGender_df, bsc.LänderGender_df)
+
+    def test_filter_years(self):
+        """
+        Testing the filter_years method to ensure the year range query matches Subsistence.filter_data
+        """
+        sub_benefits = Subsistence("data/subsistence_benefits.csv", ";", skiprows=7, skipfooter=4)
+        sub_benefits.file_processing()
+        numeric_cols = [col for col in sub_benefits.df.columns if col != "Länder"]
+        sub_benefits.dtype_conversion(*numeric_cols)
+        sub_benefits.filter_data(year_start=2010, year_end=2022)
+
+        duck_sub = Subsistence("data/subsistence_benefits.csv", ";", skiprows=7, skipfooter=4)
+        self.engine.register_subsistence(duck_sub)
+        self.engine.filter_years("subsistence", year_start=2010, year_end=2022, dataset=duck_sub)
+
+        pd.testing.assert_frame_equal(duck_sub.df, sub_benefits.df)
+        pd.testing.assert_frame_equal(duck_sub.filtered_df, sub_benefits.filtered_df)
+
+if __name__ == "__main__":
+    unittest.main()
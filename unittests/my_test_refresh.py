@@ -0,0 +1,143 @@
+import asyncio
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+import pandas as pd
+from visualizations import PublicAssistance, BasicSecurity, Subsistence, Snapshot, DatasetRegistry, DataRefresher
+from visualizations.pipeline import QUERY_PROCESSORS, process_public_assistance, process_basic_security, process_subsistence, quarterly_assessment, reported_assessment
+
+class TestDataRefresher(unittest.TestCase):
+    """
+    Unit tests for the DatasetRegistry and the DataRefresher hot swap
+    """
+
+    def setUp(self):
+        """
+        Setting up the test environment with copies of the csv files, an initial snapshot and a drop folder
+        """
+        self.folder = tempfile.TemporaryDirectory()
+        self.drop_folder = os.path.join(self.folder.name, "drop")
+        os.makedirs(self.drop_folder)
+        for file_name in ("public_assistance.csv", "basic_security_benefits.csv", "subsistence_benefits.csv"):
+            shutil.copy(os.path.join("data", file_name), self.folder.name)
+
+        def loader():
+            pa = process_public_assistance(PublicAssistance(os.path.join(self.folder.name, "public_assistance.csv"), ";", 5, 7))
+            bsc = process_basic_security(BasicSecurity(os.path.join(self.folder.name, "basic_security_benefits.csv"), ";", skiprows=6, skipfooter=4))
+            sub_benefits = process_subsistence(Subsistence(os.path.join(self.folder.name, "subsistence_benefits.csv"), ";", 7, 4))
+            melted_df, max_quarterly_value = quarterly_assessment(bsc)
+            return Snapshot(pa=pa, bsc=bsc, sub_benefits=sub_benefits, melted_df=melted_df, max_quarterly_value=max_quarterly_value)
+
+        self.registry = DatasetRegistry(loader)
+        self.refresher = DataRefresher(self.registry, drop_folder=self.drop_folder)
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_unchanged(self):
+        """
+        Testing the refresh method to ensure unchanged files keep the current snapshot
+        """
+        snapshot = self.registry.snapshot()
+
+        self.assertIsNone(asyncio.run(self.refresher.refresh()))
+        self.assertIs(self.registry.snapshot(), snapshot)
+
+    def test_hot_swap(self):
+        """
+        Testing the refresh method to ensure a dropped file is installed once it stopped changing, rebuilds only its dataset and swaps a new snapshot while the old one stays intact
+        """
+        old = self.registry.snapshot()
+        old_value = old.pa.df.loc[0, "Expenditure(TEUR)"]
+
+        with open(os.path.join(self.folder.name, "public_assistance.csv"), "rb") as source:
+            content = source.read()
+        with open(os.path.join(self.drop_folder, "public_assistance.csv"), "wb") as dropped:
+            dropped.write(content[:len(content) // 2])
+
+        # A drop still being written is left in the folder until it stops changing
+        self.assertIsNone(asyncio.run(self.refresher.refresh()))
+        with open(os.path.join(self.drop_folder, "public_assistance.csv"), "wb") as dropped:
+            dropped.write(content.replace(b";116383;", b";116390;", 1))
+        self.assertIsNone(asyncio.run(self.refresher.refresh()))
+        self.assertIs(self.registry.snapshot(), old)
+        self.assertTrue(os.path.exists(os.path.join(self.drop_folder, "public_assistance.csv")))
+
+        self.assertEqual(asyncio.run(self.refresher.refresh()), 1)
+
+        new = self.registry.snapshot()
+        self.assertIsNot(new, old)
+        self.assertEqual(new.pa.df.loc[0, "Expenditure(TEUR)"], 116390)
+        self.assertEqual(old.pa.df.loc[0, "Expenditure(TEUR)"], old_value)
+        self.assertIs(new.bsc, old.bsc)
+        self.assertIs(new.sub_benefits, old.sub_benefits)
+        self.assertFalse(os.listdir(self.drop_folder))
+
+    def test_duckdb_refresh(self):
+        """
+        Testing the rebuild method with the duckdb backend to ensure the new snapshot queries a new QueryEngine holding the changed and the copied tables while the previous engine keeps its data
+        """
+        try:
+            from visualizations.queries import QueryEngine
+        except ImportError:
+            self.skipTest("duckdb is not installed")
+
+        def loader():
+            engine = QueryEngine()
+            datasets = {
+                "pa": PublicAssistance(os.path.join(self.folder.name, "public_assistance.csv"), ";", 5, 7),
+                "bsc": BasicSecurity(os.path.join(self.folder.name, "basic_security_benefits.csv"), ";", skiprows=6, skipfooter=4),
+                "sub_benefits": Subsistence(os.path.join(self.folder.name, "subsistence_benefits.csv"), ";", 7, 4),
+            }
+            for name, dataset in datasets.items():
+                QUERY_PROCESSORS[name](engine, dataset)
+            melted_df, max_quarterly_value = quarterly_assessment(datasets["bsc"])
+            reported_assessment(datasets["pa"], datasets["sub_benefits"])
+            return Snapshot(melted_df=melted_df, max_quarterly_value=max_quarterly_value, engine=engine, **datasets)
+
+        registry = DatasetRegistry(loader)
+        old = registry.snapshot()
+        refresher = DataRefresher(registry)
+
+        source_path = os.path.join(self.folder.name, "public_assistance.csv")
+        with open(source_path, "rb") as source:
+            content = source.read()
+        with open(source_path, "wb") as changed:
+            changed.write(content.replace(b";116383;", b";116390;", 1))
+
+        new = refresher.rebuild(refresher.changed())
+        self.assertIsNotNone(new.engine)
+        self.assertIsNot(new.engine, old.engine)
+        self.assertEqual(new.engine.select("public_assistance").loc[0, "Expenditure(TEUR)"], 116390)
+        self.assertEqual(old.engine.select("public_assistance").loc[0, "Expenditure(TEUR)"], 116383)
+        pd.testing.assert_frame_equal(new.engine.select("subsistence_filtered"), old.engine.select("subsistence_filtered"))
+        self.assertIs(new.sub_benefits, old.sub_benefits)
+
+    def test_drop_other_file_system(self):
+        """
+        Testing the collect_drops method to ensure a drop that cannot be renamed across file systems is copied next to the source file and renamed over it
+        """
+        source_path = os.path.join(self.folder.name, "subsistence_benefits.csv")
+        shutil.copy(source_path, self.drop_folder)
+        with open(os.path.join(self.drop_folder, "subsistence_benefits.csv"), "ab") as dropped:
+            dropped.write(b"\n")
+
+        replace = os.replace
+
+        def rename(source, target):
+            if source.startswith(self.drop_folder):
+                raise OSError(18, "Invalid cross-device link")
+            return replace(source, target)
+
+        self.refresher.collect_drops()
+        with mock.patch("visualizations.refresh.os.replace", side_effect=rename) as renamed:
+            self.refresher.collect_drops()
+
+        self.assertEqual(renamed.call_args.args, (f"{source_path}.part", source_path))
+        self.assertEqual(self.refresher.changed(), ["sub_benefits"])
+        self.assertFalse(os.listdir(self.drop_folder))
+
+if __name__ == "__main__":
+    unittest.main()
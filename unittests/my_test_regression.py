@@ -0,0 +1,88 @@
+import os
+import tempfile
+import unittest
+import importlib.util
+import numpy as np
+import pandas as pd
+from visualizations.regression import BACKENDS, SOURCE_FILES, backend_snapshot, default_figures, figure_arrays, load_golden, process, write_synthetic_tables
+from webview.figures import GEOJSON_PATH
+
+GOLDEN_DIR = os.path.join(os.path.dirname(__file__), "golden")
+
+class TestGoldenOutputs(unittest.TestCase):
+    """
+    Regression tests of every backend and figure against the golden outputs of the pandas pipeline, regenerated with: python main.py --golden
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        Loading the golden frames and figure data arrays
+        """
+        if not importlib.util.find_spec("pyarrow"):
+            raise unittest.SkipTest("the parquet golden files require pyarrow")
+
+        cls.golden_frames, cls.golden_figures = load_golden(GOLDEN_DIR)
+
+    def test_backend_frames(self):
+        """
+        Testing each backend to ensure the derived frames of the source csv files match the golden frames
+        """
+        for backend, (_, module) in BACKENDS.items():
+            with self.subTest(backend=backend):
+                if module and not importlib.util.find_spec(module):
+                    self.skipTest(f"{module} is not installed")
+
+                frames = process(SOURCE_FILES, backend, chunksize=25)
+                if backend == "pandas":
+                    self.assertEqual(sorted(frames), sorted(self.golden_frames))
+
+                for name, frame in frames.items():
+                    pd.testing.assert_frame_equal(frame, self.golden_frames[name], obj=f"{backend} {name}")
+
+    def test_figure_arrays(self):
+        """
+        Testing the dashboard figures of the initial sidebar selection, built from the pandas, duckdb and polars backends and from the materialized views, to ensure their trace data arrays match the golden figures
+        """
+        for backend, views in (("pandas", False), ("pandas", True), ("duckdb", False), ("polars", False)):
+            module = BACKENDS[backend][1]
+            if module and not importlib.util.find_spec(module):
+                continue
+
+            figures = default_figures(backend_snapshot(SOURCE_FILES, backend, views=views))
+
+            for name, golden_traces in self.golden_figures.items():
+                with self.subTest(backend=backend, views=views, figure=name):
+                    if name == "choropleth" and not os.path.exists(GEOJSON_PATH):
+                        self.skipTest(f"{GEOJSON_PATH} is missing")
+
+                    np.testing.assert_equal(figure_arrays({name: getattr(figures, name)()})[name], golden_traces)
+
+class TestSyntheticTables(unittest.TestCase):
+    """
+    Property tests over random GENESIS tables of several sizes: every backend reproduces the frames of the pandas pipeline
+    """
+
+    def test_backends_match_pandas(self):
+        """
+        Testing the streaming, duckdb and polars backends to ensure their frames equal the pandas frames for each table size, seed and share of placeholder values
+        """
+        for years in (1, 4, 16):
+            for seed, missing in ((years, 0.0), (years + 1, 0.3)):
+                with tempfile.TemporaryDirectory() as folder:
+                    paths = write_synthetic_tables(folder, years=years, seed=seed, missing=missing)
+                    expected = process(paths, "pandas")
+
+                    for backend, (_, module) in BACKENDS.items():
+                        if backend == "pandas" or (module and not importlib.util.find_spec(module)):
+                            continue
+
+                        with self.subTest(years=years, seed=seed, missing=missing, backend=backend):
+                            frames = process(paths, backend, chunksize=7)
+                            self.assertTrue(frames)
+
+                            for name, frame in frames.items():
+                                pd.testing.assert_frame_equal(frame, expected[name], obj=f"{backend} {name}")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import os
+import tempfile
+import unittest
+import pandas as pd
+from visualizations import PublicAssistance, Subsistence, DatasetStore
+
+class TestDatasetStore(unittest.TestCase):
+    """
+    Unit tests for the shared DatasetStore
+    """
+
+    def setUp(self):
+        """
+        Setting up the test environment by processing the datasets and creating a store in a temporary folder
+        """
+        self.cols = ["Expenditure(TEUR)", "Revenue(TEUR)", "NetExpenditure(TEUR)"]
+
+        self.pa = PublicAssistance("data/public_assistance.csv", ";", 5, 7)
+        self.pa.file_processing(["Year", "Länder", "TypeCode", "PublicAssistance", *self.cols])
+        self.pa.reported_values(self.cols, data=self.pa.df)
+        self.pa.dtype_conversion(*self.cols)
+        self.pa.filter_data()
+        self.pa.data_group(cols=self.cols, group_element="Länder")
+
+        self.sub_benefits = Subsistence(path_to_file="data/subsistence_benefits.csv", delimiter=";", skiprows=7, skipfooter=4)
+        self.sub_benefits.file_processing()
+        self.sub_benefits.dtype_conversion("Year", "Total")
+        self.sub_benefits.filter_data(year_start=2010, year_end=2022)
+
+        self.folder = tempfile.TemporaryDirectory()
+        self.store = DatasetStore(self.folder.name)
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_publish_attach(self):
+        """
+        Testing the publish and attach methods to ensure attached frames equal the published frames, are read-only and keep their source state
+        """
+        self.assertFalse(self.store.attach({"pa": PublicAssistance("data/public_assistance.csv", ";", 5, 7)}))
+        self.store.publish({"pa": self.pa, "sub_benefits": self.sub_benefits})
+
+        attached_pa = PublicAssistance("data/public_assistance.csv", ";", 5, 7)
+        attached_sub = Subsistence(path_to_file="data/subsistence_benefits.csv", delimiter=";", skiprows=7, skipfooter=4)
+        self.assertTrue(self.store.attach({"pa": attached_pa, "sub_benefits": attached_sub}))
+
+        pd.testing.assert_frame_equal(attached_pa.df, self.pa.df)
+        pd.testing.assert_frame_equal(attached_pa.Länder_df, self.pa.Länder_df)
+        pd.testing.assert_frame_equal(attached_sub.filtered_df, self.sub_benefits.filtered_df)
+
+        with self.assertRaises(ValueError):
+            attached_pa.df["Expenditure(TEUR)"].to_numpy()[0] = 0
+
+        # Frames read from the file stay attached when df changes, derived frames are dropped
+        attached_pa.touch()
+        pd.testing.assert_frame_equal(attached_pa.reported_df, self.pa.reported_df)
+        self.assertNotIn("Länder_df", attached_pa.artifacts)
+
+    def test_versioned_swap(self):
+        """
+        Testing that a publication swaps the current version and prunes versions beyond keep
+        """
+        versions = [self.store.publish({"pa": self.pa}) for _ in range(3)]
+
+        self.assertEqual(self.store.current_version(), versions[-1])
+        self.assertEqual(sorted(entry for entry in os.listdir(self.folder.name) if entry.startswith("v")), sorted(versions[1:]))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+from visualizations import PublicAssistance, Visuals
+from visualizations.summary import FrameSummary
+
+class TestFrameSummary(unittest.TestCase):
+    """
+    Unit tests for the FrameSummary statistics and their use in the Visuals class
+    """
+
+    def setUp(self):
+        """
+        Setting up the test environment with a sample DataFrame holding tied and missing values
+        """
+        self.sample_df = pd.DataFrame({
+            "Länder": ["Berlin", "Bayern", "Hamburg", "Bremen", "Hessen"],
+            "NetExpenditure(TEUR)": [1000, 0, 1500, 0, np.nan]
+        })
+        self.summary = FrameSummary(self.sample_df)
+
+    def test_sorted_view(self):
+        """
+        Testing the sorted_view method to ensure the cached argsort order matches sort_values, ties and missing values included
+        """
+        for by in self.sample_df.columns:
+            for ascending in (True, False):
+                pd.testing.assert_frame_equal(self.summary.sorted_view(by, ascending), self.sample_df.sort_values(by=by, ascending=ascending))
+
+        self.assertIs(self.summary.sorted_view("Länder"), self.summary.sorted_view("Länder"))
+
+    def test_shares_and_maxima(self):
+        """
+        Testing the shares and maxima to ensure they match the column computations of the dataframe
+        """
+        self.assertEqual(self.summary.maxima["NetExpenditure(TEUR)"], 1500)
+        np.testing.assert_allclose(self.summary.shares("NetExpenditure(TEUR)")[:4], [40, 0, 60, 0])
+
+        donut_chart = Visuals().donut_visual(data=self.sample_df.dropna(), grouping_type="NetExpenditure(TEUR)", col_name="Länder", in_percent=True, summary=FrameSummary(self.sample_df.dropna()))
+        np.testing.assert_allclose(donut_chart.data[0].customdata, [40, 0, 60, 0])
+        self.assertIn("%{customdata", donut_chart.data[0].texttemplate)
+        self.assertIn("%{customdata", donut_chart.data[0].hovertemplate)
+
+    def test_dataset_summary(self):
+        """
+        Testing the Dataset.summary method to ensure the statistics are reused for a df_version and recomputed once the dataframe changes, concurrent sessions share one computation
+        """
+        cols = ["Expenditure(TEUR)", "Revenue(TEUR)", "NetExpenditure(TEUR)"]
+        pa = PublicAssistance("data/public_assistance.csv", ";", 5, 7)
+        pa.file_processing(["Year", "Länder", "TypeCode", "PublicAssistance", *cols])
+        pa.dtype_conversion(*cols)
+        pa.data_group(cols=cols, group_element="PublicAssistance")
+
+        summary = pa.summary("PublicAssistance_df")
+        self.assertIs(pa.summary("PublicAssistance_df"), summary)
+        self.assertEqual(summary.maxima["Revenue(TEUR)"], pa.PublicAssistance_df["Revenue(TEUR)"].max())
+
+        pa.filter_data()
+        pa.data_group(cols=cols, group_element="PublicAssistance")
+        self.assertIsNot(pa.summary("PublicAssistance_df"), summary)
+
+        def session(_):
+            pa.data_group(cols=cols, group_element="Länder")
+            return pa.summary("Länder_df")
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            summaries = list(executor.map(session, range(8)))
+        self.assertTrue(all(shared is summaries[0] for shared in summaries))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+import numpy as np
+from visualizations import PublicAssistance, Subsistence, MaterializedViews, Snapshot, registry
+from visualizations.regression import figure_arrays
+from webview.figures import DashboardFigures
+
+class TestMaterializedViews(unittest.TestCase):
+    """
+    Unit tests for the MaterializedViews, compared against the grouped dataframes
+    """
+
+    def setUp(self):
+        """
+        Setting up the test environment by processing the datasets and precomputing their views
+        """
+        self.cols = ["Expenditure(TEUR)", "Revenue(TEUR)", "NetExpenditure(TEUR)"]
+
+        self.pa = PublicAssistance("data/public_assistance.csv", ";", 5, 7)
+        self.pa.file_processing(["Year", "Länder", "TypeCode", "PublicAssistance", *self.cols])
+        self.pa.dtype_conversion(*self.cols)
+        self.pa.filter_data()
+
+        self.sub_benefits = Subsistence(path_to_file="data/subsistence_benefits.csv", delimiter=";", skiprows=7, skipfooter=4)
+        self.sub_benefits.file_processing()
+        self.sub_benefits.dtype_conversion("Year", "Total")
+        self.sub_benefits.filter_data(year_start=2010, year_end=2022)
+
+        self.views = MaterializedViews.precompute(self.pa, self.sub_benefits)
+
+    def test_region_sums(self):
+        """
+        Testing the measure_by_region and benefit_totals methods to ensure the sums over per-Länder slices match data_group
+        """
+        laender_df = self.pa.data_group(cols=self.cols, group_element="Länder").set_index("Länder")
+        benefit_df = self.pa.data_group(cols=self.cols, group_element="PublicAssistance").set_index("PublicAssistance")
+
+        regions = ["Bayern", "Berlin", "Hamburg"]
+        for measure in self.cols:
+            laender, values = self.views.measure_by_region(measure, regions)
+            self.assertEqual(list(laender), regions)
+            np.testing.assert_array_equal(values, laender_df.loc[regions, measure].to_numpy())
+
+            benefits, totals = self.views.benefit_totals(measure)
+            np.testing.assert_array_equal(totals, benefit_df.loc[benefits, measure].to_numpy())
+
+    def test_save_load(self):
+        """
+        Testing the save and load methods to ensure the artifact round trips and a changed source file invalidates it
+        """
+        with tempfile.TemporaryDirectory() as folder:
+            path = self.views.save(os.path.join(folder, "views.npz"))
+            loaded = MaterializedViews.load(path)
+
+            np.testing.assert_array_equal(loaded.expenditure, self.views.expenditure)
+            np.testing.assert_array_equal(loaded.subsistence, self.views.subsistence)
+            np.testing.assert_array_equal(loaded.subsistence_present, self.views.subsistence_present)
+            self.assertEqual(list(loaded.laender), list(self.views.laender))
+
+            loaded.signature[0, 1] += 1
+            loaded.save(path)
+            self.assertIsNone(MaterializedViews.load(path))
+
+    def test_views_match_dataframes(self):
+        """
+        Testing the DashboardFigures served from the views to ensure they equal the figures built from the dataframes, and the subsistence lines read the views when no data is passed
+        """
+        snapshot = registry.snapshot()
+        views = MaterializedViews.precompute(snapshot.pa, snapshot.sub_benefits)
+        views_snapshot = Snapshot(pa=snapshot.pa, bsc=snapshot.bsc, sub_benefits=snapshot.sub_benefits, melted_df=snapshot.melted_df, max_quarterly_value=snapshot.max_quarterly_value, views=views)
+        frame_snapshot = Snapshot(pa=snapshot.pa, bsc=snapshot.bsc, sub_benefits=snapshot.sub_benefits, melted_df=snapshot.melted_df, max_quarterly_value=snapshot.max_quarterly_value)
+
+        selection = (snapshot.pa.df["PublicAssistance"].iloc[0], "NetExpenditure(TEUR)", ["Bayern", "Berlin", "Hamburg"])
+        views_figures = DashboardFigures(*selection, snapshot=views_snapshot)
+        frame_figures = DashboardFigures(*selection, snapshot=frame_snapshot)
+
+        for name in ("benefit_bar", "benefit_donut", "subsistence_lines"):
+            with self.subTest(figure=name):
+                np.testing.assert_equal(figure_arrays({name: getattr(views_figures, name)()}), figure_arrays({name: getattr(frame_figures, name)()}))
+
+        with mock.patch.object(views, "subsistence_by_region", wraps=views.subsistence_by_region) as subsistence_by_region:
+            views_figures.subsistence_lines()
+            subsistence_by_region.assert_called_once()
+
+    def test_views_with_gaps(self):
+        """
+        Testing the views on data missing a (benefit type, Land) and a (Land, Year) combination to ensure the absent cells are left out as in the dataframe figures
+        """
+        snapshot = registry.snapshot()
+        benefit = self.pa.df["PublicAssistance"].iloc[0]
+        self.pa.df = self.pa.df[~((self.pa.df["PublicAssistance"] == benefit) & (self.pa.df["Länder"] == "Berlin"))].reset_index(drop=True)
+        filtered_df = self.sub_benefits.filtered_df
+        self.sub_benefits.register("filtered_df", filtered_df[~((filtered_df["Länder"] == "Hamburg") & (filtered_df["Year"] == 2015))])
+
+        views = MaterializedViews.precompute(self.pa, self.sub_benefits)
+        self.assertFalse(views.expenditure_present[views.benefit_index[benefit], list(views.laender).index("Berlin")])
+        laender, years, _ = views.subsistence_by_region(["Hamburg"])
+        self.assertNotIn(2015, years)
+        self.assertEqual(len(laender), len(views.years) - 1)
+
+        views_snapshot = Snapshot(pa=self.pa, bsc=snapshot.bsc, sub_benefits=self.sub_benefits, melted_df=snapshot.melted_df, max_quarterly_value=snapshot.max_quarterly_value, views=views)
+        frame_snapshot = Snapshot(pa=self.pa, bsc=snapshot.bsc, sub_benefits=self.sub_benefits, melted_df=snapshot.melted_df, max_quarterly_value=snapshot.max_quarterly_value)
+
+        selection = (benefit, "NetExpenditure(TEUR)", ["Bayern", "Berlin", "Hamburg"])
+        for name in ("benefit_bar", "subsistence_lines"):
+            with self.subTest(figure=name):
+                views_figure = getattr(DashboardFigures(*selection, snapshot=views_snapshot), name)()
+                frame_figure = getattr(DashboardFigures(*selection, snapshot=frame_snapshot), name)()
+                np.testing.assert_equal(figure_arrays({name: views_figure}), figure_arrays({name: frame_figure}))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,62 +1,125 @@
-from .eda import PublicAssistance, BasicSecurity
-from .plots import Visuals
-
-# Public Assistance Dataframe
-pa = PublicAssistance("data/public_assistance.csv", ";", 5, 7)
-pa.file_processing(["Year", "Länder", "TypeCode", "PublicAssistance", "Expenditure(TEUR)", "Revenue(TEUR)", "NetExpenditure(TEUR)"])
-pa.dtype_conversion("Expenditure(TEUR)", "Revenue(TEUR)", "NetExpenditure(TEUR)")
-pa.filter_data()
-pa.data_group(cols=["Expenditure(TEUR)", "Revenue(TEUR)", "NetExpenditure(TEUR)"], group_element="Länder")
-pa.data_group(cols=["Expenditure(TEUR)", "Revenue(TEUR)", "NetExpenditure(TEUR)"], group_element="PublicAssistance")
-
-# Basic Security Benefits DataFrame
-bsc = BasicSecurity("data/basic_security_benefits.csv", ";", skiprows=6, skipfooter=4)
-bsc.file_processing(["Länder", "Gender", "Q1", "Q2", "Q3", "Q4"])
-bsc.dtype_conversion("Q1", "Q2", "Q3", "Q4")
-bsc.filter_data()
-bsc.pivot_table(columns=["Q1", "Q2", "Q3", "Q4"], group_element=["Länder", "Gender"], values="Total", index="Gender", column_header="Länder")
-bsc.data_group(cols=["Q1", "Q2", "Q3", "Q4"], group_element="Gender", include_total=True)
-melted_df, max_quarterly_value = bsc.max_quarterly_assessment(data=bsc.LänderGender_df, cols=["Länder", "Q1", "Q2", "Q3", "Q4"], var_assignment="Quarter", value_name="Value")
-
-
-
-# Subsistence Benefit Recipients Dataframe
-sub_benefits = eda.Subsistence(path_to_file="data/subsistence_benefits.csv", delimiter=";", skiprows=7, skipfooter=4)
-sub_benefits.file_processing()
-sub_benefits.dtype_conversion("Year", "Non-Institution German Males",
-                              "Non-Institution Foreign Males",
-                              "Total Non-Insitution Males",
-                              "Institution German Males",
-                              "Insitution Foreign Males",
-                              "Total Institution Males",
-                              "Total German Males",
-                              "Total Foreign Males",
-                              "Total Males",
-                              "Non-Institution German Females",
-                              "Non-Institution Foreign Females",
-                              "Total Non-Insitution Females",
-                              "Institution German Females",
-                              "Insitution Foreign Females",
-                              "Total Institution Females",
-                              "Total German Females",
-                              "Total Foreign Females",
-                              "Total Females",
-                              "Non-Institution Germans Total",
-                              "Non-Institution Foreign Total",
-                              "Non-Institution Total",
-                              "Institution Germans Total",
-                              "Institution Foreign Total",
-                              "Institution Total",
-                              "Germans Total",
-                              "Foreign Total",
-                              "Total",
-                              )
-sub_benefits.filter_data(year_start=2010, year_end=2022)
-
-# Visualizations Module
-public_assist = Visuals()
-basics = Visuals()
-subsistence = Visuals()
+import importlib
+import os
 
+from .refresh import DatasetRegistry
 
+# Query backend, "pandas" (default), "duckdb" or "polars" through the BENEFITS_BACKEND environment variable
+backend = os.environ.get("BENEFITS_BACKEND", "pandas")
 
+# Materialized views artifact, built offline with: python main.py --precompute
+views_path = os.environ.get("BENEFITS_VIEWS", "data/materialized_views.npz")
+
+# Classes of the package, their modules (pandas, numpy, plotly) are imported on first use
+LAZY_ATTRIBUTES = {
+    "PublicAssistance": ".eda", "BasicSecurity": ".eda", "Subsistence": ".eda",
+    "Visuals": ".plots",
+    "MaterializedViews": ".views",
+    "JoinedGrid": ".joined",
+    "DatasetStore": ".store",
+    "Snapshot": ".refresh", "DataRefresher": ".refresh", "start_refresher": ".refresh",
+    "process_public_assistance": ".pipeline", "process_basic_security": ".pipeline", "process_subsistence": ".pipeline",
+    "quarterly_assessment": ".pipeline", "reported_assessment": ".pipeline",
+}
+
+# Frames of the current snapshot, e.g. from visualizations import pa
+SNAPSHOT_ATTRIBUTES = ("pa", "bsc", "sub_benefits", "melted_df", "max_quarterly_value")
+
+# Visualizations Module, one Visuals object per dashboard section
+VISUALS = ("public_assist", "basics", "subsistence")
+
+
+def load_snapshot():
+    '''
+    Runs the data pipeline of the configured backend and bundles the processed datasets into the initial Snapshot. Called by the registry on first access, so importing the package does not wait on it.
+    '''
+    from .eda import PublicAssistance, BasicSecurity, Subsistence
+    from .pipeline import PROCESSORS, QUERY_PROCESSORS, quarterly_assessment, reported_assessment
+    from .refresh import Snapshot, start_refresher
+    from .views import MaterializedViews
+
+    # Shared dataset store, e.g. BENEFITS_STORE=/dev/shm/benefits, published by the first process and attached by the others
+    store = None
+    if os.environ.get("BENEFITS_STORE"):
+        from .store import DatasetStore
+
+        store = DatasetStore(os.environ["BENEFITS_STORE"])
+
+    pa = PublicAssistance("data/public_assistance.csv", ";", 5, 7)
+    bsc = BasicSecurity("data/basic_security_benefits.csv", ";", skiprows=6, skipfooter=4)
+    sub_benefits = Subsistence(path_to_file="data/subsistence_benefits.csv", delimiter=";", skiprows=7, skipfooter=4)
+    datasets = {"pa": pa, "bsc": bsc, "sub_benefits": sub_benefits}
+    engine = None
+
+    # The duckdb backend serves its own registered tables and does not use the store
+    attached = store is not None and backend != "duckdb" and store.attach(datasets)
+
+    if attached:
+        # Frames are read-only views of the published store version
+        pass
+    elif backend == "duckdb":
+        from .queries import QueryEngine
+
+        engine = QueryEngine()
+        for name, dataset in datasets.items():
+            QUERY_PROCESSORS[name](engine, dataset)
+    elif backend == "polars":
+        from .lazy import LazyDataset
+
+        # Each chain is planned lazily and collected once into pandas by to_pandas
+        lazy_pa = LazyDataset(pa)
+        lazy_pa.file_processing(["Year", "Länder", "TypeCode", "PublicAssistance", "Expenditure(TEUR)", "Revenue(TEUR)", "NetExpenditure(TEUR)"])
+        lazy_pa.dtype_conversion("Expenditure(TEUR)", "Revenue(TEUR)", "NetExpenditure(TEUR)")
+        lazy_pa.filter_data()
+        lazy_pa.data_group(cols=["Expenditure(TEUR)", "Revenue(TEUR)", "NetExpenditure(TEUR)"], group_element="Länder")
+        lazy_pa.data_group(cols=["Expenditure(TEUR)", "Revenue(TEUR)", "NetExpenditure(TEUR)"], group_element="PublicAssistance")
+        lazy_pa.to_pandas()
+
+        lazy_bsc = LazyDataset(bsc)
+        lazy_bsc.file_processing(["Länder", "Gender", "Q1", "Q2", "Q3", "Q4"])
+        lazy_bsc.dtype_conversion("Q1", "Q2", "Q3", "Q4")
+        lazy_bsc.filter_data()
+        lazy_bsc.pivot_table(columns=["Q1", "Q2", "Q3", "Q4"], group_element=["Länder", "Gender"], values="Total", index="Gender", column_header="Länder")
+        lazy_bsc.data_group(cols=["Q1", "Q2", "Q3", "Q4"], group_element="Gender", include_total=True)
+        lazy_bsc.to_pandas()
+
+        lazy_sub = LazyDataset(sub_benefits)
+        lazy_sub.file_processing()
+        lazy_sub.dtype_conversion("Year", *[col for col in Subsistence.column_names.values() if col not in ("Länder", "Year")])
+        lazy_sub.filter_years(year_start=2010, year_end=2022)
+        lazy_sub.to_pandas()
+    else:
+        for name, dataset in datasets.items():
+            PROCESSORS[name](dataset)
+
+    melted_df, max_quarterly_value = quarterly_assessment(bsc)
+    reported_assessment(pa, sub_benefits)
+    if not attached and store is not None and backend != "duckdb":
+        store.publish(datasets)
+
+    snapshot = Snapshot(melted_df=melted_df, max_quarterly_value=max_quarterly_value, engine=engine, views=MaterializedViews.load(views_path), **datasets)
+
+    # The background refresher swaps rebuilt snapshots into the registry when the csv files change
+    if os.environ.get("BENEFITS_REFRESH"):
+        start_refresher(registry, interval=float(os.environ["BENEFITS_REFRESH"]), drop_folder=os.environ.get("BENEFITS_DROP_FOLDER"), store=store, views_path=views_path, snapshot=snapshot)
+
+    return snapshot
+
+
+# Snapshot registry read by the dashboard, the pipeline runs on its first access
+registry = DatasetRegistry(load_snapshot)
+
+
+def __getattr__(name: str):
+    '''
+    Resolves the lazily loaded classes, the frames of the current snapshot and the Visuals objects of the package.
+    '''
+    if name in LAZY_ATTRIBUTES:
+        return getattr(importlib.import_module(LAZY_ATTRIBUTES[name], __name__), name)
+    if name in SNAPSHOT_ATTRIBUTES:
+        return getattr(registry.snapshot(), name)
+    if name in VISUALS:
+        from .plots import Visuals
+
+        return globals().setdefault(name, Visuals())
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,15 +1,87 @@
 '''
 This section contributes towards data connection against the dataset .csv files extracted from the GENESIS-Online Database. The Parent and Child Classes adhere to common methods to capture file properties and process the csv files to be converted into Pandas Dataframe Objects
 '''
-import chardet
+from abc import ABC, abstractmethod
+import threading
+from collections import OrderedDict
+from functools import partial, wraps
+
+import numpy as np
 import pandas as pd
 
-class Dataset:
+from .summary import FrameSummary
+
+def freeze(value):
+    '''
+    Converts call arguments into a hashable memo key, lists and dictionaries become tuples.
+    '''
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, freeze(item)) for key, item in value.items()))
+
+    return value
+
+
+def memoized(func):
+    '''
+    Decorator for the aggregation methods: results are cached by (operation, arguments) for the current df_version and reused until a mutating method changes self.df. A cache hit registers the derived frames of the original call again, so their attributes point to the returned result as after a recomputation.
+    '''
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        try:
+            key = (func.__name__, freeze(args), freeze(kwargs))
+            hash(key)
+        except TypeError:
+            # Unhashable arguments are computed without the cache
+            return func(self, *args, **kwargs)
+
+        # Holding the dataset lock keeps two session threads from computing and storing the same result at once
+        with self.lock:
+            entry = self.memo.get(key)
+            if entry is not None:
+                for name, frame, rebuild in entry["registered"]:
+                    if self.artifacts.get(name) is not frame:
+                        self.register(name, frame, rebuild=rebuild)
+                return entry["result"]
+
+            before = dict(self.artifacts)
+            result = func(self, *args, **kwargs)
+
+            if result is not None:
+                registered = [(name, frame, self.rebuilders.get(name)) for name, frame in self.artifacts.items() if before.get(name) is not frame]
+                self.memo[key] = {"result": result, "registered": registered}
+
+            return result
+    return wrapper
+
+
+def mutates(func):
+    '''
+    Decorator for the methods changing self.df in place, the df_version is bumped once they complete.
+    '''
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        try:
+            return func(self, *args, **kwargs)
+        finally:
+            self.touch()
+    return wrapper
+
+
+class Dataset(ABC):
     '''
     The Dataset Parent class acts as a baseline for accepting .csv files as input and utilizes encoding detection, data type conversion and numeric datatype filtering to parse data files into visualisable panda DataFrame Objects.
+
+    Frames derived from self.df (groupings, pivot tables, filtered views) are kept in an explicit artifact registry with their sizes in bytes. They remain readable as attributes, e.g. pa.Länder_df, and with max_artifact_bytes set the least recently used rebuildable frames are evicted and rebuilt on their next access.
+
+    Dataset objects are shared by the Streamlit session threads, the artifact registry and the memoized results are only read and changed under self.lock.
+
+    The aggregations data_group and pivot_table are memoized per df_version. Assigning self.df or calling a mutating method (dtype_conversion, filter_data) bumps the version, drops the cached aggregations and the frames derived from the previous df, in place changes made outside these methods are announced with touch(). Rebuildable frames are rebuilt from the new df on their next access, frames read from the file (source frames such as periods_df) are kept.
     '''
+    __slots__ = ("path_to_file", "delimiter", "skiprows", "skipfooter", "chunksize", "base_df", "df_version", "memo", "max_artifact_bytes", "artifacts", "artifact_bytes", "rebuilders", "sources", "lock")
 
-    def __init__(self, path_to_file: str, delimiter: str, skiprows: str, skipfooter: str) -> None:
+    def __init__(self, path_to_file: str, delimiter: str, skiprows: str, skipfooter: str, chunksize=100_000, max_artifact_bytes=None) -> None:
         '''
         Instantiates the Dataset object with baseline file parameters:
 
@@ -18,14 +90,185 @@ class Dataset:
         - delimiter: Provide the special characters (, ; / |) to recognize column separators
         - skiprows: provides the top number of rows in the csv file to ignore
         - skipfooter: provides the bottom number of rows in the csv file to ignore
+        - chunksize: number of rows per chunk in the streaming ingest mode (stream_processing)
+        - max_artifact_bytes: memory budget of the derived frames, unbounded as default
         '''
         self.path_to_file  = path_to_file
         self.delimiter = delimiter
         self.skiprows = skiprows
         self.skipfooter = skipfooter
+        self.chunksize = chunksize
 
+        self.lock = threading.RLock()
+        self.max_artifact_bytes = max_artifact_bytes
+        self.artifacts = OrderedDict()
+        self.artifact_bytes = {}
+        self.rebuilders = {}
+        self.sources = set()
+
+        self.df_version = 0
+        self.memo = {}
         self.df = None
 
+    @property
+    def df(self) -> pd.DataFrame:
+        '''
+        Base dataframe of the dataset.
+        '''
+        return self.base_df
+
+    @df.setter
+    def df(self, frame: pd.DataFrame) -> None:
+        with self.lock:
+            self.base_df = frame
+            self.touch()
+
+    def touch(self) -> int:
+        '''
+        Bumps the df_version and drops the memoized aggregations and derived frames of the previous version. Rebuildable frames are rebuilt from the new df on their next access, the others are gone until they are derived again.
+
+        Output:
+        - the new df_version
+        '''
+        with self.lock:
+            self.df_version += 1
+            self.memo.clear()
+
+            for name in [name for name in self.artifacts if name not in self.sources]:
+                del self.artifacts[name]
+                del self.artifact_bytes[name]
+
+            return self.df_version
+
+    def __getattr__(self, name: str):
+        '''
+        Resolves derived frame attributes such as Länder_df from the artifact registry.
+        '''
+        if name.startswith("__") or name in Dataset.__slots__:
+            raise AttributeError(name)
+
+        try:
+            return self.artifact(name)
+        except KeyError:
+            raise AttributeError(f"{type(self).__name__} object has no attribute or derived frame {name}") from None
+
+    def register(self, name: str, frame: pd.DataFrame, rebuild=None, source=False) -> pd.DataFrame:
+        '''
+        Adds a derived frame to the artifact registry and evicts least recently used frames beyond max_artifact_bytes.
+
+        Inputs:
+        - name: attribute name of the frame, e.g. "Länder_df"
+        - frame: derived DataFrame object
+        - rebuild: callable registering the frame again, frames without one are never evicted
+        - source: True for frames read from the file rather than derived from self.df, they are kept when self.df changes
+
+        Output:
+        - the registered frame
+        '''
+        frame_bytes = int(frame.memory_usage(index=True, deep=True).sum())
+
+        with self.lock:
+            self.artifacts[name] = frame
+            self.artifacts.move_to_end(name)
+            self.artifact_bytes[name] = frame_bytes
+
+            if rebuild is not None:
+                self.rebuilders[name] = rebuild
+            else:
+                self.rebuilders.pop(name, None)
+
+            if source:
+                self.sources.add(name)
+            else:
+                self.sources.discard(name)
+
+            if self.max_artifact_bytes is not None:
+                for candidate in [key for key in self.artifacts if key != name and key in self.rebuilders]:
+                    if self.memory_usage() <= self.max_artifact_bytes:
+                        break
+                    self.evict(candidate)
+
+        return frame
+
+    def artifact(self, name: str) -> pd.DataFrame:
+        '''
+        Provides a derived frame, rebuilding it first when it was evicted.
+        '''
+        # Rebuilding under the lock keeps two sessions from running the same rebuilder at once
+        with self.lock:
+            if name not in self.artifacts:
+                if name not in self.rebuilders:
+                    raise KeyError(name)
+
+                print(f"Rebuilding evicted frame {name}")
+                self.rebuilders[name]()
+
+            self.artifacts.move_to_end(name)
+            return self.artifacts[name]
+
+    def evict(self, name: str) -> None:
+        '''
+        Drops a rebuildable derived frame from memory, it is rebuilt on its next access.
+        '''
+        with self.lock:
+            frame = self.artifacts.pop(name, None) if name in self.rebuilders else None
+            if frame is not None:
+                self.artifact_bytes.pop(name)
+
+                # Cached results holding the frame would keep it alive
+                self.memo = {key: entry for key, entry in self.memo.items() if all(registered is not frame for _, registered, _ in entry["registered"])}
+                print(f"Evicted derived frame {name}")
+
+    def memory_usage(self) -> int:
+        '''
+        Total bytes of the resident derived frames.
+        '''
+        with self.lock:
+            return sum(self.artifact_bytes.values())
+
+    def artifact_report(self) -> pd.DataFrame:
+        '''
+        Inspects the artifact registry.
+
+        Output:
+        - DataFrame with the name, bytes, resident and rebuildable state of every derived frame, in least recently used order
+        '''
+        with self.lock:
+            names = list(self.artifacts) + [name for name in self.rebuilders if name not in self.artifacts]
+            return pd.DataFrame({
+                "artifact": names,
+                "bytes": [self.artifact_bytes.get(name, 0) for name in names],
+                "resident": [name in self.artifacts for name in names],
+                "rebuildable": [name in self.rebuilders for name in names],
+            })
+
+    def summary(self, name: str) -> FrameSummary:
+        '''
+        Provides the summary statistics (totals, maxima, shares, sort orders) of a derived frame, computed once per df_version and frame.
+
+        Inputs:
+        - name: derived frame name, e.g. "PublicAssistance_df"
+        '''
+        key = ("summary", name)
+
+        with self.lock:
+            frame = self.artifact(name)
+            entry = self.memo.get(key)
+            if entry is None or entry["result"].frame is not frame:
+                # Listing the frame lets an eviction drop the summary with it
+                entry = {"result": FrameSummary(frame), "registered": [(name, frame, self.rebuilders.get(name))]}
+                self.memo[key] = entry
+
+            return entry["result"]
+
+    def frames(self) -> dict:
+        '''
+        Provides self.df and every derived frame, evicted frames are rebuilt.
+        '''
+        with self.lock:
+            names = list(self.artifacts) + [name for name in self.rebuilders if name not in self.artifacts]
+            return {"df": self.df, **{name: self.artifact(name) for name in names}}
+
     def encoding_detection(func):
         '''
         A Decorator to retrieve the encoding type of the csv file to be used as input as part of the wrapping function (func)
@@ -34,11 +277,20 @@ class Dataset:
         - func: The callback function to be used in the wrapper function
         '''
         def wrapping_function(self, *args, **kwargs):
+            # chardet is only loaded when a csv file is read, attached store frames skip it
+            from chardet.universaldetector import UniversalDetector
+
             try:
+                # Feeds the detector block by block so large extracts are not read into memory at once
+                detector = UniversalDetector()
                 with open(self.path_to_file, "rb") as data_file:
-                    output = chardet.detect(data_file.read())
-                    encoding = output["encoding"]
-                    print(f"\nCSV file encoding: {encoding}")
+                    for block in iter(lambda: data_file.read(65_536), b""):
+                        detector.feed(block)
+                        if detector.done:
+                            break
+                detector.close()
+                encoding = detector.result["encoding"]
+                print(f"\nCSV file encoding: {encoding}")
             except FileNotFoundError as FE:
                 print("File {0} was not found, check relative path".format(self.file_to_path))
                 return
@@ -47,13 +299,66 @@ class Dataset:
                 return
             finally:
                 if encoding:
-                    return func(self, encoding, *args, *kwargs)
+                    return func(self, encoding, *args, **kwargs)
                 else:
                     print("Encoding was not identified from file")
                     return None
         return wrapping_function
 
+    @encoding_detection
+    def detected_encoding(self, encoding: str) -> str:
+        '''
+        Returns the encoding of the csv file as identified by the encoding_detection decorator, for readers outside of pandas.
+        '''
+        return encoding
+
+    def file_preview(self, encoding: str, characters=500) -> str:
+        '''
+        Prints the first characters of the csv file without reading the whole file into memory.
+
+        Inputs:
+        - encoding: file encoding retrieved by the encoding_detection decorator
+        - characters: number of characters to preview, 500 as default argument
+        '''
+        with open(self.path_to_file, "r", encoding=encoding) as data_file:
+            file_contents = data_file.read(characters)
+            print("\n", file_contents)
 
+        return file_contents
+
+    def region_normalization(self, df: pd.DataFrame, region_col="Länder") -> pd.DataFrame:
+        '''
+        Restores the Länder names whose umlauts are lost through the GENESIS export encoding (Baden-Württemberg, Thüringen).
+
+        Inputs:
+        - df: Dataframe object or chunk holding the region column
+        - region_col: Default set to 'Länder'
+        '''
+        replaced_substring_1 = "ttemberg"
+        replaced_substring_2 = "ingen"
+        change_mechanism_1 = df[region_col].astype(str).str.endswith(replaced_substring_1)
+        change_mechanism_2 = df[region_col].astype(str).str.endswith(replaced_substring_2)
+
+        df.loc[change_mechanism_1, region_col] = "Baden-Württemberg"
+        df.loc[change_mechanism_2, region_col] = "Thüringen"
+
+        return df
+
+    def total_mask(self, df: pd.DataFrame) -> pd.Series:
+        '''
+        Vectorized check for rows holding a "Total" value in any of the non-numeric columns.
+
+        Inputs:
+        - df: Dataframe object or chunk
+
+        Output:
+        - Boolean series, True for the rows containing "Total"
+        '''
+        text_columns = df.select_dtypes(exclude="number")
+
+        return text_columns.astype(str).apply(lambda col: col.str.contains("Total")).any(axis=1)
+
+    @mutates
     def dtype_conversion(self, *args: str) -> pd.DataFrame:
         '''
         Takes column names of a dataframe as string inputs and converts the datatypes of selected columns into int64
@@ -77,6 +382,31 @@ class Dataset:
 
         return self.df
 
+    def reported_values(self, value_cols: list[str], data=None, columns=None) -> pd.DataFrame:
+        '''
+        Converts the value columns as reported in the file, the GENESIS placeholders ("-", ".", "...") become NaN instead of the zeros filled in by dtype_conversion. Registered as the source frame reported_df, so the joined analytics can tell unreported cells from zeros.
+
+        Inputs:
+        - value_cols: numeric columns to convert
+        - data: unconverted dataframe from file_processing, the file is read through chunk_source when None
+        - columns: column names passed to chunk_source
+
+        Output:
+        - Dataframe without the "Total" rows, stored as reported_df
+        '''
+        if data is None:
+            data = self.region_normalization(pd.concat(self.chunk_source(self.detected_encoding(), columns), ignore_index=True))
+
+        reported_df = data.copy()
+        for col in value_cols:
+            reported_df[col] = pd.to_numeric(reported_df[col], errors="coerce")
+
+        reported_df = reported_df[~self.total_mask(reported_df)].reset_index(drop=True)
+
+        self.register("reported_df", reported_df, rebuild=partial(self.reported_values, value_cols, columns=columns), source=True)
+        return reported_df
+
+    @mutates
     def filter_data(self, region_col="Länder"):
         '''
         Use case for row values containing "Total" and filters them out of the dataframe object
@@ -85,7 +415,7 @@ class Dataset:
         - region_col: Default set to 'Länder'
         '''
         try:
-            self.df = self.df[~self.df.apply(lambda r: r.astype(str).str.contains("Total").any(), axis=1)]
+            self.df = self.df[~self.total_mask(self.df)]
 
             self.df.reset_index(drop=False, inplace=True)
 
@@ -95,6 +425,7 @@ class Dataset:
         finally:
             return self.df
 
+    @memoized
     def data_group(self, cols: list[str], group_element: str, include_total=False) -> pd.DataFrame:
         '''
         Provides a related dataframe dependent upon the "group_element" attribute of the original dataframe.
@@ -114,7 +445,7 @@ class Dataset:
             if include_total:
                 grouped_data["Total"] = grouped_data[cols].sum(axis=1)
 
-            setattr(self, var_name, grouped_data)
+            self.register(var_name, grouped_data, rebuild=partial(self.data_group, cols, group_element, include_total))
             print(f"\nGrouped DataFrame with sums: \n{grouped_data.head()}")
 
             return grouped_data
@@ -123,17 +454,94 @@ class Dataset:
         finally:
             print("Grouped Function process completed")
 
+    @abstractmethod
+    def chunk_source(self, encoding: str, columns: list[str]):
+        '''
+        Yields the raw file in chunks of self.chunksize rows with the final column names assigned. Each child class defines how its GENESIS layout is read.
+        '''
+
+    def retained_rows(self, chunks: list[pd.DataFrame]) -> pd.DataFrame:
+        '''
+        Combines the chunks kept by stream_processing into the row level dataframe, with the file row positions moved into an index column as filter_data does in the eager path.
+        '''
+        return pd.concat(chunks).reset_index(drop=False)
+
+    @encoding_detection
+    def stream_processing(self, encoding: str, numeric_cols: list[str], group_elements: list, columns=None, include_total=False, filter_total=True, retain_rows=False) -> dict:
+        '''
+        Streaming ingest mode for large GENESIS extracts. Reads the file in chunks of self.chunksize rows and applies the region normalization, dtype conversion and Total filtering per chunk, feeding running groupby sums instead of holding the full file in memory.
+
+        Inputs:
+        - numeric_cols: columns converted to numeric values and summed in the aggregations
+        - group_elements: group columns, a list entry groups by several columns (e.g. ["Länder", "Gender"])
+        - columns: column names forwarded to the chunk_source of the child class
+        - include_total: boolean value to introduce a total column in the aggregations, False as default argument.
+        - filter_total: boolean value to remove rows containing "Total", True as default argument.
+        - retain_rows: keeps the processed rows as self.df, False as default argument.
+
+        Output:
+        - Dictionary of grouped dataframes, also assigned as "{group_element}_df" attributes like data_group
+        '''
+        running_totals = {}
+        kept_chunks = []
+
+        for chunk in self.chunk_source(encoding, columns):
+            # Chunks made up of footer notes only are empty once the child class drops them
+            if chunk.empty:
+                continue
+
+            chunk = self.region_normalization(chunk)
+
+            for col in numeric_cols:
+                chunk[col] = pd.to_numeric(chunk[col], errors="coerce")
+            chunk = chunk.fillna(0)
+
+            if filter_total:
+                chunk = chunk[~self.total_mask(chunk)]
+
+            for group_element in group_elements:
+                group_key = "".join(group_element) if isinstance(group_element, list) else group_element
+                chunk_totals = chunk.groupby(group_element)[numeric_cols].sum()
+
+                if group_key in running_totals:
+                    chunk_totals = pd.concat([running_totals[group_key], chunk_totals])
+                    chunk_totals = chunk_totals.groupby(level=list(range(chunk_totals.index.nlevels))).sum()
+
+                running_totals[group_key] = chunk_totals
+
+            if retain_rows:
+                kept_chunks.append(chunk)
+
+        # Assigned first, as a new df drops the frames derived before it
+        if retain_rows and kept_chunks:
+            self.df = self.retained_rows(kept_chunks)
+
+        grouped_frames = {}
+        for group_key, grouped_data in running_totals.items():
+            grouped_data = grouped_data.reset_index()
+
+            if include_total:
+                grouped_data["Total"] = grouped_data[numeric_cols].sum(axis=1)
+
+            self.register(f"{group_key}_df", grouped_data)
+            grouped_frames[group_key] = grouped_data
+            print(f"\nStreamed Grouped DataFrame with sums: \n{grouped_data.head()}")
+
+        return grouped_frames
+
 
 class PublicAssistance(Dataset):
     '''
     The child class inheriting from the Dataset class, focusing on the primary dataset public_assistance.
     '''
+    __slots__ = ()
+
 
-    def __init__(self, path_to_file, delimiter, skiprows, skipfooter):
+    def __init__(self, path_to_file, delimiter, skiprows, skipfooter, chunksize=100_000, max_artifact_bytes=None):
         '''
         Instantiates the PublicAssistance class object with the same parameters as defined in the Dataset class with no additions
         '''
-        super().__init__(path_to_file, delimiter, skiprows, skipfooter)
+        super().__init__(path_to_file, delimiter, skiprows, skipfooter, chunksize, max_artifact_bytes)
     
     @Dataset.encoding_detection
     def file_processing(self, encoding: str, columns: list[str]) -> pd.DataFrame:
@@ -141,74 +549,181 @@ class PublicAssistance(Dataset):
         Utilises the decorator function defined in the Dataset Class to identify file encoding and reads the contents of the files prior to conversion to a dataframe object.
         '''
         try:
-            with open(self.path_to_file, "r", encoding=encoding) as data_file:
-                file_contents = data_file.read()
-                print("\n", file_contents[:500])
+            self.file_preview(encoding)
 
             df = pd.read_csv(self.path_to_file, encoding=encoding, delimiter=self.delimiter, skiprows=self.skiprows, engine="python")
             df.columns = columns
 
             #print("\n", df.head(10))
 
-            replaced_substring_1 = "ttemberg"
-            replaced_substring_2 = "ingen"
-            change_mechanism_1 = df["Länder"].str.endswith(replaced_substring_1)
-            change_mechanism_2 = df["Länder"].str.endswith(replaced_substring_2)
-
-            df.loc[change_mechanism_1, "Länder"] = "Baden-Württemberg"
-            df.loc[change_mechanism_2, "Länder"] = "Thüringen"
+            df = self.region_normalization(df)
             self.df = df
 
             return
         except FileNotFoundError:
             print("{0} File not detected, update the url argument provided".format(self.path_to_file))
             return
+
+    def chunk_source(self, encoding: str, columns: list[str]):
+        '''
+        Yields the public assistance file in chunks of self.chunksize rows with the provided column names.
+        '''
+        chunks = pd.read_csv(self.path_to_file, encoding=encoding, delimiter=self.delimiter, skiprows=self.skiprows, chunksize=self.chunksize)
+
+        for chunk in chunks:
+            chunk.columns = columns
+            yield chunk
     
 
 class BasicSecurity(Dataset):
     '''
     The child class inheriting from the Dataset class, focusing on the primary dataset public_assistance.
     '''
-    def __init__(self, path_to_file, delimiter, skiprows, skipfooter):
+    __slots__ = ()
+
+    # GENESIS reference months of each quarter, used to label the period columns
+    quarter_months = {"March": "Q1", "June": "Q2", "September": "Q3", "December": "Q4"}
+
+    def __init__(self, path_to_file, delimiter, skiprows, skipfooter, chunksize=100_000, max_artifact_bytes=None):
         '''
         Instantiates the BasicSecurity class object with the same parameters as defined in the Dataset class with no additions
         '''
-        super().__init__(path_to_file, delimiter, skiprows, skipfooter)
+        super().__init__(path_to_file, delimiter, skiprows, skipfooter, chunksize, max_artifact_bytes)
+
+    def period_labels(self, encoding: str, id_count=2) -> list[str]:
+        '''
+        Reads the two GENESIS header rows (year and reference month) and combines them into one label per period column, e.g. "2022-Q1".
+
+        Inputs:
+        - encoding: file encoding retrieved by the encoding_detection decorator
+        - id_count: number of leading identifier columns (Länder and breakdowns) before the period columns
+
+        Output:
+        - List of period labels in file order
+        '''
+        header = pd.read_csv(self.path_to_file, encoding=encoding, delimiter=self.delimiter, skiprows=self.skiprows, nrows=2, header=None, dtype=str)
+
+        years = header.iloc[0, id_count:]
+        months = header.iloc[1, id_count:]
+
+        return [f"{year}-{self.quarter_months.get(month, month)}" for year, month in zip(years, months)]
 
     @Dataset.encoding_detection
-    def file_processing(self, encoding: str, columns: list[str]) -> pd.DataFrame:
+    def file_processing(self, encoding: str, columns: list[str], reference_year=2022) -> pd.DataFrame:
         '''
         Utilises the decorator function defined in the Dataset Class to identify file encoding and reads the contents of the files prior to conversion to a dataframe object.
 
-        Additionally, The function reduces the dataframe size by selecting the critical dataframe columns and assigns the dataframe object to the object property.
+        Additionally, The function reduces the dataframe size by selecting the periods of the reference year and assigns the dataframe object to the object property.
+
+        Inputs:
+        - columns: names for the Länder, Gender and the selected period columns
+        - reference_year: year whose periods are selected, 2022 as default argument
         '''
         try:
-            with open(self.path_to_file, "r", encoding=encoding) as data_file:
-                file_contents = data_file.read()
-                print("\n", file_contents[:500])
+            self.file_preview(encoding)
 
+            labels = self.period_labels(encoding)
 
-            df = pd.read_csv(self.path_to_file, encoding=encoding, delimiter=self.delimiter, skiprows=self.skiprows, skipfooter=self.skipfooter, engine="python")
+            df = pd.read_csv(self.path_to_file, encoding=encoding, delimiter=self.delimiter, skiprows=self.skiprows + 2, skipfooter=self.skipfooter, header=None, names=["Länder", "Gender", *labels], engine="python")
 
-            df = df.drop(0).reset_index(drop=True)
+            selected_periods = [label for label in labels if label.startswith(f"{reference_year}-")]
+            if len(selected_periods) != len(columns) - 2:
+                print(f"{len(columns) - 2} period columns requested, but {reference_year} has {len(selected_periods)} periods: {selected_periods}")
+                return
 
-            df = df.iloc[:, [0 , 1, 30, 31, 32, 33]]
+            df = self.region_normalization(df)
 
-            df.columns = columns
+            # The long format of every period is derived from the same read instead of a second pass over the file
+            periods_df = self.periods_frame(self.period_totals(df, ["Länder", "Gender"], labels))
 
-            replaced_substring_1 = "ttemberg"
-            replaced_substring_2 = "ingen"
-            change_mechanism_1 = df["Länder"].str.endswith(replaced_substring_1)
-            change_mechanism_2 = df["Länder"].str.endswith(replaced_substring_2)
+            df = df[["Länder", "Gender", *selected_periods]]
 
-            df.loc[change_mechanism_1, "Länder"] = "Baden-Württemberg"
-            df.loc[change_mechanism_2, "Länder"] = "Thüringen"
+            df.columns = columns
 
             self.df = df
+            self.register("periods_df", periods_df, rebuild=partial(self.period_aggregation, breakdowns=("Gender",)), source=True)
         except FileNotFoundError:
             print("{0} File not detected, update the url argument provided".format(self.path_to_file))
             return
 
+    def chunk_source(self, encoding: str, columns: list[str], reference_year=2022):
+        '''
+        Yields the basic security file in chunks of self.chunksize rows, restricted to the periods of the reference year and named after the provided columns.
+        '''
+        labels = self.period_labels(encoding)
+        selected_periods = [label for label in labels if label.startswith(f"{reference_year}-")]
+
+        chunks = pd.read_csv(self.path_to_file, encoding=encoding, delimiter=self.delimiter, skiprows=self.skiprows + 2, header=None, names=["Länder", "Gender", *labels], dtype=str, chunksize=self.chunksize)
+
+        for chunk in chunks:
+            # Footer notes only populate the first column
+            chunk = chunk.dropna(subset=["Gender"])[["Länder", "Gender", *selected_periods]]
+            chunk.columns = columns
+            yield chunk
+
+    def period_totals(self, wide: pd.DataFrame, id_cols: list[str], labels: list[str]) -> pd.DataFrame:
+        '''
+        Sums the period columns of a wide dataframe or chunk per (Länder, breakdowns), leaving out the footer notes and the "Total" rows.
+
+        Inputs:
+        - wide: Dataframe object or chunk with the identifier and period columns
+        - id_cols: Länder and the breakdown columns
+        - labels: period columns
+
+        Output:
+        - Dataframe indexed by id_cols with one column per period, NaN where only GENESIS placeholders ("...", "-", ".") were reported
+        '''
+        # Footer notes only populate the first column
+        wide = wide.dropna(subset=id_cols[1:])
+        wide = wide[~self.total_mask(wide[id_cols])]
+
+        period_values = wide[labels].apply(pd.to_numeric, errors="coerce")
+
+        return period_values.groupby([wide[col] for col in id_cols]).sum(min_count=1)
+
+    def periods_frame(self, totals: pd.DataFrame) -> pd.DataFrame:
+        '''
+        Converts the period totals into the long format periods_df, the unreported periods are kept as missing values of the nullable Int64 Value column.
+        '''
+        totals.columns.name = "Period"
+
+        return totals.stack(future_stack=True).astype("Int64").rename("Value").reset_index()
+
+    @Dataset.encoding_detection
+    def period_aggregation(self, encoding: str, breakdowns=("Gender",), chunksize=None) -> pd.DataFrame:
+        '''
+        Ingests every reference period and breakdown of the file in chunks and keeps running sums per (Länder, breakdowns, period), so memory is bounded by the number of groups rather than the file size.
+
+        Inputs:
+        - breakdowns: names of the breakdown columns following Länder in the file (Gender, age group, location, institution)
+        - chunksize: number of rows read per chunk, self.chunksize as default
+
+        Output:
+        - Long format dataframe with Länder, breakdowns, Period and Value columns, stored as periods_df
+        '''
+        id_cols = ["Länder", *breakdowns]
+        labels = self.period_labels(encoding, id_count=len(id_cols))
+
+        running_totals = None
+        chunks = pd.read_csv(self.path_to_file, encoding=encoding, delimiter=self.delimiter, skiprows=self.skiprows + 2, header=None, names=[*id_cols, *labels], dtype={col: str for col in id_cols}, chunksize=chunksize or self.chunksize)
+
+        for chunk in chunks:
+            chunk_totals = self.period_totals(self.region_normalization(chunk), id_cols, labels)
+
+            # Adding with fill_value keeps a cell NaN only while no chunk has reported it
+            running_totals = chunk_totals if running_totals is None else running_totals.add(chunk_totals, fill_value=0)
+
+        if running_totals is None:
+            print(f"No rows were read from {self.path_to_file}")
+            return
+
+        periods_df = self.periods_frame(running_totals)
+
+        self.register("periods_df", periods_df, rebuild=partial(self.period_aggregation, breakdowns=breakdowns, chunksize=chunksize), source=True)
+        print(f"\nAggregated {len(labels)} periods: \n{periods_df.head()}")
+
+        return periods_df
+
     def modify_for_pivot(func) -> pd.DataFrame:
         '''
         Decorator that groups data by defined columns and establish a pivot table in a dataframe.
@@ -219,21 +734,29 @@ class BasicSecurity(Dataset):
         Output:
         - produces the wrapper function with added functionality of the decorator. 
         '''
+        @wraps(func)
         def wrapper_function(self, columns: list[str], group_element: list[str], **kwargs) -> pd.DataFrame:
             grouped_data = self.df.groupby(list(group_element))[columns].sum().reset_index()
             
             grouped_data[kwargs["values"]] = grouped_data[columns].sum(axis=1)
             
-            setattr(self, f"{group_element[0] + group_element[1]}_df", grouped_data)
+            # Both frames are rebuilt together from the same arguments
+            rebuild = partial(wrapper_function, self, columns, group_element, **kwargs)
+            self.register(f"{group_element[0] + group_element[1]}_df", grouped_data, rebuild=rebuild)
             print(f"\nGrouped DataFrame with sums: \n{grouped_data.head()}")
 
             values = kwargs.get("values")
             index = kwargs.get("index")
             column_header = kwargs.get("column_header")
             
-            return func(self, values, index, column_header, grouped_data)
+            pivot_table = func(self, values, index, column_header, grouped_data)
+            if pivot_table is not None:
+                self.register("pivot_df", pivot_table, rebuild=rebuild)
+
+            return pivot_table
         return wrapper_function
     
+    @memoized
     @modify_for_pivot
     def pivot_table(self, values: str, index: str, column_header: str, grouped_data: pd.DataFrame) -> pd.DataFrame:
         '''
@@ -246,12 +769,10 @@ class BasicSecurity(Dataset):
         - grouped_data: the previously defined dataframe object grouped by
 
         Output:
-        - Pivot Table in a Pandas Dataframe object
+        - Pivot Table in a Pandas Dataframe object, also registered as pivot_df
         '''
         try:
             pivot_table = grouped_data.pivot_table(values=values, index=index, columns=column_header)
-        
-            setattr(self, "pivot_table", pivot_table)
 
             #print(pivot_table.head(10))
 
@@ -263,6 +784,8 @@ class BasicSecurity(Dataset):
         '''
         Provides the expanded dataframe object and maximum quarterly values for further visualization
 
+        The long format is built directly from the wide quarter array instead of pd.melt: the values are one copy of the quarter columns raveled in column-major order, the id column is stored as repeated categorical codes (np.tile) and the quarter labels as categorical codes (np.repeat), so no duplicated object-dtype strings are materialized. The maximum skips unreported (missing) quarters like the DataFrame max.
+
         Inputs:
         - data: the Dataframe object to extract the melted dataframe and max values
         - cols: The list of columns of quarters to attain max values
@@ -273,11 +796,20 @@ class BasicSecurity(Dataset):
         - Maximum value from quarter columns
         '''
         try:
-            quarter_view = data[cols]
+            id_col, value_cols = cols[0], list(cols[1:])
 
-            max_value = quarter_view[cols[1:]].max().max()
+            # to_numpy copies the quarter columns once, column-major raveling keeps pd.melt row order (quarter by quarter)
+            quarter_values = data[value_cols].to_numpy()
+            max_value = data[value_cols].max().max()
 
-            elongate_df = pd.melt(quarter_view, id_vars=[cols[0]], var_name=var_assignment, value_name=value_name)
+            id_codes, id_labels = pd.factorize(data[id_col])
+            n_rows, n_quarters = quarter_values.shape
+
+            elongate_df = pd.DataFrame({
+                id_col: pd.Categorical.from_codes(np.tile(id_codes, n_quarters), categories=id_labels),
+                var_assignment: pd.Categorical.from_codes(np.repeat(np.arange(n_quarters), n_rows), categories=value_cols),
+                value_name: quarter_values.ravel(order="F"),
+            }, copy=False)
 
             return elongate_df, max_value
         except KeyError:
@@ -289,73 +821,88 @@ class Subsistence(Dataset):
     '''
     The Subsistence is deriving attributes and methods from the Parent Dataset class.
     '''
-    def __init__(self, path_to_file, delimiter, skiprows, skipfooter):
+    __slots__ = ()
+
+    # GENESIS header names mapped onto descriptive column names
+    column_names = {
+        "Unnamed: 0": "Länder",
+        "Unnamed: 1": "Year",
+        "Male": "Non-Institution German Males",
+        "Male.1": "Non-Institution Foreign Males",
+        "Male.2": "Total Non-Insitution Males",
+        "Male.3": "Institution German Males",
+        "Male.4": "Insitution Foreign Males",
+        "Male.5": "Total Institution Males",
+        "Male.6": "Total German Males",
+        "Male.7": "Total Foreign Males",
+        "Male.8": "Total Males",
+        "Female": "Non-Institution German Females",
+        "Female.1": "Non-Institution Foreign Females",
+        "Female.2": "Total Non-Insitution Females",
+        "Female.3": "Institution German Females",
+        "Female.4": "Insitution Foreign Females",
+        "Female.5": "Total Institution Females",
+        "Female.6": "Total German Females",
+        "Female.7": "Total Foreign Females",
+        "Female.8": "Total Females",
+        "Total": "Non-Institution Germans Total",
+        "Total.1": "Non-Institution Foreign Total",
+        "Total.2": "Non-Institution Total",
+        "Total.3": "Institution Germans Total",
+        "Total.4": "Institution Foreign Total",
+        "Total.5": "Institution Total",
+        "Total.6": "Germans Total",
+        "Total.7": "Foreign Total",
+        "Total.8": "Total",
+        "Date": "Year"
+    }
+
+    def __init__(self, path_to_file, delimiter, skiprows, skipfooter, chunksize=100_000, max_artifact_bytes=None):
         '''
         Instantiates the Subsistence class object with the same parameters as defined in the Dataset class with no additions
         '''
-        super().__init__(path_to_file, delimiter, skiprows, skipfooter)
+        super().__init__(path_to_file, delimiter, skiprows, skipfooter, chunksize, max_artifact_bytes)
 
     @Dataset.encoding_detection
     def file_processing(self, encoding: str) -> pd.DataFrame:
         '''
         Utilizes the encoding decorator to retrieve the csv files encoding as an input parameter in the wrapper function. Optimizes the csv file to translate into a Dataframe object by removing unnecessary rows and footers.
         '''
-        with open(self.path_to_file, "r", encoding=encoding) as data_file:
-            file_contents = data_file.read()
-            print("\n", file_contents[:500])
+        self.file_preview(encoding)
 
         df = pd.read_csv(self.path_to_file, encoding=encoding, delimiter=';', skiprows=self.skiprows, skipfooter=self.skipfooter, engine="python")
 
-        df.rename(
-            columns=
-            {
-            "Unnamed: 0": "Länder", 
-            "Unnamed: 1": "Year",
-            "Male": "Non-Institution German Males",
-            "Male.1": "Non-Institution Foreign Males",
-            "Male.2": "Total Non-Insitution Males",
-            "Male.3": "Institution German Males",
-            "Male.4": "Insitution Foreign Males",
-            "Male.5": "Total Institution Males",
-            "Male.6": "Total German Males",
-            "Male.7": "Total Foreign Males",
-            "Male.8": "Total Males",
-            "Female": "Non-Institution German Females",
-            "Female.1": "Non-Institution Foreign Females",
-            "Female.2": "Total Non-Insitution Females",
-            "Female.3": "Institution German Females",
-            "Female.4": "Insitution Foreign Females",
-            "Female.5": "Total Institution Females",
-            "Female.6": "Total German Females",
-            "Female.7": "Total Foreign Females",
-            "Female.8": "Total Females",
-            "Total": "Non-Institution Germans Total",
-            "Total.1": "Non-Institution Foreign Total",
-            "Total.2": "Non-Institution Total",
-            "Total.3": "Institution Germans Total",
-            "Total.4": "Institution Foreign Total",
-            "Total.5": "Institution Total",
-            "Total.6": "Germans Total",
-            "Total.7": "Foreign Total",
-            "Total.8": "Total",
-            "Date": "Year"}, 
-            inplace=True)
+        df.rename(columns=self.column_names, inplace=True)
         
         df = df.iloc[1:]
 
         df.Year = df["Year"].str[:4]
         
-        replaced_substring_1 = "ttemberg"
-        replaced_substring_2 = "ingen"
-        change_mechanism_1 = df["Länder"].str.endswith(replaced_substring_1)
-        change_mechanism_2 = df["Länder"].str.endswith(replaced_substring_2)
-
-        df.loc[change_mechanism_1, "Länder"] = "Baden-Württemberg"
-        df.loc[change_mechanism_2, "Länder"] = "Thüringen"
+        df = self.region_normalization(df)
 
         self.df = df
         #print("This is revised dataframe of the subsistence recipients\n", df.head())
 
+    def chunk_source(self, encoding: str, columns=None):
+        '''
+        Yields the subsistence file in chunks of self.chunksize rows with the descriptive column names and the reference date reduced to its year. The columns argument is not used as the names are defined by column_names. The values are read as text, so the header rows do not decide their dtype and stream_processing converts them like dtype_conversion.
+        '''
+        chunks = pd.read_csv(self.path_to_file, encoding=encoding, delimiter=self.delimiter, skiprows=self.skiprows, dtype=str, chunksize=self.chunksize)
+
+        for chunk in chunks:
+            chunk = chunk.rename(columns=self.column_names)
+
+            # The nationality header row and the footer notes carry no reference date
+            chunk = chunk.dropna(subset=["Year"])
+            chunk["Year"] = chunk["Year"].str[:4]
+            yield chunk
+
+    def retained_rows(self, chunks: list[pd.DataFrame]) -> pd.DataFrame:
+        '''
+        Combines the chunks kept by stream_processing, keeping the file row positions as the index like file_processing.
+        '''
+        return pd.concat(chunks)
+
 
     def filter_data(self, year_start: int, year_end: int) -> pd.DataFrame:
         '''
@@ -367,7 +914,7 @@ class Subsistence(Dataset):
         '''
         filtered_df = self.df[self.df["Year"].between(year_start, year_end)]
 
-        setattr(self, "filtered_df", filtered_df)
+        self.register("filtered_df", filtered_df, rebuild=partial(self.filter_data, year_start, year_end))
 
         #print(f"Filtered data between {year_start} & {year_end}\n", filtered_df.head(15))
 
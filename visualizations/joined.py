@@ -0,0 +1,205 @@
+'''
+This section provides the joined analytics layer of the three datasets. The public assistance expenditure, the basic security benefit recipients and the subsistence payment recipients are aligned on the official Länder codes and the year into one (Länder x Year) grid of numpy arrays. The per-recipient and year-over-year growth metrics are then array operations over the aligned grid instead of merges of the dataframes. The grid is built from the values as reported, GENESIS placeholders stay NaN rather than the zeros of the dashboard frames.
+'''
+import numpy as np
+import pandas as pd
+
+from .eda import PublicAssistance, BasicSecurity, Subsistence
+
+# Official Länder codes (Amtlicher Regionalschlüssel), the grid rows follow their order
+LAND_CODES = {
+    "Schleswig-Holstein": "01",
+    "Hamburg": "02",
+    "Niedersachsen": "03",
+    "Bremen": "04",
+    "Nordrhein-Westfalen": "05",
+    "Hessen": "06",
+    "Rheinland-Pfalz": "07",
+    "Baden-Württemberg": "08",
+    "Bayern": "09",
+    "Saarland": "10",
+    "Berlin": "11",
+    "Brandenburg": "12",
+    "Mecklenburg-Vorpommern": "13",
+    "Sachsen": "14",
+    "Sachsen-Anhalt": "15",
+    "Thüringen": "16",
+}
+
+# TypeCodes of the public assistance rows paid to the recipients of the other two datasets
+SUBSISTENCE_TYPE = "SOZ-03"
+BASIC_SECURITY_TYPE = "SOZ-04"
+
+# Metric name -> label offered by the WebApp
+METRICS = {
+    "subsistence_net_per_recipient": "Net subsistence expenditure per recipient (EUR)",
+    "basic_security_net_per_recipient": "Net basic security expenditure per recipient (EUR)",
+    "net_expenditure": "Net expenditure of all types of social benefits (TEUR)",
+    "subsistence_recipients": "Recipients of subsistence payments",
+    "basic_security_recipients": "Recipients of basic security benefits, mean of the quarters",
+    "subsistence_recipients_growth": "Year-over-year growth of the subsistence payment recipients (%)",
+    "basic_security_recipients_growth": "Year-over-year growth of the basic security benefit recipients (%)",
+    "net_expenditure_growth": "Year-over-year growth of the net expenditure (%)",
+}
+
+
+class JoinedGrid:
+    '''
+    The JoinedGrid class holds the measures of the three datasets as arrays of shape (Länder, years). Cells without reported values are NaN, so a missing year or placeholder is never mistaken for a zero. Derived metrics are computed on first request and kept afterwards.
+    '''
+
+    def __init__(self, years, measures: dict) -> None:
+        '''
+        Instantiates the grid from its labels and measure arrays, see build.
+
+        Inputs:
+        - years: consecutive years of the grid columns
+        - measures: dictionary of measure name -> array of shape (Länder, years)
+        '''
+        self.laender = np.array(list(LAND_CODES), dtype=object)
+        self.codes = np.array(list(LAND_CODES.values()), dtype=object)
+        self.years = np.asarray(years, dtype=np.int64)
+        self.measures = measures
+        self.metrics = {}
+
+    @staticmethod
+    def align(laender: pd.Series, years, values, year_start: int, year_count: int, mean=False) -> np.ndarray:
+        '''
+        Sums or averages the reported values of long format rows into their (Länder, year) cells.
+
+        Inputs:
+        - laender: Länder name of each row
+        - years: year of each row
+        - values: numeric value of each row, NaN for unreported values
+        - year_start: year of the first grid column
+        - year_count: number of grid columns
+        - mean: averages the reported values of each cell instead of summing them
+
+        Output:
+        - Array of shape (Länder, years), NaN where no reported value falls into the cell
+        '''
+        land_index = pd.Index(list(LAND_CODES)).get_indexer(laender)
+        year_index = np.asarray(years, dtype=np.int64) - year_start
+        values = pd.Series(values).to_numpy(dtype=np.float64, na_value=np.nan)
+
+        # Rows of unknown regions (e.g. a Deutschland total) and unreported values are not part of the grid
+        known = (land_index >= 0) & ~np.isnan(values)
+        cells = land_index[known] * year_count + year_index[known]
+        size = len(LAND_CODES) * year_count
+
+        sums = np.bincount(cells, weights=values[known], minlength=size)
+        counts = np.bincount(cells, minlength=size)
+
+        result = np.full(size, np.nan)
+        np.divide(sums, counts if mean else 1, out=result, where=counts > 0)
+
+        return result.reshape(len(LAND_CODES), year_count)
+
+    @classmethod
+    def build(cls, pa: PublicAssistance, bsc: BasicSecurity, sub_benefits: Subsistence):
+        '''
+        Aligns the reported values of the processed datasets into one grid spanning the years of all three.
+
+        Inputs:
+        - pa: processed PublicAssistance object with its reported_df
+        - bsc: processed BasicSecurity object with its periods_df
+        - sub_benefits: processed Subsistence object with its reported_df, all years are aligned
+        '''
+        expenditure = pa.reported_df
+        recipients = sub_benefits.reported_df
+
+        # The breakdowns are summed per quarter, a quarter stays unreported when none of them was reported
+        quarters = bsc.periods_df.groupby(["Länder", "Period"])["Value"].sum(min_count=1).reset_index()
+        period_years = quarters["Period"].str[:4].astype(np.int64).to_numpy()
+
+        all_years = np.concatenate([expenditure["Year"].to_numpy(dtype=np.int64), period_years, recipients["Year"].to_numpy(dtype=np.int64)])
+        year_start = int(all_years.min())
+        year_count = int(all_years.max()) - year_start + 1
+
+        measures = {}
+        for name, type_code in (("net_expenditure", None), ("subsistence_net_expenditure", SUBSISTENCE_TYPE), ("basic_security_net_expenditure", BASIC_SECURITY_TYPE)):
+            rows = expenditure if type_code is None else expenditure[expenditure["TypeCode"] == type_code]
+            measures[name] = cls.align(rows["Länder"], rows["Year"], rows["NetExpenditure(TEUR)"], year_start, year_count)
+
+        measures["subsistence_recipients"] = cls.align(recipients["Länder"], recipients["Year"], recipients["Total"], year_start, year_count)
+
+        # Mean of the reported quarterly reference months of each year
+        measures["basic_security_recipients"] = cls.align(quarters["Länder"], period_years, quarters["Value"], year_start, year_count, mean=True)
+
+        return cls(np.arange(year_start, year_start + year_count), measures)
+
+    @staticmethod
+    def per_recipient(expenditure: np.ndarray, recipients: np.ndarray) -> np.ndarray:
+        '''
+        Net expenditure in Euros per recipient, NaN where there are no recipients.
+        '''
+        result = np.full(expenditure.shape, np.nan)
+        np.divide(expenditure * 1000, recipients, out=result, where=recipients > 0)
+
+        return result
+
+    @staticmethod
+    def growth(values: np.ndarray) -> np.ndarray:
+        '''
+        Year-over-year growth in percent along the year axis, NaN for the first year and where the previous year has no positive value.
+        '''
+        result = np.full(values.shape, np.nan)
+        previous = values[:, :-1]
+        np.divide(values[:, 1:] - previous, previous, out=result[:, 1:], where=previous > 0)
+
+        return result * 100
+
+    def metric(self, name: str) -> np.ndarray:
+        '''
+        Provides a measure or derived metric of the grid, see METRICS.
+
+        Output:
+        - Array of shape (Länder, years)
+        '''
+        if name in self.measures:
+            return self.measures[name]
+
+        if name not in self.metrics:
+            if name.endswith("_growth"):
+                self.metrics[name] = self.growth(self.metric(name[:-len("_growth")]))
+            elif name.endswith("_net_per_recipient"):
+                benefit = name[:-len("_net_per_recipient")]
+                self.metrics[name] = self.per_recipient(self.metric(f"{benefit}_net_expenditure"), self.metric(f"{benefit}_recipients"))
+            else:
+                raise KeyError(f"{name} is not a metric of the joined grid")
+
+        return self.metrics[name]
+
+    def available_metrics(self) -> dict:
+        '''
+        Metric name -> label of the METRICS holding at least one value, metrics the datasets cannot provide (e.g. growth from a single year) are left out.
+        '''
+        return {name: label for name, label in METRICS.items() if not np.isnan(self.metric(name)).all()}
+
+    def region_mask(self, laender=None) -> np.ndarray:
+        '''
+        Boolean mask of the grid rows of the selected Bundesländer, all rows when laender is None. An empty selection matches no rows, like the other dashboard charts.
+        '''
+        if laender is None:
+            return np.ones(len(self.laender), dtype=bool)
+
+        return np.isin(self.laender, list(laender))
+
+    def frame(self, name: str, laender=None) -> pd.DataFrame:
+        '''
+        Long format dataframe of a metric for the selected Bundesländer, the cells without a value are left out.
+
+        Output:
+        - Dataframe with Länder, Code, Year and the metric column
+        '''
+        mask = self.region_mask(laender)
+        values = self.metric(name)[mask]
+        present = ~np.isnan(values)
+
+        land_index, year_index = np.nonzero(present)
+        return pd.DataFrame({
+            "Länder": self.laender[mask][land_index],
+            "Code": self.codes[mask][land_index],
+            "Year": self.years[year_index],
+            name: values[present],
+        })
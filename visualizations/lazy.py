@@ -0,0 +1,230 @@
+'''
+This section provides the Polars LazyFrame counterpart of the Dataset pipeline. The file_processing -> dtype_conversion -> filter_data -> data_group steps only extend a lazy query plan, which Polars optimizes as a whole (projection and predicate pushdown, multithreaded execution) and collects once when the frames are handed over to pandas for the Visuals.
+'''
+import pandas as pd
+
+from .eda import Dataset, PublicAssistance, BasicSecurity, Subsistence
+
+
+class LazyDataset:
+    '''
+    The LazyDataset class wraps a Dataset object and records its processing steps on a Polars LazyFrame. Calling to_pandas collects every frame in one optimized run and assigns the pandas DataFrames to the wrapped Dataset, matching the attributes of the eager pipeline.
+    '''
+
+    def __init__(self, dataset: Dataset) -> None:
+        '''
+        Instantiates the LazyDataset with the Dataset object holding the file parameters.
+
+        Inputs:
+        - dataset: PublicAssistance, BasicSecurity or Subsistence object
+        '''
+        try:
+            import polars
+        except ImportError as IE:
+            raise ImportError("The polars backend requires the polars package: pip install polars") from IE
+
+        self.pl = polars
+        self.dataset = dataset
+
+        self.frame = None
+        self.numeric_cols = []
+        self.groups = {}
+        self.pivots = {}
+        self.filtered = None
+
+    def scan(self, skip: int, names: list[str], **kwargs):
+        '''
+        Lazily scans the dataset file with every field as text. Polars only decodes utf-8, the encoding lossy Länder names are restored by region_normalization.
+
+        Inputs:
+        - skip: number of lines before the first data row
+        - names: column names assigned to the csv fields
+        '''
+        return self.pl.scan_csv(self.dataset.path_to_file, separator=self.dataset.delimiter, skip_rows=skip, has_header=False,
+                                new_columns=names, infer_schema=False, encoding="utf8-lossy", truncate_ragged_lines=True, **kwargs)
+
+    def region_normalization(self, region_col="Länder"):
+        '''
+        Expression counterpart of Dataset.region_normalization.
+        '''
+        pl = self.pl
+        region = pl.col(region_col)
+
+        return (pl.when(region.str.ends_with("ingen")).then(pl.lit("Thüringen"))
+                .when(region.str.ends_with("ttemberg")).then(pl.lit("Baden-Württemberg"))
+                .otherwise(region).alias(region_col))
+
+    def file_processing(self, columns=None, reference_year=2022):
+        '''
+        Starts the lazy plan for the dataset file, equivalent to file_processing of the wrapped Dataset class.
+
+        Inputs:
+        - columns: column names as given to the eager file_processing, unused for Subsistence
+        - reference_year: year whose periods are selected for BasicSecurity, 2022 as default argument
+
+        Output:
+        - Polars LazyFrame
+        '''
+        pl = self.pl
+        dataset = self.dataset
+
+        if isinstance(dataset, PublicAssistance):
+            frame = self.scan(dataset.skiprows + 1, columns, row_index_name="index")
+            frame = frame.with_columns(pl.col("Year").cast(pl.Int64))
+
+        elif isinstance(dataset, BasicSecurity):
+            labels = dataset.period_labels(dataset.detected_encoding())
+            selected_periods = [label for label in labels if label.startswith(f"{reference_year}-")]
+
+            frame = self.scan(dataset.skiprows + 2, ["Länder", "Gender", *labels], row_index_name="index")
+            # Only the reference year periods are projected, footer notes only populate the first column
+            frame = (frame.select(["index", "Länder", "Gender", *selected_periods])
+                     .rename(dict(zip(selected_periods, columns[2:])))
+                     .filter(pl.col("Gender").is_not_null()))
+
+        elif isinstance(dataset, Subsistence):
+            header = pd.read_csv(dataset.path_to_file, encoding=dataset.detected_encoding(), delimiter=dataset.delimiter, skiprows=dataset.skiprows, nrows=0)
+            columns = list(header.rename(columns=dataset.column_names).columns)
+
+            # Row labels start at 1 as the eager pipeline drops the nationality header row with iloc[1:]
+            frame = self.scan(dataset.skiprows + 2, columns, row_index_name="row_id", row_index_offset=1)
+            frame = frame.filter(pl.col("Year").is_not_null()).with_columns(pl.col("Year").str.slice(0, 4))
+
+        else:
+            raise TypeError(f"{type(dataset).__name__} is not supported by the polars backend")
+
+        self.frame = frame.with_columns(self.region_normalization())
+        return self.frame
+
+    def dtype_conversion(self, *args: str):
+        '''
+        Converts the provided columns to numeric values, non numeric fields become null and are filled with 0 when collected.
+
+        Inputs:
+        - *args: Accepts variable number of columns in the dataset
+        '''
+        pl = self.pl
+        self.numeric_cols = list(args)
+        self.frame = self.frame.with_columns([pl.col(col).cast(pl.Float64, strict=False) for col in args])
+
+        return self.frame
+
+    def filled(self, frame):
+        '''
+        Replaces the null numeric values with 0, the counterpart of fillna(0) in dtype_conversion.
+        '''
+        return frame.with_columns([self.pl.col(col).fill_null(0) for col in self.numeric_cols])
+
+    def filter_data(self, region_col="Länder"):
+        '''
+        Removes the rows containing "Total" in any text column, a predicate Polars pushes down towards the scan.
+
+        Inputs:
+        - region_col: Default set to 'Länder'
+        '''
+        pl = self.pl
+        schema = self.frame.collect_schema()
+        text_cols = [col for col, dtype in schema.items() if dtype == pl.String]
+
+        has_total = pl.any_horizontal([pl.col(col).str.contains("Total", literal=True).fill_null(False) for col in text_cols])
+        self.frame = self.frame.filter(~has_total)
+
+        return self.frame
+
+    def filter_years(self, year_start: int, year_end: int):
+        '''
+        Lazy counterpart of Subsistence.filter_data, the year range becomes the filtered frame.
+
+        Inputs:
+        - year_start: The starting year range
+        - year_end: The final filter year range
+        '''
+        self.filtered = self.frame.filter(self.pl.col("Year").is_between(year_start, year_end))
+
+        return self.filtered
+
+    def data_group(self, cols: list[str], group_element, include_total=False, total_col="Total"):
+        '''
+        Lazy counterpart of Dataset.data_group, collected as the "{group_element}_df" attribute.
+
+        Inputs:
+        - cols: List of columns to sum when merged through groupby
+        - group_element: Name of column to group by, a list groups by several columns
+        - include_total: boolean value to introduce a total column in the aggregation, False as default argument.
+        - total_col: name of the total column, "Total" as default argument
+        '''
+        pl = self.pl
+        group_cols = list(group_element) if isinstance(group_element, (list, tuple)) else [group_element]
+
+        grouped = self.filled(self.frame).group_by(group_cols).agg([pl.col(col).sum() for col in cols]).sort(group_cols)
+        if include_total:
+            grouped = grouped.with_columns(pl.sum_horizontal(cols).alias(total_col))
+
+        self.groups["".join(group_cols)] = (grouped, cols + ([total_col] if include_total else []))
+        return grouped
+
+    def pivot_table(self, columns: list[str], group_element: list[str], values: str, index: str, column_header: str):
+        '''
+        Lazy counterpart of BasicSecurity.pivot_table, the grouping stays lazy and the pivot of the small grouped frame is taken after collecting.
+
+        Inputs:
+        - columns: columns summed into the values column
+        - group_element: columns to group by
+        - values: Pivot Table column "Values"
+        - index: Pivot Table column "Index"
+        - column_header: Pivot Table column headers
+        '''
+        grouped = self.data_group(columns, group_element, include_total=True, total_col=values)
+        self.pivots["".join(group_element)] = (values, index, column_header)
+
+        return grouped
+
+    def to_pandas(self) -> Dataset:
+        '''
+        Collects the base frame and every recorded grouping in one optimized run and assigns the pandas DataFrames to the wrapped Dataset, the boundary towards the Visuals class.
+
+        Output:
+        - The wrapped Dataset object
+        '''
+        pl = self.pl
+        dataset = self.dataset
+
+        # Columns without non numeric fields are int64 in the eager pipeline, mirrored from one aggregation over the base frame
+        integer_check = self.frame.select([
+            (pl.col(col).is_not_null().all() & (pl.col(col) == pl.col(col).floor()).all()).alias(col) for col in self.numeric_cols
+        ])
+
+        plans = [integer_check, self.filled(self.frame)]
+        plans += [grouped for grouped, _ in self.groups.values()]
+        if self.filtered is not None:
+            plans.append(self.filled(self.filtered))
+
+        collected = pl.collect_all(plans)
+        integer_check, base, grouped_frames = collected[0], collected[1], collected[2:2 + len(self.groups)]
+        integer_cols = [col for col in self.numeric_cols if integer_check[col][0]]
+
+        def pandas_frame(frame, integer_columns):
+            frame = frame.with_columns([pl.col(col).cast(pl.Int64) for col in frame.columns if col in integer_columns or col in ("index", "row_id")])
+            df = frame.to_pandas()
+            if "row_id" in df.columns:
+                df = df.set_index("row_id")
+                df.index.name = None
+            return df
+
+        dataset.df = pandas_frame(base, integer_cols)
+        if self.filtered is not None:
+            dataset.register("filtered_df", pandas_frame(collected[-1], integer_cols))
+
+        for (group_key, (_, summed_cols)), grouped in zip(self.groups.items(), grouped_frames):
+            # Totals of integer columns stay integer, like the row sums of the eager pipeline
+            totals = [col for col in summed_cols if col not in self.numeric_cols]
+            integer_totals = totals if all(col in integer_cols for col in summed_cols if col in self.numeric_cols) else []
+            grouped_df = pandas_frame(grouped, integer_cols + integer_totals)
+            dataset.register(f"{group_key}_df", grouped_df)
+
+            if group_key in self.pivots:
+                values, index, column_header = self.pivots[group_key]
+                pivot = grouped_df.pivot_table(values=values, index=index, columns=column_header)
+                dataset.register("pivot_df", pivot)
+
+        return dataset
@@ -0,0 +1,137 @@
+'''
+This section provides the processing chain of each dataset for the pandas and the duckdb backend. The import-time pipeline and the background data refresher run the same steps on a Dataset object, so a refreshed snapshot is built exactly like the one loaded at startup.
+'''
+from .eda import PublicAssistance, BasicSecurity, Subsistence
+
+
+def process_public_assistance(pa: PublicAssistance) -> PublicAssistance:
+    '''
+    Public Assistance Dataframe with its Länder and PublicAssistance groupings.
+    '''
+    pa.file_processing(["Year", "Länder", "TypeCode", "PublicAssistance", "Expenditure(TEUR)", "Revenue(TEUR)", "NetExpenditure(TEUR)"])
+    pa.reported_values(["Expenditure(TEUR)", "Revenue(TEUR)", "NetExpenditure(TEUR)"], data=pa.df, columns=["Year", "Länder", "TypeCode", "PublicAssistance", "Expenditure(TEUR)", "Revenue(TEUR)", "NetExpenditure(TEUR)"])
+    pa.dtype_conversion("Expenditure(TEUR)", "Revenue(TEUR)", "NetExpenditure(TEUR)")
+    pa.filter_data()
+    pa.data_group(cols=["Expenditure(TEUR)", "Revenue(TEUR)", "NetExpenditure(TEUR)"], group_element="Länder")
+    pa.data_group(cols=["Expenditure(TEUR)", "Revenue(TEUR)", "NetExpenditure(TEUR)"], group_element="PublicAssistance")
+
+    return pa
+
+
+def process_basic_security(bsc: BasicSecurity) -> BasicSecurity:
+    '''
+    Basic Security Benefits DataFrame with its pivot table and Gender grouping.
+    '''
+    bsc.file_processing(["Länder", "Gender", "Q1", "Q2", "Q3", "Q4"])
+    bsc.dtype_conversion("Q1", "Q2", "Q3", "Q4")
+    bsc.filter_data()
+    bsc.pivot_table(columns=["Q1", "Q2", "Q3", "Q4"], group_element=["Länder", "Gender"], values="Total", index="Gender", column_header="Länder")
+    bsc.data_group(cols=["Q1", "Q2", "Q3", "Q4"], group_element="Gender", include_total=True)
+
+    return bsc
+
+
+def process_subsistence(sub_benefits: Subsistence) -> Subsistence:
+    '''
+    Subsistence Benefit Recipients Dataframe filtered to the years 2010 - 2022.
+    '''
+    sub_benefits.file_processing()
+    sub_benefits.reported_values(["Year", "Total"], data=sub_benefits.df)
+    sub_benefits.dtype_conversion("Year", "Non-Institution German Males",
+                                  "Non-Institution Foreign Males",
+                                  "Total Non-Insitution Males",
+                                  "Institution German Males",
+                                  "Insitution Foreign Males",
+                                  "Total Institution Males",
+                                  "Total German Males",
+                                  "Total Foreign Males",
+                                  "Total Males",
+                                  "Non-Institution German Females",
+                                  "Non-Institution Foreign Females",
+                                  "Total Non-Insitution Females",
+                                  "Institution German Females",
+                                  "Insitution Foreign Females",
+                                  "Total Institution Females",
+                                  "Total German Females",
+                                  "Total Foreign Females",
+                                  "Total Females",
+                                  "Non-Institution Germans Total",
+                                  "Non-Institution Foreign Total",
+                                  "Non-Institution Total",
+                                  "Institution Germans Total",
+                                  "Institution Foreign Total",
+                                  "Institution Total",
+                                  "Germans Total",
+                                  "Foreign Total",
+                                  "Total",
+                                  )
+    sub_benefits.filter_data(year_start=2010, year_end=2022)
+
+    return sub_benefits
+
+
+def quarterly_assessment(bsc: BasicSecurity):
+    '''
+    Derives the melted quarterly frame with its y-axis maximum and the per period aggregation of a processed BasicSecurity object.
+
+    Output:
+    - melted dataframe and maximum quarterly value
+    '''
+    melted_df, max_quarterly_value = bsc.max_quarterly_assessment(data=bsc.LänderGender_df, cols=["Länder", "Q1", "Q2", "Q3", "Q4"], var_assignment="Quarter", value_name="Value")
+    if not hasattr(bsc, "periods_df"):
+        bsc.period_aggregation(breakdowns=["Gender"])
+
+    return melted_df, max_quarterly_value
+
+
+def reported_assessment(pa: PublicAssistance, sub_benefits: Subsistence) -> None:
+    '''
+    Registers the reported values read by the joined analytics, from the files for the backends that did not derive them during file_processing.
+    '''
+    if not hasattr(pa, "reported_df"):
+        pa.reported_values(["Expenditure(TEUR)", "Revenue(TEUR)", "NetExpenditure(TEUR)"], columns=["Year", "Länder", "TypeCode", "PublicAssistance", "Expenditure(TEUR)", "Revenue(TEUR)", "NetExpenditure(TEUR)"])
+    if not hasattr(sub_benefits, "reported_df"):
+        sub_benefits.reported_values(["Year", "Total"])
+
+
+def query_public_assistance(engine, pa: PublicAssistance) -> PublicAssistance:
+    '''
+    Registers the public assistance table and its Länder and PublicAssistance groupings on a duckdb QueryEngine.
+    '''
+    engine.register_public_assistance(pa, ["Year", "Länder", "TypeCode", "PublicAssistance", "Expenditure(TEUR)", "Revenue(TEUR)", "NetExpenditure(TEUR)"])
+    engine.data_group("public_assistance", cols=["Expenditure(TEUR)", "Revenue(TEUR)", "NetExpenditure(TEUR)"], group_element="Länder", dataset=pa)
+    engine.data_group("public_assistance", cols=["Expenditure(TEUR)", "Revenue(TEUR)", "NetExpenditure(TEUR)"], group_element="PublicAssistance", dataset=pa)
+
+    return pa
+
+
+def query_basic_security(engine, bsc: BasicSecurity) -> BasicSecurity:
+    '''
+    Registers the basic security table, its pivot table and Gender grouping on a duckdb QueryEngine.
+    '''
+    engine.register_basic_security(bsc, ["Länder", "Gender", "Q1", "Q2", "Q3", "Q4"])
+    engine.pivot_table("basic_security", columns=["Q1", "Q2", "Q3", "Q4"], group_element=["Länder", "Gender"], values="Total", index="Gender", column_header="Länder", dataset=bsc)
+    engine.data_group("basic_security", cols=["Q1", "Q2", "Q3", "Q4"], group_element="Gender", include_total=True, dataset=bsc)
+
+    return bsc
+
+
+def query_subsistence(engine, sub_benefits: Subsistence) -> Subsistence:
+    '''
+    Registers the subsistence table filtered to the years 2010 - 2022 on a duckdb QueryEngine.
+    '''
+    engine.register_subsistence(sub_benefits)
+    engine.filter_years("subsistence", year_start=2010, year_end=2022, dataset=sub_benefits)
+
+    return sub_benefits
+
+
+PROCESSORS = {"pa": process_public_assistance, "bsc": process_basic_security, "sub_benefits": process_subsistence}
+
+# duckdb counterparts of the PROCESSORS and the tables each of them registers
+QUERY_PROCESSORS = {"pa": query_public_assistance, "bsc": query_basic_security, "sub_benefits": query_subsistence}
+QUERY_TABLES = {
+    "pa": ["public_assistance", "public_assistance_Länder", "public_assistance_PublicAssistance"],
+    "bsc": ["basic_security", "basic_security_LänderGender", "basic_security_Gender"],
+    "sub_benefits": ["subsistence", "subsistence_filtered"],
+}
@@ -1,7 +1,6 @@
-from urllib.request import urlopen
-from matplotlib import pyplot as plt
 import plotly.express as px
 import plotly.graph_objects as go
+import numpy as np
 import pandas as pd
 import json
 
@@ -49,7 +48,7 @@ class Visuals:
 
         return choro
     
-    def sorted_df_visual(self, data: pd.DataFrame, sort_by: str, asc_order: bool) -> pd.DataFrame:
+    def sorted_df_visual(self, data: pd.DataFrame, sort_by: str, asc_order: bool, summary=None) -> pd.DataFrame:
         '''
         Produces a sorted dataframe defined by the sort_by parameter and returns the sorted Dataframe for a table visual
 
@@ -57,17 +56,21 @@ class Visuals:
         - data: the input pd.DataFrame
         - sort_by: Column to sort by
         - asc_order: Boolean to ascertain the sorting in either acending and descending order
+        - summary: FrameSummary of data, its cached sort order is reused instead of sorting again
 
         Output:
         - Sorted DataFrame object
         '''
-        sorted_df = data.sort_values(by=sort_by, ascending=asc_order)
+        if summary is not None:
+            sorted_df = summary.sorted_view(sort_by, ascending=asc_order)
+        else:
+            sorted_df = data.sort_values(by=sort_by, ascending=asc_order)
 
         print(sorted_df.head(10))
 
         return sorted_df
     
-    def bar_plot_visual(self, data: pd.DataFrame, column_name: str, filter_by: str, value_measure: str, fig_title: str, type_area="Länder", chosen_states=None)-> plt.figure:
+    def bar_plot_visual(self, data: pd.DataFrame, column_name: str, filter_by: str, value_measure: str, fig_title: str, type_area="Länder", chosen_states=None)-> go.Figure:
         '''
         Provides a bar plot visualization from a refined dataframe.
 
@@ -109,7 +112,7 @@ class Visuals:
         return visual
 
 
-    def donut_visual(self, data: pd.DataFrame, grouping_type: str, col_name: str, in_percent=False):
+    def donut_visual(self, data: pd.DataFrame, grouping_type: str, col_name: str, in_percent=False, summary=None):
         '''
         Provides Donut Chart visualization.
 
@@ -117,18 +120,20 @@ class Visuals:
         - data: Dataframe object
         - grouping_type: Column Name as string value to groupby
         - col_name 
+        - in_percent: labels the slices with their percentage shares, passed as trace customdata
+        - summary: FrameSummary of data providing the cached shares
 
         Output:
         - Plotly Donut Chart
         '''
-        if in_percent:
-            totals = data[grouping_type].sum()
-            data = data.copy()
-            data["Percentage"] = data[grouping_type] / totals * 100
-
         do_chart = px.pie(data, values=grouping_type, names=col_name, hole=0.5)
 
         do_chart.update_traces(textposition='inside', textinfo='percent')
+
+        if in_percent:
+            # The cached shares replace the percentages plotly would compute per render
+            shares = summary.shares(grouping_type) if summary is not None else data[grouping_type].to_numpy(dtype=float) / data[grouping_type].sum() * 100
+            do_chart.update_traces(customdata=shares, texttemplate="%{customdata:.1f}%", hovertemplate="%{label}<br>%{value}<br>%{customdata:.1f}%<extra></extra>")
         do_chart.update_layout(
             margin=dict(l=0, r=0, t=50, b=10),
             height=350,
@@ -198,6 +203,33 @@ class Visuals:
         # visual.show()
         return visual
 
+    def joined_metric_heatmap(self, grid, metric: str, title: str, chosen_states=None) -> go.Figure:
+        '''
+        A Länder by Year heatmap of a metric of the joined datasets grid
+
+        Inputs:
+        - grid: JoinedGrid object aligning the three datasets
+        - metric: metric name, see visualizations.joined.METRICS
+        - title
+        - chosen_states (list): filtering component for regions
+        '''
+        mask = grid.region_mask(chosen_states)
+        values = grid.metric(metric)[mask]
+
+        # Years without a value in any selected Bundesland are left out
+        years = ~np.isnan(values).all(axis=0)
+
+        visual = px.imshow(values[:, years], x=grid.years[years].astype(str), y=grid.laender[mask], labels={"x": "Year", "y": "Länder", "color": metric}, title=title, aspect="auto")
+
+        visual.update_layout(
+            plot_bgcolor="rgba(0,0,0,0)",
+            paper_bgcolor="rgba(0,0,0,0)",
+            margin={"l":0, "r":0, "t":40, "b":10},
+            height=600,
+            hovermode="closest"
+        )
+        return visual
+
     def line_progression_chart(self, data: pd.DataFrame, X: str, y: str, hue: str, title: str):
         '''
         A line plot for the Subsistence payments dataset
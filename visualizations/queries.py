@@ -0,0 +1,317 @@
+'''
+This section provides the DuckDB query engine as an alternative backend to the eager pandas aggregations of the Dataset classes. Each GENESIS csv file is read by the native DuckDB csv scanner into an embedded, in-process table and the groupings, pivots and filters are expressed as queries returning the same DataFrame objects as the pandas backend.
+'''
+from functools import partial
+
+import pandas as pd
+
+from .eda import PublicAssistance, BasicSecurity, Subsistence
+
+
+def quote(identifier: str) -> str:
+    '''
+    Quotes a column or table name for use inside a DuckDB query.
+    '''
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def literal(value: str) -> str:
+    '''
+    Quotes a string value for use inside a DuckDB query.
+    '''
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+class QueryEngine:
+    '''
+    The QueryEngine class registers the datasets as DuckDB tables and answers the groupings, pivots and filters of the dashboard through vectorized, multithreaded queries. Each table carries a row_id column holding the index label of the equivalent pandas DataFrame so both backends return identical frames.
+    '''
+    # DuckDB decodes the csv files itself, chardet results are mapped to its encoding names
+    encodings = {"utf-8": "utf-8", "ascii": "utf-8", "iso-8859-1": "latin-1", "latin-1": "latin-1", "windows-1252": "latin-1"}
+
+    def __init__(self, database=":memory:", threads=None) -> None:
+        '''
+        Instantiates the QueryEngine with an embedded DuckDB connection.
+
+        Inputs:
+        - database: DuckDB database file, in memory as default argument
+        - threads: number of DuckDB worker threads, all cores as default
+        '''
+        try:
+            import duckdb
+        except ImportError as IE:
+            raise ImportError("The duckdb backend requires the duckdb package: pip install duckdb") from IE
+
+        self.connection = duckdb.connect(database)
+        if threads:
+            self.connection.execute(f"SET threads TO {int(threads)}")
+
+    def scan(self, dataset, skip: int, names: list[str]) -> str:
+        '''
+        Provides the read_csv table function reading every field of the dataset file as text.
+
+        Inputs:
+        - dataset: Dataset object holding the file parameters
+        - skip: number of lines before the first data row
+        - names: column names assigned to the csv fields
+        '''
+        encoding = dataset.detected_encoding()
+        duck_encoding = self.encodings.get(str(encoding).lower(), "utf-8")
+        column_names = ", ".join(literal(name) for name in names)
+
+        return (f"read_csv({literal(dataset.path_to_file)}, delim={literal(dataset.delimiter)}, skip={int(skip)}, header=false, "
+                f"all_varchar=true, null_padding=true, parallel=false, encoding={literal(duck_encoding)}, names=[{column_names}])")
+
+    def numeric_expressions(self, source: str, numeric_cols: list[str]) -> list[str]:
+        '''
+        Mirrors pd.to_numeric(errors="coerce") followed by fillna(0): columns whose values all parse as integers stay BIGINT, any other column becomes DOUBLE.
+
+        Inputs:
+        - source: query or table holding the raw text columns
+        - numeric_cols: columns to convert
+        '''
+        checks = ", ".join(f"bool_and(TRY_CAST({quote(col)} AS BIGINT) IS NOT NULL)" for col in numeric_cols)
+        integer_columns = self.connection.execute(f"SELECT {checks} FROM ({source})").fetchone()
+
+        expressions = []
+        for col, is_integer in zip(numeric_cols, integer_columns):
+            sql_type = "BIGINT" if is_integer else "DOUBLE"
+            expressions.append(f"COALESCE(TRY_CAST({quote(col)} AS {sql_type}), 0) AS {quote(col)}")
+
+        return expressions
+
+    def region_expression(self, region_col="Länder") -> str:
+        '''
+        Query counterpart of Dataset.region_normalization.
+        '''
+        col = quote(region_col)
+        return f"CASE WHEN {col} LIKE '%ingen' THEN 'Thüringen' WHEN {col} LIKE '%ttemberg' THEN 'Baden-Württemberg' ELSE {col} END AS {col}"
+
+    def total_condition(self, text_cols: list[str]) -> str:
+        '''
+        Query counterpart of Dataset.total_mask, True for rows without "Total" in the text columns.
+        '''
+        return " AND ".join(f"COALESCE({quote(col)}, '') NOT LIKE '%Total%'" for col in text_cols)
+
+    def materialize(self, table: str, query: str) -> pd.DataFrame:
+        '''
+        Stores the query result as a DuckDB table and returns it as a DataFrame indexed by row_id.
+        '''
+        self.connection.execute(f"CREATE OR REPLACE TABLE {quote(table)} AS {query}")
+
+        return self.select(table)
+
+    def register_public_assistance(self, dataset: PublicAssistance, columns: list[str], table="public_assistance") -> pd.DataFrame:
+        '''
+        Registers the public assistance file, equivalent to file_processing, dtype_conversion and filter_data of the pandas backend.
+
+        Inputs:
+        - dataset: PublicAssistance object holding the file parameters
+        - columns: column names, the last three are the expenditure, revenue and net expenditure values
+        - table: DuckDB table name
+
+        Output:
+        - The processed dataframe, also assigned to dataset.df
+        '''
+        raw = f"SELECT row_number() OVER () - 1 AS {quote('index')}, * FROM {self.scan(dataset, dataset.skiprows + 1, columns)}"
+        numeric_cols = columns[-3:]
+        text_cols = [col for col in columns if col not in numeric_cols and col != "Year"]
+
+        selected = [quote("index"), f"CAST({quote('Year')} AS BIGINT) AS {quote('Year')}"]
+        selected += [self.region_expression() if col == "Länder" else quote(col) for col in text_cols]
+        selected += self.numeric_expressions(raw, numeric_cols)
+
+        query = f"""
+            SELECT row_number() OVER (ORDER BY {quote('index')}) - 1 AS row_id, *
+            FROM (SELECT {', '.join(selected)} FROM ({raw}))
+            WHERE {self.total_condition(text_cols)}
+        """
+        dataset.df = self.materialize(table, query)
+        return dataset.df
+
+    def register_basic_security(self, dataset: BasicSecurity, columns: list[str], reference_year=2022, table="basic_security") -> pd.DataFrame:
+        '''
+        Registers the basic security file for the periods of the reference year, equivalent to file_processing, dtype_conversion and filter_data of the pandas backend.
+
+        Inputs:
+        - dataset: BasicSecurity object holding the file parameters
+        - columns: names for the Länder, Gender and the selected period columns
+        - reference_year: year whose periods are selected, 2022 as default argument
+        - table: DuckDB table name
+
+        Output:
+        - The processed dataframe, also assigned to dataset.df
+        '''
+        labels = dataset.period_labels(dataset.detected_encoding())
+        selected_periods = [label for label in labels if label.startswith(f"{reference_year}-")]
+
+        renamed = ", ".join(f"{quote(label)} AS {quote(col)}" for label, col in zip(selected_periods, columns[2:]))
+        # Footer notes only populate the first column
+        raw = f"""
+            SELECT row_number() OVER () - 1 AS {quote('index')}, {quote('Länder')}, {quote('Gender')}, {renamed}
+            FROM {self.scan(dataset, dataset.skiprows + 2, ['Länder', 'Gender', *labels])}
+        """
+        raw = f"SELECT * FROM ({raw}) WHERE {quote('Gender')} IS NOT NULL"
+
+        selected = [quote("index"), self.region_expression(), quote("Gender")] + self.numeric_expressions(raw, columns[2:])
+        query = f"""
+            SELECT row_number() OVER (ORDER BY {quote('index')}) - 1 AS row_id, *
+            FROM (SELECT {', '.join(selected)} FROM ({raw}))
+            WHERE {self.total_condition(['Länder', 'Gender'])}
+        """
+        dataset.df = self.materialize(table, query)
+        return dataset.df
+
+    def register_subsistence(self, dataset: Subsistence, table="subsistence") -> pd.DataFrame:
+        '''
+        Registers the subsistence file, equivalent to file_processing and dtype_conversion of the pandas backend.
+
+        Inputs:
+        - dataset: Subsistence object holding the file parameters
+        - table: DuckDB table name
+
+        Output:
+        - The processed dataframe, also assigned to dataset.df
+        '''
+        header = pd.read_csv(dataset.path_to_file, encoding=dataset.detected_encoding(), delimiter=dataset.delimiter, skiprows=dataset.skiprows, nrows=0)
+        columns = list(header.rename(columns=dataset.column_names).columns)
+        numeric_cols = [col for col in columns if col not in ("Länder", "Year")]
+
+        # The nationality header row is skipped, the footer notes carry no reference date
+        raw = f"SELECT row_number() OVER () AS row_id, * FROM {self.scan(dataset, dataset.skiprows + 2, columns)}"
+        raw = f"SELECT * FROM ({raw}) WHERE {quote('Year')} IS NOT NULL"
+
+        selected = ["row_id", self.region_expression(), f"CAST(left({quote('Year')}, 4) AS BIGINT) AS {quote('Year')}"]
+        selected += self.numeric_expressions(raw, numeric_cols)
+
+        dataset.df = self.materialize(table, f"SELECT {', '.join(selected)} FROM ({raw})")
+        return dataset.df
+
+    def copy_tables(self, engine, tables: list[str]) -> None:
+        '''
+        Copies tables or views of another QueryEngine into this one as tables, e.g. those of the datasets a refresh did not rebuild.
+
+        Inputs:
+        - engine: QueryEngine holding the tables
+        - tables: DuckDB table names
+        '''
+        for table in tables:
+            self.connection.register("copied_table", engine.connection.execute(f"SELECT * FROM {quote(table)}").arrow())
+            self.connection.execute(f"CREATE OR REPLACE TABLE {quote(table)} AS SELECT * FROM copied_table")
+            self.connection.unregister("copied_table")
+
+    def select(self, table: str, equals=None, isin=None) -> pd.DataFrame:
+        '''
+        Filters a registered table with the predicates pushed down into the query.
+
+        Inputs:
+        - table: DuckDB table name
+        - equals: dictionary of column -> value equality predicates
+        - isin: dictionary of column -> list of accepted values
+
+        Output:
+        - Filtered DataFrame object with the pandas index labels
+        '''
+        conditions, parameters = [], []
+        for col, value in (equals or {}).items():
+            conditions.append(f"{quote(col)} = ?")
+            parameters.append(value)
+        for col, values in (isin or {}).items():
+            values = list(values)
+            if not values:
+                conditions.append("false")
+                continue
+            conditions.append(f"{quote(col)} IN ({', '.join('?' for _ in values)})")
+            parameters.extend(values)
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        result = self.connection.execute(f"SELECT * FROM {quote(table)} {where} ORDER BY row_id", parameters).df()
+
+        result = result.set_index("row_id")
+        result.index.name = None
+        return result
+
+    def data_group(self, table: str, cols: list[str], group_element, include_total=False, dataset=None, total_col="Total") -> pd.DataFrame:
+        '''
+        Query counterpart of Dataset.data_group, the result is registered as the "{table}_{group_element}" table.
+
+        Inputs:
+        - table: DuckDB table name
+        - cols: List of columns to sum when merged through groupby
+        - group_element: Name of column to group by, a list groups by several columns
+        - include_total: boolean value to introduce a total column in the aggregation, False as default argument.
+        - dataset: Dataset object receiving the "{group_element}_df" attribute, optional
+        - total_col: name of the total column, "Total" as default argument
+
+        Output:
+        - Groupby Data Frame object
+        '''
+        group_cols = list(group_element) if isinstance(group_element, (list, tuple)) else [group_element]
+        group_key = "".join(group_cols)
+
+        types = dict(self.connection.execute(f"SELECT column_name, column_type FROM (DESCRIBE {quote(table)})").fetchall())
+        sums = [f"CAST(SUM({quote(col)}) AS {types[col]}) AS {quote(col)}" for col in cols]
+        keys = ", ".join(quote(col) for col in group_cols)
+
+        query = f"SELECT {keys}, {', '.join(sums)} FROM {quote(table)} GROUP BY {keys}"
+        if include_total:
+            query = f"SELECT *, {' + '.join(quote(col) for col in cols)} AS {quote(total_col)} FROM ({query})"
+        query = f"SELECT row_number() OVER (ORDER BY {keys}) - 1 AS row_id, * FROM ({query})"
+
+        grouped_data = self.materialize(f"{table}_{group_key}", query)
+        if dataset is not None:
+            dataset.register(f"{group_key}_df", grouped_data, rebuild=partial(self.data_group, table, cols, group_element, include_total, dataset, total_col))
+
+        return grouped_data
+
+    def pivot_table(self, table: str, columns: list[str], group_element: list[str], values: str, index: str, column_header: str, dataset=None) -> pd.DataFrame:
+        '''
+        Query counterpart of BasicSecurity.pivot_table, grouping the table by group_element with a summed values column before pivoting.
+
+        Inputs:
+        - table: DuckDB table name
+        - columns: columns summed into the values column
+        - group_element: columns to group by
+        - values: Pivot Table column "Values"
+        - index: Pivot Table column "Index"
+        - column_header: Pivot Table column headers
+        - dataset: Dataset object receiving the grouped and pivot table attributes, optional
+
+        Output:
+        - Pivot Table in a Pandas Dataframe object
+        '''
+        group_key = "".join(group_element)
+        grouped_data = self.data_group(table, columns, group_element, include_total=True, total_col=values)
+
+        pivot = self.connection.execute(
+            f"PIVOT {quote(f'{table}_{group_key}')} ON {quote(column_header)} USING avg({quote(values)}) GROUP BY {quote(index)} ORDER BY {quote(index)}"
+        ).df()
+
+        pivot = pivot.set_index(index)
+        pivot = pivot[sorted(pivot.columns)]
+        pivot.columns = pd.Index(pivot.columns, dtype=object, name=column_header)
+
+        if dataset is not None:
+            rebuild = partial(self.pivot_table, table, columns, group_element, values, index, column_header, dataset)
+            dataset.register(f"{group_key}_df", grouped_data, rebuild=rebuild)
+            dataset.register("pivot_df", pivot, rebuild=rebuild)
+
+        return pivot
+
+    def filter_years(self, table: str, year_start: int, year_end: int, dataset=None) -> pd.DataFrame:
+        '''
+        Query counterpart of Subsistence.filter_data.
+
+        Inputs:
+        - table: DuckDB table name
+        - year_start: The starting year range
+        - year_end: The final filter year range
+        - dataset: Dataset object receiving the filtered_df attribute, optional
+        '''
+        self.connection.execute(f"CREATE OR REPLACE VIEW {quote(f'{table}_filtered')} AS SELECT * FROM {quote(table)} WHERE {quote('Year')} BETWEEN {int(year_start)} AND {int(year_end)}")
+        filtered_df = self.select(f"{table}_filtered")
+
+        if dataset is not None:
+            dataset.register("filtered_df", filtered_df, rebuild=partial(self.filter_years, table, year_start, year_end, dataset))
+
+        return filtered_df
@@ -0,0 +1,260 @@
+'''
+This section provides the snapshot registry and the background data refresher. The dashboard reads one immutable Snapshot of the datasets per script run from the DatasetRegistry. An asyncio task watches the csv files, rebuilds the changed datasets in a worker thread and swaps a new Snapshot into the registry, so running sessions keep rendering the previous snapshot until the swap and never wait on a rebuild.
+'''
+import os
+import shutil
+import threading
+
+# asyncio and the pipeline, joined and views modules (pandas, numpy) are imported where they are used, so the registry can be created at package import without loading them
+
+
+class Snapshot:
+    '''
+    The Snapshot class bundles one consistent version of the processed datasets and the frames derived from them. The datasets of a registered Snapshot are never replaced, a refresh creates a new one. The joined grid is the only state built later, once under the snapshot lock.
+    '''
+    def __init__(self, pa, bsc, sub_benefits, melted_df, max_quarterly_value, engine=None, views=None) -> None:
+        self.pa = pa
+        self.bsc = bsc
+        self.sub_benefits = sub_benefits
+        self.melted_df = melted_df
+        self.max_quarterly_value = max_quarterly_value
+        self.engine = engine
+        self.views = views
+        self.joined_grid = None
+        self.lock = threading.Lock()
+
+    @property
+    def datasets(self) -> dict:
+        '''
+        Dictionary of dataset name -> Dataset object, the names match the pipeline PROCESSORS.
+        '''
+        return {"pa": self.pa, "bsc": self.bsc, "sub_benefits": self.sub_benefits}
+
+    def joined(self) -> "JoinedGrid":
+        '''
+        The (Länder x Year) grid joining the three datasets, built on first request and reused while none of their df_versions changes.
+        '''
+        from .joined import JoinedGrid
+
+        with self.lock:
+            versions = tuple(dataset.df_version for dataset in self.datasets.values())
+            if self.joined_grid is None or self.joined_grid[0] != versions:
+                self.joined_grid = (versions, JoinedGrid.build(self.pa, self.bsc, self.sub_benefits))
+
+            return self.joined_grid[1]
+
+
+class DatasetRegistry:
+    '''
+    The DatasetRegistry class holds the current Snapshot, loaded on first access.
+    '''
+    def __init__(self, loader) -> None:
+        '''
+        Inputs:
+        - loader: callable returning the initial Snapshot
+        '''
+        self.loader = loader
+        self.current = None
+        self.version = 0
+        self.lock = threading.Lock()
+
+    def snapshot(self) -> Snapshot:
+        '''
+        Provides the current Snapshot. Callers keep the returned object for a whole script run to render from one version.
+        '''
+        if self.current is None:
+            with self.lock:
+                if self.current is None:
+                    self.current = self.loader()
+
+        return self.current
+
+    def swap(self, snapshot: Snapshot) -> int:
+        '''
+        Replaces the current Snapshot. The single reference assignment is atomic, readers see either the old or the new snapshot.
+
+        Output:
+        - version number of the new snapshot
+        '''
+        with self.lock:
+            self.current = snapshot
+            self.version += 1
+
+        print(f"Dataset snapshot {self.version} is live")
+        return self.version
+
+
+class DataRefresher:
+    '''
+    The DataRefresher class watches the source csv files of the registered datasets and hot swaps rebuilt snapshots into the registry.
+    '''
+    def __init__(self, registry: DatasetRegistry, interval=30.0, drop_folder=None, store=None, views_path=None, snapshot=None) -> None:
+        '''
+        Inputs:
+        - registry: DatasetRegistry of the dashboard
+        - interval: polling interval in seconds
+        - drop_folder: folder receiving new GENESIS exports, files named like a source csv replace it before the rebuild once they stopped changing
+        - store: optional DatasetStore, attached when another process already published the new data and published otherwise
+        - views_path: optional materialized views artifact, reloaded for each new snapshot
+        - snapshot: Snapshot whose source files are watched, the current registry snapshot as default. Passed by a registry loader that starts the refresher before its snapshot is registered
+        '''
+        self.registry = registry
+        self.interval = interval
+        self.drop_folder = drop_folder
+        self.store = store
+        self.views_path = views_path
+        self.stopped = False
+        self.drops = {}
+
+        snapshot = registry.snapshot() if snapshot is None else snapshot
+        self.signatures = {name: self.signature(dataset.path_to_file) for name, dataset in snapshot.datasets.items()}
+
+    @staticmethod
+    def signature(path: str):
+        '''
+        Size and modification time of a source file, None when the file is missing.
+        '''
+        from .views import source_signature
+
+        return source_signature([path]).tolist() if os.path.exists(path) else None
+
+    def collect_drops(self) -> None:
+        '''
+        Installs finished exports from the drop folder over the matching source csv files. An export counts as finished once its size and modification time are the same as at the previous poll, exports still being written are left for a later poll.
+        '''
+        if not self.drop_folder or not os.path.isdir(self.drop_folder):
+            return
+
+        pending = {}
+        for dataset in self.registry.snapshot().datasets.values():
+            dropped = os.path.join(self.drop_folder, os.path.basename(dataset.path_to_file))
+            signature = self.signature(dropped)
+            if signature is None:
+                continue
+            if self.drops.get(dropped) != signature:
+                pending[dropped] = signature
+                continue
+
+            try:
+                os.replace(dropped, dataset.path_to_file)
+            except OSError:
+                # The drop folder is on another file system, a copy next to the source file is renamed over it instead
+                staged = f"{dataset.path_to_file}.part"
+                shutil.copyfile(dropped, staged)
+                os.replace(staged, dataset.path_to_file)
+                os.remove(dropped)
+            print(f"Received {dropped}")
+
+        self.drops = pending
+
+    def changed(self) -> list[str]:
+        '''
+        Names of the datasets whose source csv file changed since the last build.
+        '''
+        snapshot = self.registry.snapshot()
+        return [name for name, dataset in snapshot.datasets.items() if self.signature(dataset.path_to_file) != self.signatures[name]]
+
+    def rebuild(self, changed: list[str]) -> Snapshot:
+        '''
+        Builds a new Snapshot in which the changed datasets are processed again from fresh Dataset objects and the other datasets are reused. With the duckdb backend the changed datasets are registered on a new QueryEngine, which also receives copies of the tables of the reused datasets, so sessions on the previous snapshot keep querying the previous tables.
+
+        Inputs:
+        - changed: names of the datasets to rebuild
+        '''
+        from .pipeline import PROCESSORS, QUERY_PROCESSORS, QUERY_TABLES, quarterly_assessment, reported_assessment
+        from .views import MaterializedViews
+
+        current = self.registry.snapshot()
+        datasets = current.datasets
+
+        fresh = {}
+        for name in changed:
+            dataset = datasets[name]
+            fresh[name] = type(dataset)(dataset.path_to_file, dataset.delimiter, dataset.skiprows, dataset.skipfooter, dataset.chunksize, dataset.max_artifact_bytes)
+
+        engine = None
+        if current.engine is not None:
+            from .queries import QueryEngine
+
+            engine = QueryEngine()
+            for name, dataset in datasets.items():
+                if name in fresh:
+                    QUERY_PROCESSORS[name](engine, fresh[name])
+                else:
+                    engine.copy_tables(current.engine, QUERY_TABLES[name])
+
+        # The duckdb backend serves its own tables and does not use the store
+        attached = engine is None and self.store is not None and self.store.attach(fresh)
+        if engine is None and not attached:
+            for name, dataset in fresh.items():
+                PROCESSORS[name](dataset)
+        datasets.update(fresh)
+
+        melted_df, max_quarterly_value = current.melted_df, current.max_quarterly_value
+        if "bsc" in fresh:
+            melted_df, max_quarterly_value = quarterly_assessment(datasets["bsc"])
+        reported_assessment(datasets["pa"], datasets["sub_benefits"])
+
+        if engine is None and self.store is not None and not attached:
+            self.store.publish(datasets)
+
+        views = MaterializedViews.load(self.views_path) if self.views_path else None
+
+        return Snapshot(melted_df=melted_df, max_quarterly_value=max_quarterly_value, engine=engine, views=views, **datasets)
+
+    async def refresh(self):
+        '''
+        Rebuilds the changed datasets off the event loop and swaps the new snapshot into the registry.
+
+        Output:
+        - New registry version, None when nothing changed or the rebuild failed
+        '''
+        import asyncio
+
+        self.collect_drops()
+        changed = self.changed()
+        if not changed:
+            return None
+
+        signatures = {name: self.signature(self.registry.snapshot().datasets[name].path_to_file) for name in changed}
+        try:
+            snapshot = await asyncio.get_running_loop().run_in_executor(None, self.rebuild, changed)
+        except Exception as error:
+            print(f"Refresh of {', '.join(changed)} failed, the previous snapshot stays live: {error}")
+            return None
+        finally:
+            # A broken file is not rebuilt again until it changes
+            self.signatures.update(signatures)
+
+        return self.registry.swap(snapshot)
+
+    async def watch(self) -> None:
+        '''
+        Polls the source files every interval seconds until stop is called.
+        '''
+        import asyncio
+
+        while not self.stopped:
+            await asyncio.sleep(self.interval)
+            await self.refresh()
+
+    def stop(self) -> None:
+        self.stopped = True
+
+
+def start_refresher(registry: DatasetRegistry, interval=30.0, drop_folder=None, store=None, views_path=None, snapshot=None) -> DataRefresher:
+    '''
+    Runs a DataRefresher on its own event loop in a daemon thread, once per registry. See DataRefresher for the inputs.
+
+    Output:
+    - the running DataRefresher
+    '''
+    import asyncio
+
+    refresher = getattr(registry, "refresher", None)
+    if refresher is None:
+        refresher = registry.refresher = DataRefresher(registry, interval=interval, drop_folder=drop_folder, store=store, views_path=views_path, snapshot=snapshot)
+        threading.Thread(target=asyncio.run, args=(refresher.watch(),), name="data-refresher", daemon=True).start()
+        print(f"Watching the dataset files every {interval} seconds")
+
+    return refresher
@@ -0,0 +1,361 @@
+'''
+This section provides the golden-output regression harness of the data preparation. The derived frames and the data arrays of every dashboard figure produced by the pandas pipeline are stored as golden files, and the same Dataset processing is available per backend (pandas, streaming, duckdb, polars) over synthetic GENESIS tables of any size. Optimized code paths are checked against both, so they cannot drift silently from the reference implementation.
+'''
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from .eda import PublicAssistance, BasicSecurity, Subsistence
+from .joined import LAND_CODES
+from .pipeline import process_public_assistance, process_basic_security, process_subsistence, quarterly_assessment, reported_assessment
+
+# Derived frames of each dataset held by the golden files, melted_df is derived from bsc by quarterly_assessment
+GOLDEN_FRAMES = {
+    "pa": ["df", "Länder_df", "PublicAssistance_df"],
+    "bsc": ["df", "LänderGender_df", "pivot_df", "Gender_df"],
+    "sub_benefits": ["filtered_df"],
+}
+
+# Trace properties holding the data of a figure, the layout and styling are not compared
+TRACE_ARRAYS = ["x", "y", "z", "values", "labels", "locations", "customdata"]
+
+PA_COLUMNS = ["Year", "Länder", "TypeCode", "PublicAssistance", "Expenditure(TEUR)", "Revenue(TEUR)", "NetExpenditure(TEUR)"]
+BSC_COLUMNS = ["Länder", "Gender", "Q1", "Q2", "Q3", "Q4"]
+SUB_COLUMNS = [col for col in Subsistence.column_names.values() if col not in ("Länder", "Year")]
+
+BENEFIT_TYPES = {
+    "SOZ-03": "Subsistence payments",
+    "SOZ-04": "Basic sec.benefits in old age,red.earning capacity",
+    "SOZ-05": "Assistance towards healthcare",
+    "SOZ-06": "Integration assistance for disabled people",
+    "SOZ-07": "Assistance for nursing care",
+    "SOZ-08-09": "Assist.in overcoming special soc.difficulties etc.",
+}
+
+SOURCE_FILES = {"pa": "data/public_assistance.csv", "bsc": "data/basic_security_benefits.csv", "sub_benefits": "data/subsistence_benefits.csv"}
+
+GENESIS_FOOTER = ["__________", '"Synthetic table.\n\nGenerated for the regression tests."', "© Federal Statistical Office, Wiesbaden 2024", "created: 2024-06-29 / 18:00:00"]
+
+
+def open_datasets(paths: dict, chunksize=100_000) -> dict:
+    '''
+    Fresh Dataset objects for the GENESIS files, with the layout parameters of the dashboard pipeline.
+
+    Inputs:
+    - paths: dictionary with the "pa", "bsc" and "sub_benefits" csv file paths
+    - chunksize: rows per chunk of the streaming ingest mode
+    '''
+    return {
+        "pa": PublicAssistance(paths["pa"], ";", 5, 7, chunksize=chunksize),
+        "bsc": BasicSecurity(paths["bsc"], ";", skiprows=6, skipfooter=4, chunksize=chunksize),
+        "sub_benefits": Subsistence(path_to_file=paths["sub_benefits"], delimiter=";", skiprows=7, skipfooter=4, chunksize=chunksize),
+    }
+
+
+def derived_frames(datasets: dict, melted_df=None) -> dict:
+    '''
+    Collects the GOLDEN_FRAMES present on the datasets.
+
+    Output:
+    - Dictionary of "dataset.frame" -> DataFrame, with "melted_df" when provided
+    '''
+    frames = {}
+    for name, frame_names in GOLDEN_FRAMES.items():
+        for frame_name in frame_names:
+            # Frames a backend does not produce are left out
+            frame = getattr(datasets[name], frame_name, None)
+            if isinstance(frame, pd.DataFrame):
+                frames[f"{name}.{frame_name}"] = frame
+
+    if melted_df is not None:
+        frames["melted_df"] = melted_df
+
+    return frames
+
+
+def figure_arrays(figures: dict) -> dict:
+    '''
+    Extracts the TRACE_ARRAYS of every trace as plain lists.
+
+    Inputs:
+    - figures: dictionary of figure name -> plotly figure, see DashboardFigures.all_figures
+
+    Output:
+    - Dictionary of figure name -> list of {property: values} per trace, with the trace type and name
+    '''
+    arrays = {}
+    for name, figure in figures.items():
+        arrays[name] = []
+        for trace in figure.data:
+            properties = {"type": trace.type, "name": trace.name}
+            for prop in TRACE_ARRAYS:
+                value = getattr(trace, prop, None)
+                if value is not None:
+                    properties[prop] = np.asarray(value).tolist()
+            arrays[name].append(properties)
+
+    return arrays
+
+
+def save_golden(folder: str, frames: dict, figures: dict) -> None:
+    '''
+    Writes the golden files: one parquet file per frame and figures.json with the figure data arrays.
+    '''
+    os.makedirs(folder, exist_ok=True)
+    for name, frame in frames.items():
+        frame.to_parquet(os.path.join(folder, f"{name}.parquet"))
+
+    with open(os.path.join(folder, "figures.json"), "w", encoding="utf-8") as golden_file:
+        json.dump(figures, golden_file, ensure_ascii=False, indent=1)
+
+    print(f"Golden outputs of {len(frames)} frames and {len(figures)} figures written to {folder}")
+
+
+def load_golden(folder: str):
+    '''
+    Reads the golden files written by save_golden.
+
+    Output:
+    - dictionary of frame name -> DataFrame and dictionary of figure name -> trace arrays
+    '''
+    frames = {file_name[:-len(".parquet")]: pd.read_parquet(os.path.join(folder, file_name)) for file_name in sorted(os.listdir(folder)) if file_name.endswith(".parquet")}
+
+    with open(os.path.join(folder, "figures.json"), encoding="utf-8") as golden_file:
+        figures = json.load(golden_file)
+
+    return frames, figures
+
+
+def default_figures(snapshot):
+    '''
+    DashboardFigures of the initial sidebar selection of the WebApp: the first type of social benefit, the first value measure and all Bundesländer.
+    '''
+    from webview.figures import DashboardFigures
+
+    return DashboardFigures(snapshot.pa.df["PublicAssistance"].unique()[0], "Expenditure(TEUR)", snapshot.pa.Länder_df["Länder"].unique(), snapshot=snapshot)
+
+
+def backend_snapshot(paths: dict, backend="pandas", views=False):
+    '''
+    Snapshot of the datasets processed by one backend, as the dashboard serves them.
+
+    Inputs:
+    - paths: csv file paths, see open_datasets
+    - backend: name of a BACKENDS runner producing the complete datasets, i.e. not streaming
+    - views: serves the region dependent figures from MaterializedViews precomputed from the datasets
+    '''
+    from .refresh import Snapshot
+    from .views import MaterializedViews
+
+    datasets = open_datasets(paths)
+    state = BACKENDS[backend][0](datasets)
+    if views:
+        state["views"] = MaterializedViews.precompute(datasets["pa"], datasets["sub_benefits"])
+
+    return Snapshot(**datasets, **state)
+
+
+def write_golden(folder: str) -> None:
+    '''
+    Snapshots the derived frames and the figure data arrays of the current pandas implementation as golden files. A figure that cannot be built because a file is missing, e.g. the boundaries of the choropleth, keeps its previous golden arrays.
+    '''
+    snapshot = backend_snapshot(SOURCE_FILES)
+    figures = default_figures(snapshot)
+
+    previous = {}
+    if os.path.exists(os.path.join(folder, "figures.json")):
+        with open(os.path.join(folder, "figures.json"), encoding="utf-8") as golden_file:
+            previous = json.load(golden_file)
+
+    arrays = {}
+    for name in figures.figure_names:
+        try:
+            arrays.update(figure_arrays({name: getattr(figures, name)()}))
+        except FileNotFoundError as error:
+            print(f"Figure {name} was not built, {error}")
+            if name in previous:
+                print(f"The previous golden arrays of {name} are kept")
+                arrays[name] = previous[name]
+
+    save_golden(folder, derived_frames(snapshot.datasets, snapshot.melted_df), arrays)
+
+
+def run_pandas(datasets: dict) -> dict:
+    '''
+    Reference implementation, the eager pandas pipeline.
+
+    Output:
+    - Snapshot arguments besides the datasets: melted_df and the maximum quarterly value
+    '''
+    process_public_assistance(datasets["pa"])
+    process_basic_security(datasets["bsc"])
+    process_subsistence(datasets["sub_benefits"])
+
+    melted_df, max_quarterly_value = quarterly_assessment(datasets["bsc"])
+    return {"melted_df": melted_df, "max_quarterly_value": max_quarterly_value}
+
+
+def run_streaming(datasets: dict) -> dict:
+    '''
+    Chunked ingest through stream_processing, which produces the grouped frames and, retaining the rows, the year filtered subsistence frame.
+    '''
+    pa_cols, quarters = PA_COLUMNS[-3:], BSC_COLUMNS[2:]
+    datasets["pa"].stream_processing(numeric_cols=pa_cols, group_elements=["Länder", "PublicAssistance"], columns=PA_COLUMNS)
+    datasets["bsc"].stream_processing(numeric_cols=quarters, group_elements=[["Länder", "Gender"]], columns=BSC_COLUMNS, include_total=True)
+    datasets["bsc"].stream_processing(numeric_cols=quarters, group_elements=["Gender"], columns=BSC_COLUMNS, include_total=True)
+
+    # The subsistence rows hold no Total rows, like its eager pipeline they are not filtered
+    datasets["sub_benefits"].stream_processing(numeric_cols=["Year", *SUB_COLUMNS], group_elements=[], filter_total=False, retain_rows=True)
+    datasets["sub_benefits"].filter_data(year_start=2010, year_end=2022)
+
+    return {}
+
+
+def run_duckdb(datasets: dict) -> dict:
+    '''
+    The DuckDB QueryEngine backend, its engine is part of the returned Snapshot arguments.
+    '''
+    from .queries import QueryEngine
+
+    pa, bsc, sub_benefits = datasets["pa"], datasets["bsc"], datasets["sub_benefits"]
+    pa_cols, quarters = PA_COLUMNS[-3:], BSC_COLUMNS[2:]
+    engine = QueryEngine()
+
+    engine.register_public_assistance(pa, PA_COLUMNS)
+    engine.data_group("public_assistance", cols=pa_cols, group_element="Länder", dataset=pa)
+    engine.data_group("public_assistance", cols=pa_cols, group_element="PublicAssistance", dataset=pa)
+
+    engine.register_basic_security(bsc, BSC_COLUMNS)
+    engine.pivot_table("basic_security", columns=quarters, group_element=["Länder", "Gender"], values="Total", index="Gender", column_header="Länder", dataset=bsc)
+    engine.data_group("basic_security", cols=quarters, group_element="Gender", include_total=True, dataset=bsc)
+
+    engine.register_subsistence(sub_benefits)
+    engine.filter_years("subsistence", year_start=2010, year_end=2022, dataset=sub_benefits)
+
+    melted_df, max_quarterly_value = quarterly_assessment(bsc)
+    reported_assessment(pa, sub_benefits)
+    return {"melted_df": melted_df, "max_quarterly_value": max_quarterly_value, "engine": engine}
+
+
+def run_polars(datasets: dict) -> dict:
+    '''
+    The Polars LazyDataset backend.
+    '''
+    from .lazy import LazyDataset
+
+    pa_cols, quarters = PA_COLUMNS[-3:], BSC_COLUMNS[2:]
+
+    lazy_pa = LazyDataset(datasets["pa"])
+    lazy_pa.file_processing(PA_COLUMNS)
+    lazy_pa.dtype_conversion(*pa_cols)
+    lazy_pa.filter_data()
+    lazy_pa.data_group(cols=pa_cols, group_element="Länder")
+    lazy_pa.data_group(cols=pa_cols, group_element="PublicAssistance")
+    lazy_pa.to_pandas()
+
+    lazy_bsc = LazyDataset(datasets["bsc"])
+    lazy_bsc.file_processing(BSC_COLUMNS)
+    lazy_bsc.dtype_conversion(*quarters)
+    lazy_bsc.filter_data()
+    lazy_bsc.pivot_table(columns=quarters, group_element=["Länder", "Gender"], values="Total", index="Gender", column_header="Länder")
+    lazy_bsc.data_group(cols=quarters, group_element="Gender", include_total=True)
+    lazy_bsc.to_pandas()
+
+    lazy_sub = LazyDataset(datasets["sub_benefits"])
+    lazy_sub.file_processing()
+    lazy_sub.dtype_conversion("Year", *SUB_COLUMNS)
+    lazy_sub.filter_years(year_start=2010, year_end=2022)
+    lazy_sub.to_pandas()
+
+    melted_df, max_quarterly_value = quarterly_assessment(datasets["bsc"])
+    reported_assessment(datasets["pa"], datasets["sub_benefits"])
+    return {"melted_df": melted_df, "max_quarterly_value": max_quarterly_value}
+
+
+# Backend name -> (runner, required module), each runner processes fresh Dataset objects in place
+BACKENDS = {
+    "pandas": (run_pandas, None),
+    "streaming": (run_streaming, None),
+    "duckdb": (run_duckdb, "duckdb"),
+    "polars": (run_polars, "polars"),
+}
+
+
+def process(paths: dict, backend="pandas", chunksize=100_000) -> dict:
+    '''
+    Processes the GENESIS files with one backend.
+
+    Inputs:
+    - paths: csv file paths, see open_datasets
+    - backend: name of the BACKENDS runner
+    - chunksize: rows per chunk of the streaming ingest mode
+
+    Output:
+    - Dictionary of "dataset.frame" -> DataFrame, see derived_frames
+    '''
+    datasets = open_datasets(paths, chunksize=chunksize)
+    state = BACKENDS[backend][0](datasets)
+
+    return derived_frames(datasets, state.get("melted_df"))
+
+
+def write_synthetic_tables(folder: str, years: int, seed=0, missing=0.1) -> dict:
+    '''
+    Writes random tables in the GENESIS csv layouts of the three datasets: title rows, header rows, "Total" rows, "-" and "." placeholders, the Länder names with the lost umlauts of the public assistance export and a quoted multi-line footer note.
+
+    Inputs:
+    - folder: target folder of the csv files
+    - years: number of reference years, the tables grow linearly with it
+    - seed: random generator seed
+    - missing: share of the values written as a placeholder
+
+    Output:
+    - dictionary of the "pa", "bsc" and "sub_benefits" file paths, see open_datasets
+    '''
+    rng = np.random.default_rng(seed)
+    laender = list(LAND_CODES)
+    os.makedirs(folder, exist_ok=True)
+
+    def value(high: int) -> str:
+        return rng.choice(["-", "."]) if rng.random() < missing else str(rng.integers(0, high))
+
+    # Public assistance, one reference year per block, the Total row of each Bundesland closes its block
+    pa_rows = ["GENESIS-Tabelle: 22111-0022", "Public assistance gross expenditure, revenue,;;;;;;", "net expenditure: Länder, years, types of public assistance;;;;;;", "Public assistance expenditure and revenue;;;;;;", ";;;;Gross expenditure;Revenue;Net expenditure", ";;;;Tsd. EUR;Tsd. EUR;Tsd. EUR"]
+    for year in range(2023 - years, 2023):
+        for land in laender:
+            exported_land = land.replace("ü", "�")
+            for code, benefit in BENEFIT_TYPES.items():
+                pa_rows.append(";".join([str(year), exported_land, code, benefit, value(500_000), value(50_000), value(500_000)]))
+            pa_rows.append(";".join([str(year), exported_land, "", "Total", value(5_000_000), value(500_000), value(5_000_000)]))
+
+    # Basic security, one column per quarter reference month, the reference year 2022 is always present
+    bsc_years = range(2023 - max(years, 1), 2023)
+    months = ["March", "June", "September", "December"]
+    bsc_rows = ["GENESIS-Tabelle: 22151-0032", "Recipients of basic security benefits: Länder,", "reference month per quarter, sex/age groups/location of", "benefit provision/public assistance institutions", "Basic security in old age,reduced earning capacity", "Recipients of basic security benefits (number)"]
+    bsc_rows.append(";;" + ";".join(str(year) for year in bsc_years for _ in months))
+    bsc_rows.append(";;" + ";".join(month for _ in bsc_years for month in months))
+    for land in laender:
+        for gender in ["Male", "Female", "Total"]:
+            bsc_rows.append(";".join([land, gender, *(value(100_000) for _ in range(len(bsc_years) * len(months)))]))
+    bsc_rows += GENESIS_FOOTER
+
+    # Subsistence, the three header rows of location, sex and nationality above one row per Bundesland and reference date
+    sub_rows = ["GENESIS-Tabelle: 22121-0011", "Recipients of subsistence payments: Länder, reference date,", "location of benefit provision, sex, nationality", "Statistics of recipients of subsistence payments", "Recipients of subsistence payments (number)"]
+    sub_rows.append(";;" + ";".join(["Location of benefit provision"] * 27))
+    sub_rows.append(";;" + ";".join(location for location in ["Not in institutions", "In institutions", "Total"] for _ in range(9)))
+    sub_rows.append(";;" + ";".join(sex for _ in range(3) for sex in ["Male", "Female", "Total"] for _ in range(3)))
+    sub_rows.append(";;" + ";".join(["Germans", "Foreigners", "Total"] * 9))
+    for land in laender:
+        for year in range(2023 - years * 2, 2023):
+            sub_rows.append(";".join([land, f"{year}-12-31", *(value(200_000) for _ in range(27))]))
+    sub_rows += GENESIS_FOOTER
+
+    paths = {}
+    for name, rows in {"pa": pa_rows, "bsc": bsc_rows, "sub_benefits": sub_rows}.items():
+        paths[name] = os.path.join(folder, f"{name}.csv")
+        with open(paths[name], "w", encoding="utf-8") as table:
+            table.write("\n".join(rows) + "\n")
+
+    return paths
@@ -0,0 +1,143 @@
+'''
+This section provides the shared dataset store. The processed dataframes of every Dataset object are published once as Arrow IPC files on disk, and every Streamlit session, server replica or export worker on the host memory-maps them read-only instead of re-running the pipeline into its own copy. Each publication is written into a new version folder and made current with one atomic rename, so a refresh never changes frames that are already attached.
+'''
+import json
+import os
+import shutil
+import time
+
+from .views import source_signature
+
+
+class DatasetStore:
+    '''
+    The DatasetStore class publishes and attaches the dataframe attributes of Dataset objects:
+
+    - {root}/{version}/{dataset}.{frame}.arrow: one Arrow IPC file per dataframe
+    - {root}/{version}/manifest.json: source signature, frame names and source frame names (read from the file, kept when df changes) of the version
+    - {root}/CURRENT: name of the version attached by new processes
+    '''
+
+    def __init__(self, root: str, keep=2) -> None:
+        '''
+        Instantiates the store on a folder, ideally on a tmpfs such as /dev/shm so the pages live in shared memory.
+
+        Inputs:
+        - root: store folder, created on the first publication
+        - keep: number of versions kept on disk, older versions are removed after a publication
+        '''
+        self.root = root
+        self.keep = keep
+
+    def current_version(self):
+        '''
+        Name of the current version, None before the first publication.
+        '''
+        try:
+            with open(os.path.join(self.root, "CURRENT")) as current:
+                return current.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def manifest(self, version=None):
+        '''
+        Reads the manifest of a version, the current version as default.
+        '''
+        version = version or self.current_version()
+        if version is None:
+            return None
+
+        with open(os.path.join(self.root, version, "manifest.json")) as manifest:
+            return json.load(manifest)
+
+    def publish(self, datasets: dict) -> str:
+        '''
+        Writes the dataframes of the datasets into a new version and swaps it in as the current version.
+
+        Inputs:
+        - datasets: dictionary of dataset name -> processed Dataset object
+
+        Output:
+        - Name of the published version
+        '''
+        import pyarrow as pa
+        from pyarrow import ipc
+
+        version = f"v{time.time_ns()}-{os.getpid()}"
+        folder = os.path.join(self.root, version)
+        os.makedirs(folder)
+
+        manifest = {"sources": [], "frames": {}, "source_frames": {}}
+        for dataset_name, dataset in datasets.items():
+            manifest["sources"].append(dataset.path_to_file)
+            manifest["frames"][dataset_name] = []
+            manifest["source_frames"][dataset_name] = sorted(dataset.sources)
+
+            for frame_name, frame in dataset.frames().items():
+                table = pa.Table.from_pandas(frame, preserve_index=True)
+                with ipc.new_file(os.path.join(folder, f"{dataset_name}.{frame_name}.arrow"), table.schema) as writer:
+                    writer.write_table(table)
+                manifest["frames"][dataset_name].append(frame_name)
+
+        manifest["signature"] = source_signature(manifest["sources"]).tolist()
+        with open(os.path.join(folder, "manifest.json"), "w") as manifest_file:
+            json.dump(manifest, manifest_file)
+
+        # Readers either see the previous or the new version, never a partial one
+        pointer = os.path.join(self.root, f"CURRENT.{os.getpid()}")
+        with open(pointer, "w") as current:
+            current.write(version)
+        os.replace(pointer, os.path.join(self.root, "CURRENT"))
+
+        self.prune()
+        print(f"Published {sum(len(names) for names in manifest['frames'].values())} frames as {version} to {self.root}")
+
+        return version
+
+    def prune(self) -> None:
+        '''
+        Removes all but the newest versions. Processes that attached a removed version keep their mapped pages until they exit.
+        '''
+        versions = sorted((entry for entry in os.listdir(self.root) if entry.startswith("v")), key=lambda entry: int(entry[1:].split("-")[0]))
+        current = self.current_version()
+
+        for version in versions[:-self.keep]:
+            if version != current:
+                shutil.rmtree(os.path.join(self.root, version), ignore_errors=True)
+
+    def attach(self, datasets: dict) -> bool:
+        '''
+        Memory-maps the frames of the current version read-only and assigns them to the datasets. Numeric columns are zero-copy views of the mapped pages, string columns are converted to python objects.
+
+        Inputs:
+        - datasets: dictionary of dataset name -> unprocessed Dataset object
+
+        Output:
+        - True when every dataset was attached, False when the store is empty, incomplete or older than the source csv files
+        '''
+        from pyarrow import ipc, memory_map
+
+        version = self.current_version()
+        if version is None:
+            return False
+
+        manifest = self.manifest(version)
+        if set(datasets) - set(manifest["frames"]):
+            return False
+
+        if not all(os.path.exists(source) for source in manifest["sources"]) or source_signature(manifest["sources"]).tolist() != manifest["signature"]:
+            print(f"Dataset store version {version} is stale, the datasets are processed again")
+            return False
+
+        for dataset_name, dataset in datasets.items():
+            source_frames = manifest.get("source_frames", {}).get(dataset_name, [])
+            for frame_name in manifest["frames"][dataset_name]:
+                source = memory_map(os.path.join(self.root, version, f"{dataset_name}.{frame_name}.arrow"))
+                frame = ipc.open_file(source).read_all().to_pandas(split_blocks=True)
+                if frame_name == "df":
+                    dataset.df = frame
+                else:
+                    dataset.register(frame_name, frame, source=frame_name in source_frames)
+
+        print(f"Attached dataset store version {version} from {self.root}")
+        return True
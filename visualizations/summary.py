@@ -0,0 +1,66 @@
+'''
+This section provides the summary statistics of a derived dataframe. Column totals, maxima, percentage shares and sort orders are computed once per dataset version as numpy arrays, so the donut charts, the progress table and the sorted table views read them instead of copying or re-sorting the dataframe on every Streamlit rerun.
+'''
+import numpy as np
+import pandas as pd
+
+
+class FrameSummary:
+    '''
+    The FrameSummary class holds the statistics of one dataframe. Totals and maxima of the numeric columns are computed on creation, shares and sort orders on first request and kept afterwards.
+    '''
+
+    def __init__(self, frame: pd.DataFrame) -> None:
+        '''
+        Inputs:
+        - frame: DataFrame object, e.g. PublicAssistance_df
+        '''
+        self.frame = frame
+
+        # Missing values are skipped as in the pandas reductions
+        numeric = frame.select_dtypes(include="number")
+        self.totals = numeric.sum().to_dict()
+        self.maxima = numeric.max().to_dict()
+
+        self.share_arrays = {}
+        self.orders = {}
+        self.sorted_views = {}
+
+    def shares(self, col: str) -> np.ndarray:
+        '''
+        Percentage share of each row in the column total.
+        '''
+        if col not in self.share_arrays:
+            self.share_arrays[col] = self.frame[col].to_numpy(dtype=np.float64) / self.totals[col] * 100
+
+        return self.share_arrays[col]
+
+    def order(self, by: str, ascending=True) -> np.ndarray:
+        '''
+        Positional argsort index array of the column, missing values last as in sort_values.
+        '''
+        key = (by, ascending)
+        if key not in self.orders:
+            values = self.frame[by]
+            missing = values.isna().to_numpy()
+            present = np.flatnonzero(~missing)
+
+            # Same tie handling as sort_values: a descending sort argsorts the reversed values
+            if not ascending:
+                present = present[::-1]
+            order = present[np.argsort(values.to_numpy()[present], kind="quicksort")]
+            if not ascending:
+                order = order[::-1]
+            self.orders[key] = np.concatenate([order, np.flatnonzero(missing)])
+
+        return self.orders[key]
+
+    def sorted_view(self, by: str, ascending=True) -> pd.DataFrame:
+        '''
+        The frame in the sort order of the column, taken once and reused afterwards.
+        '''
+        key = (by, ascending)
+        if key not in self.sorted_views:
+            self.sorted_views[key] = self.frame.take(self.order(by, ascending))
+
+        return self.sorted_views[key]
@@ -0,0 +1,183 @@
+'''
+This section provides the materialized views of the dashboard. The sidebar only offers the types of social benefits, three value measures and the Bundesländer, so every aggregate behind the region dependent charts is precomputed offline per Bundesland into a compact numpy artifact. At serve time a region selection becomes a boolean mask and a sum over the precomputed per-Länder slices.
+'''
+import os
+
+import numpy as np
+import pandas as pd
+
+from .eda import PublicAssistance, Subsistence
+
+VALUE_MEASURES = ["Expenditure(TEUR)", "Revenue(TEUR)", "NetExpenditure(TEUR)"]
+
+
+def source_signature(paths: list[str]) -> np.ndarray:
+    '''
+    Size and modification time of the source csv files, stored with the artifact to detect stale views.
+    '''
+    return np.array([[os.stat(path).st_size, os.stat(path).st_mtime_ns] for path in paths], dtype=np.int64)
+
+
+class MaterializedViews:
+    '''
+    The MaterializedViews class holds the precomputed aggregates as labelled numpy arrays:
+
+    - expenditure: array of shape (benefit types, value measures, Länder) summed from the public assistance rows
+    - expenditure_present: boolean array of shape (benefit types, Länder), False where the source has no row for the pair
+    - subsistence: array of shape (Länder, years) of the total subsistence payment recipients
+    - subsistence_present: boolean array of shape (Länder, years), False where the source has no row for the pair
+
+    The absent cells hold 0 in the sums and are left out of the served values, as the dataframes have no row for them.
+    '''
+
+    def __init__(self, benefits, measures, laender, expenditure, expenditure_present, subsistence_laender, years, subsistence, subsistence_present, sources, signature) -> None:
+        '''
+        Instantiates the views from their label and value arrays, see precompute and load.
+        '''
+        self.benefits = np.asarray(benefits, dtype=object)
+        self.measures = list(measures)
+        self.laender = np.asarray(laender, dtype=object)
+        self.expenditure = expenditure
+        self.expenditure_present = expenditure_present
+
+        self.subsistence_laender = np.asarray(subsistence_laender, dtype=object)
+        self.years = years
+        self.subsistence = subsistence
+        self.subsistence_present = subsistence_present
+
+        self.sources = list(sources)
+        self.signature = signature
+
+        self.benefit_index = {benefit: position for position, benefit in enumerate(self.benefits)}
+        self.measure_index = {measure: position for position, measure in enumerate(self.measures)}
+
+    @classmethod
+    def precompute(cls, pa: PublicAssistance, sub_benefits: Subsistence, measures=VALUE_MEASURES, col="PublicAssistance"):
+        '''
+        Offline stage: materializes the aggregates of every (benefit type, value measure) pair per Bundesland.
+
+        Inputs:
+        - pa: processed PublicAssistance object
+        - sub_benefits: processed Subsistence object with its filtered_df
+        - measures: value measure columns offered by the sidebar
+        - col: column holding the types of social benefits, "PublicAssistance" as default argument
+        '''
+        # Labels keep the order of appearance, which is the trace order of the eager figures
+        benefits = pd.unique(pa.df[col])
+        laender = pd.unique(pa.df["Länder"])
+
+        benefit_codes = pd.Index(benefits).get_indexer(pa.df[col])
+        land_codes = pd.Index(laender).get_indexer(pa.df["Länder"])
+
+        expenditure = np.zeros((len(benefits), len(measures), len(laender)), dtype=np.float64)
+        for position, measure in enumerate(measures):
+            np.add.at(expenditure[:, position, :], (benefit_codes, land_codes), pa.df[measure].to_numpy(dtype=np.float64))
+
+        expenditure_present = np.zeros((len(benefits), len(laender)), dtype=bool)
+        expenditure_present[benefit_codes, land_codes] = True
+
+        filtered = sub_benefits.filtered_df
+        subsistence_laender = pd.unique(filtered["Länder"])
+        years = np.sort(pd.unique(filtered["Year"]))
+
+        cells = (pd.Index(subsistence_laender).get_indexer(filtered["Länder"]), np.searchsorted(years, filtered["Year"].to_numpy()))
+        subsistence = np.zeros((len(subsistence_laender), len(years)), dtype=np.float64)
+        np.add.at(subsistence, cells, filtered["Total"].to_numpy(dtype=np.float64))
+
+        subsistence_present = np.zeros((len(subsistence_laender), len(years)), dtype=bool)
+        subsistence_present[cells] = True
+
+        sources = [pa.path_to_file, sub_benefits.path_to_file]
+        return cls(benefits, measures, laender, expenditure, expenditure_present, subsistence_laender, years, subsistence, subsistence_present, sources, source_signature(sources))
+
+    def save(self, path: str) -> str:
+        '''
+        Writes the views as one compressed numpy artifact.
+
+        Inputs:
+        - path: file path of the .npz artifact
+        '''
+        np.savez_compressed(
+            path,
+            benefits=self.benefits.astype(str), measures=np.array(self.measures), laender=self.laender.astype(str), expenditure=self.expenditure, expenditure_present=self.expenditure_present,
+            subsistence_laender=self.subsistence_laender.astype(str), years=self.years, subsistence=self.subsistence, subsistence_present=self.subsistence_present,
+            sources=np.array(self.sources), signature=self.signature,
+        )
+        print(f"Materialized views written to {path}")
+
+        return path
+
+    @classmethod
+    def load(cls, path: str):
+        '''
+        Reads the views artifact, None when it is missing, older than its source csv files or written without the presence masks.
+
+        Inputs:
+        - path: file path of the .npz artifact
+        '''
+        if not os.path.exists(path):
+            return None
+
+        with np.load(path) as artifact:
+            sources = list(artifact["sources"])
+            stale = not all(os.path.exists(source) for source in sources) or not np.array_equal(artifact["signature"], source_signature(sources))
+            if stale or not {"expenditure_present", "subsistence_present"} <= set(artifact.files):
+                print(f"Materialized views {path} are stale, rebuild them with: python main.py --precompute {path}")
+                return None
+
+            return cls(artifact["benefits"], artifact["measures"], artifact["laender"], artifact["expenditure"], artifact["expenditure_present"],
+                       artifact["subsistence_laender"], artifact["years"], artifact["subsistence"], artifact["subsistence_present"], sources, artifact["signature"])
+
+    def region_mask(self, regions, laender=None) -> np.ndarray:
+        '''
+        Boolean mask of the selected Bundesländer over the Länder labels, every Bundesland when regions is None.
+        '''
+        laender = self.laender if laender is None else laender
+        if regions is None:
+            return np.ones(len(laender), dtype=bool)
+
+        return np.isin(laender, list(regions))
+
+    def benefit_by_region(self, benefit: str, measure: str, regions=None):
+        '''
+        Values of one benefit type and value measure for the selected Bundesländer, the Bundesländer without a row for the benefit type are left out.
+
+        Output:
+        - Länder labels and values
+        '''
+        position = self.benefit_index[benefit]
+        mask = self.region_mask(regions) & self.expenditure_present[position]
+        return self.laender[mask], self.expenditure[position, self.measure_index[measure], mask]
+
+    def measure_by_region(self, measure: str, regions=None):
+        '''
+        Value measure summed over the benefit types for the selected Bundesländer, the counterpart of Länder_df.
+
+        Output:
+        - Länder labels and values
+        '''
+        mask = self.region_mask(regions)
+        return self.laender[mask], self.expenditure[:, self.measure_index[measure], mask].sum(axis=0)
+
+    def benefit_totals(self, measure: str, regions=None):
+        '''
+        Value measure per benefit type summed over the selected Bundesländer, the counterpart of PublicAssistance_df.
+
+        Output:
+        - Benefit type labels and values
+        '''
+        mask = self.region_mask(regions)
+        return self.benefits, self.expenditure[:, self.measure_index[measure], mask].sum(axis=1)
+
+    def subsistence_by_region(self, regions=None):
+        '''
+        Yearly subsistence payment recipients of the selected Bundesländer, the (Länder, year) cells without a row in the source are left out.
+
+        Output:
+        - Länder labels, years and values of the present cells in long format, Länder by Länder with ascending years
+        '''
+        mask = self.region_mask(regions, self.subsistence_laender)
+        present = self.subsistence_present[mask]
+        land_rows, year_columns = np.nonzero(present)
+
+        return self.subsistence_laender[mask][land_rows], self.years[year_columns], self.subsistence[mask][present]
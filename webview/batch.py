@@ -0,0 +1,124 @@
+'''
+Headless batch export of the dashboard figures. Renders every figure of the WebApp for a list of sidebar selections without a Streamlit session and writes them as static html, json or png files for the weekly reports.
+'''
+import importlib.util
+import itertools
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+from visualizations import pa
+from visualizations.views import VALUE_MEASURES
+from .figures import DashboardFigures
+
+
+def variant_name(filter_by: str, value_measure: str, region_name: str) -> str:
+    '''
+    Provides a file system friendly folder name for one report variant.
+    '''
+    name = f"{filter_by}_{value_measure}_{region_name}"
+    return re.sub(r"[^\w.-]+", "-", name).strip("-")
+
+
+def default_variants(region_sets=None) -> list[dict]:
+    '''
+    Provides every combination of social benefit type and value measure for the provided region sets.
+
+    Inputs:
+    - region_sets: dictionary of region set name -> list of Bundesländer, all Bundesländer as default
+
+    Output:
+    - List of variant dictionaries with filter_by, value_measure, regions and name keys
+    '''
+    if not region_sets:
+        region_sets = {"all": list(pa.Länder_df["Länder"].unique())}
+
+    variants = []
+    for filter_by, value_measure, (region_name, regions) in itertools.product(pa.df["PublicAssistance"].unique(), VALUE_MEASURES, region_sets.items()):
+        variants.append({
+            "filter_by": filter_by,
+            "value_measure": value_measure,
+            "regions": list(regions),
+            "name": variant_name(filter_by, value_measure, region_name),
+        })
+
+    return variants
+
+
+def export_variant(variant: dict, output_dir: str, formats: tuple) -> tuple[list[str], list[str]]:
+    '''
+    Builds all dashboard figures of one variant and writes them to "{output_dir}/{variant name}/{figure}.{format}". A figure that fails to build or write is reported and the remaining figures are still exported.
+
+    Inputs:
+    - variant: dictionary with filter_by, value_measure, regions and name keys
+    - output_dir: root folder of the export
+    - formats: file formats among html, json and png
+
+    Output:
+    - List of written file paths and list of failure messages
+    '''
+    written, failures = [], []
+    try:
+        figures = DashboardFigures(variant["filter_by"], variant["value_measure"], variant["regions"])
+
+        variant_dir = os.path.join(output_dir, variant["name"])
+        os.makedirs(variant_dir, exist_ok=True)
+    except Exception as error:
+        failures.append(f"{variant['name']}: {type(error).__name__}: {error}")
+        return written, failures
+
+    for figure_name in figures.figure_names:
+        try:
+            figure = getattr(figures, figure_name)()
+
+            for file_format in formats:
+                path = os.path.join(variant_dir, f"{figure_name}.{file_format}")
+                if file_format == "html":
+                    figure.write_html(path, include_plotlyjs="cdn")
+                elif file_format == "json":
+                    figure.write_json(path)
+                elif file_format == "png":
+                    figure.write_image(path)
+                written.append(path)
+        except Exception as error:
+            failures.append(f"{variant['name']}/{figure_name}: {type(error).__name__}: {error}")
+
+    return written, failures
+
+
+def batch_export(variants: list[dict], output_dir: str, formats=("html", "json"), workers=None) -> tuple[list[str], list[str]]:
+    '''
+    Renders the variants in parallel on a process pool. Workers are forked from the process that already loaded the datasets, so every worker shares that single copy instead of re-running the import-time pipeline.
+
+    Inputs:
+    - variants: list of variant dictionaries, see default_variants
+    - output_dir: root folder of the export
+    - formats: file formats among html, json and png
+    - workers: number of worker processes, all cores as default
+
+    Output:
+    - List of written file paths and list of failure messages, one per figure or variant that could not be exported
+    '''
+    formats = tuple(formats)
+    if "png" in formats and importlib.util.find_spec("kaleido") is None:
+        print("png export requires the kaleido package: pip install kaleido, png files are skipped")
+        formats = tuple(file_format for file_format in formats if file_format != "png")
+
+    os.makedirs(output_dir, exist_ok=True)
+
+    # fork shares the loaded datasets copy-on-write, other platforms fall back to re-importing them per worker
+    start_method = "fork" if "fork" in multiprocessing.get_all_start_methods() else None
+    context = multiprocessing.get_context(start_method)
+
+    written, failures = [], []
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        for paths, errors in executor.map(export_variant, variants, itertools.repeat(output_dir), itertools.repeat(formats)):
+            written.extend(paths)
+            failures.extend(errors)
+
+    print(f"Exported {len(variants)} variants, {len(written)} files to {output_dir}")
+    for failure in failures:
+        print(f"Export failed for {failure}")
+
+    return written, failures
@@ -0,0 +1,177 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from visualizations import public_assist, basics, subsistence, registry
+from visualizations.joined import METRICS
+
+# Boundaries of the Bundesländer, resolved from the repository root so the figures do not depend on the working directory
+GEOJSON_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "1_sehr_hoch.geo.json")
+
+class DashboardFigures:
+    '''
+    The DashboardFigures class builds every plotly figure of the dashboard for one sidebar selection. It holds no streamlit calls, so the WebApp sections and the headless batch export render identical figures from the same code.
+    '''
+    # Figure builder methods shown by the WebApp, in dashboard order
+    figure_names = ("choropleth", "benefit_bar", "benefit_donut", "gender_donut", "gender_heatmap", "quarterly_bars", "subsistence_lines", "joined_heatmap")
+
+    def __init__(self, filter_by: str, value_measure: str, region: list[str], col="PublicAssistance", snapshot=None):
+        '''
+        Instantiates the figure builder with the sidebar selection.
+
+        Inputs:
+        - filter_by: Type of Social Benefit shown in the bar plot
+        - value_measure: Expenditure, Revenue or NetExpenditure column
+        - region: selected Bundesländer
+        - col: column holding the types of social benefits, "PublicAssistance" as default argument
+        - snapshot: datasets Snapshot to render from, the current registry snapshot as default
+        '''
+        self.snapshot = registry.snapshot() if snapshot is None else snapshot
+        self.filter_by = filter_by
+        self.value_measure = value_measure
+        self.region = list(region)
+        self.col = col
+
+    def region_query(self, data, table: str, equals=None):
+        '''
+        Filters a dataframe to the selected Bundesländer and optional column values. With the duckdb backend the predicates are pushed down into the registered table instead.
+
+        Inputs:
+        - data: Dataframe object filtered by the pandas backend
+        - table: DuckDB table name holding the same rows
+        - equals: dictionary of column -> value equality predicates
+        '''
+        if self.snapshot.engine is not None:
+            return self.snapshot.engine.select(table, equals=equals, isin={"Länder": self.region})
+
+        region_filter = data["Länder"].isin(self.region)
+        for col, value in (equals or {}).items():
+            region_filter &= data[col] == value
+
+        return data[region_filter]
+
+    def use_views(self, data=None) -> bool:
+        '''
+        True when the figure can be served from the precomputed materialized views, which only cover the default dataframes.
+        '''
+        return self.snapshot.views is not None and data is None
+
+    def choropleth(self):
+        '''
+        Choropleth map of the selected value measure by Bundesland.
+        '''
+        if self.use_views():
+            laender, values = self.snapshot.views.measure_by_region(self.value_measure, self.region)
+            map_region_filter = pd.DataFrame({"Länder": laender, self.value_measure: values})
+            max_net_expenditure = self.snapshot.views.measure_by_region("NetExpenditure(TEUR)")[1].max()
+        else:
+            map_region_filter = self.region_query(self.snapshot.pa.Länder_df, "public_assistance_Länder")
+            max_net_expenditure = self.snapshot.pa.Länder_df["NetExpenditure(TEUR)"].max()
+
+        return public_assist.choropleth_figure(
+                            dataframe=map_region_filter,
+                            dimensions_url=GEOJSON_PATH,
+                            locations="Länder",
+                            color=self.value_measure,
+                            labels={self.value_measure: f"{self.value_measure[:-5]}in Thousand Euros"},
+                            title=f"{self.value_measure} By State in Deutschland",
+                            range_color=(0, max_net_expenditure)
+                            )
+
+    def benefit_bar(self):
+        '''
+        Bar plot of the selected type of social benefit by Bundesland.
+        '''
+        if self.use_views():
+            # An empty selection shows every Bundesland, as chosen_states does
+            laender, values = self.snapshot.views.benefit_by_region(self.filter_by, self.value_measure, self.region or None)
+            bar_data = pd.DataFrame({self.col: self.filter_by, "Länder": laender, self.value_measure: values})
+        elif self.snapshot.engine is not None:
+            bar_data = self.region_query(self.snapshot.pa.df, "public_assistance", equals={self.col: self.filter_by})
+        else:
+            bar_data = self.snapshot.pa.df
+
+        return public_assist.bar_plot_visual(
+                data=bar_data,
+                column_name=self.col,
+                filter_by=self.filter_by,
+                fig_title=f"{self.value_measure} by {self.filter_by}",
+                value_measure=self.value_measure,
+                chosen_states=self.region)
+
+    def benefit_table(self):
+        '''
+        Table view of the public assistance types sorted by name.
+        '''
+        return public_assist.sorted_df_visual(data=self.snapshot.pa.PublicAssistance_df, sort_by="PublicAssistance", asc_order=True, summary=self.snapshot.pa.summary("PublicAssistance_df"))
+
+    def benefit_maxima(self) -> dict:
+        '''
+        Column maxima of the public assistance table, the upper bounds of its progress columns.
+        '''
+        return self.snapshot.pa.summary("PublicAssistance_df").maxima
+
+    def benefit_donut(self):
+        '''
+        Donut chart of the selected value measure by type of social benefit.
+        '''
+        donut_data, summary = self.snapshot.pa.PublicAssistance_df, self.snapshot.pa.summary("PublicAssistance_df")
+        if self.use_views():
+            benefits, values = self.snapshot.views.benefit_totals(self.value_measure)
+            order = np.argsort(benefits)
+            donut_data, summary = pd.DataFrame({self.col: benefits[order], self.value_measure: values[order]}), None
+
+        return public_assist.donut_visual(data=donut_data, grouping_type=self.value_measure, col_name=self.col, in_percent=True, summary=summary)
+
+    def gender_donut(self):
+        '''
+        Donut chart of the basic security benefit recipients by gender.
+        '''
+        return basics.donut_visual(data=self.snapshot.bsc.Gender_df, grouping_type="Total", col_name="Gender")
+
+    def gender_heatmap(self):
+        '''
+        Heatmap of the basic security benefit recipients by gender and Bundesland.
+        '''
+        return basics.generate_heatmap(x="Länder", y="Gender", color_by="Total Value", title="Total Recipients of Basic Security Benefits", pivot_table=self.snapshot.bsc.pivot_df)
+
+    def quarterly_bars(self):
+        '''
+        Grouped bar plot of the quarterly basic security benefit recipients by Bundesland.
+        '''
+        return basics.grouped_bar_plot(data=self.snapshot.melted_df, max_value=self.snapshot.max_quarterly_value, X="Länder", y="Value", color_by="Quarter", title="Quarterly Values for Each Länder", color_sequence=["purple", "blueviolet", "lightblue", "azure"])
+
+    def subsistence_lines(self, data=None):
+        '''
+        Line chart of the subsistence payment recipients over time for the selected Bundesländer.
+
+        Inputs:
+        - data: subsistence dataframe, the year filtered dataframe as default
+        '''
+        if self.use_views(data):
+            laender, years, values = self.snapshot.views.subsistence_by_region(self.region)
+            visual_filter = pd.DataFrame({"Länder": laender, "Year": years, "Total": values})
+        else:
+            data = self.snapshot.sub_benefits.filtered_df if data is None else data
+            visual_filter = self.region_query(data, "subsistence_filtered")
+
+        return subsistence.line_progression_chart(data=visual_filter, X="Year", y="Total", hue="Länder", title="Total Recipients of Subsistence Benefits By Bundesland")
+
+    def joined_heatmap(self, metric="subsistence_net_per_recipient"):
+        '''
+        Heatmap of a metric of the joined datasets by Bundesland and year for the selected Bundesländer.
+
+        Inputs:
+        - metric: metric name of the joined grid, see visualizations.joined.METRICS
+        '''
+        return subsistence.joined_metric_heatmap(grid=self.snapshot.joined(), metric=metric, title=METRICS[metric], chosen_states=self.region)
+
+    def all_figures(self) -> dict:
+        '''
+        Builds every figure shown by the WebApp.
+
+        Output:
+        - Dictionary of figure name -> plotly figure
+        '''
+        return {name: getattr(self, name)() for name in self.figure_names}
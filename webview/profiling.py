@@ -0,0 +1,386 @@
+'''
+Profiling mode of the dashboard. Runs the WebApp headless through the streamlit testing AppTest runner and profiles each section method with cProfile, a stack sampling profiler and tracemalloc. Writes a flame graph per section, the cProfile dumps and a ranked hot-function report that attributes the time to streamlit, the eda.py pandas work, plotly and json serialization, together with the -X importtime breakdown of the cold start.
+'''
+import cProfile
+import os
+import pstats
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter, defaultdict
+from functools import wraps
+
+SECTIONS = ["establish_top_wireframe", "middle_wireframe", "second_dataset", "thirdataset", "joined_datasets"]
+
+# Ordered (path fragment, component) pairs used to attribute a function to a part of the stack
+COMPONENTS = [
+    (os.path.join("visualizations", "eda.py"), "eda.py"),
+    (os.path.join("visualizations", "plots.py"), "plots.py"),
+    ("visualizations", "visualizations"),
+    ("webview", "webview"),
+    (os.path.join("plotly", "io", "_json.py"), "json"),
+    (os.sep + "streamlit" + os.sep, "streamlit"),
+    (os.sep + "plotly" + os.sep, "plotly"),
+    ("_plotly_utils", "plotly"),
+    (os.sep + "pandas" + os.sep, "pandas"),
+    (os.sep + "numpy" + os.sep, "numpy"),
+    (os.sep + "json" + os.sep, "json"),
+    ("_json", "json"),
+    ("importlib", "imports"),
+]
+
+
+def component(filename: str) -> str:
+    '''
+    Attributes a source file to a component of the dashboard stack, e.g. "streamlit", "eda.py" or "plotly".
+    '''
+    for fragment, name in COMPONENTS:
+        if fragment in filename:
+            return name
+
+    return "builtins" if filename == "~" else "other"
+
+
+def frame_label(code) -> str:
+    '''
+    Short "file:function" label of a code object for the flame graphs.
+    '''
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+
+class SectionProfiler:
+    '''
+    The SectionProfiler class wraps the WebApp section methods. While a section runs, cProfile records its calls, a sampler thread records the stacks of the script thread and tracemalloc records its allocations. A section that raises is recorded as a failure and the following sections are still profiled.
+    '''
+
+    def __init__(self, interval=0.005, track_allocations=True) -> None:
+        '''
+        Inputs:
+        - interval: sampling interval of the stack sampler in seconds
+        - track_allocations: enables tracemalloc, which slows down the profiled code
+        '''
+        self.interval = interval
+        self.track_allocations = track_allocations
+
+        self.active = None
+        self.running = False
+        self.sampler = None
+        # The allocations of the profiler itself are left out of the report
+        self.filters = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__), tracemalloc.Filter(False, "<frozen importlib._bootstrap*>")]
+
+        self.profiles = defaultdict(list)
+        self.samples = defaultdict(Counter)
+        self.wall_times = defaultdict(list)
+        self.memory = defaultdict(list)
+        self.failures = defaultdict(list)
+
+    def sample(self) -> None:
+        '''
+        Sampler loop, folds the stack of the active section thread into "outer;...;inner" keys.
+        '''
+        while self.running:
+            active = self.active
+            if active is not None:
+                section, thread_id = active
+                frame = sys._current_frames().get(thread_id)
+
+                stack = []
+                while frame is not None:
+                    stack.append(frame_label(frame.f_code))
+                    frame = frame.f_back
+
+                if stack:
+                    self.samples[section][";".join(reversed(stack))] += 1
+
+            time.sleep(self.interval)
+
+    def wrap(self, section: str, method):
+        '''
+        Profiling wrapper of one section method.
+        '''
+        @wraps(method)
+        def wrapper(*args, **kwargs):
+            profile = cProfile.Profile()
+            if self.track_allocations:
+                before = tracemalloc.take_snapshot().filter_traces(self.filters)
+                tracemalloc.reset_peak()
+                start_memory = tracemalloc.get_traced_memory()[0]
+
+            self.active = (section, threading.get_ident())
+            start = time.perf_counter()
+            profile.enable()
+            try:
+                return method(*args, **kwargs)
+            except Exception as error:
+                # Recorded per run, the script continues with the next section
+                self.failures[section].append((len(self.wall_times[section]) + 1, f"{type(error).__name__}: {error}"))
+            finally:
+                profile.disable()
+                self.wall_times[section].append(time.perf_counter() - start)
+                self.active = None
+                self.profiles[section].append(profile)
+
+                if self.track_allocations:
+                    current, peak = tracemalloc.get_traced_memory()
+                    top = tracemalloc.take_snapshot().filter_traces(self.filters).compare_to(before, "lineno")[:10]
+                    self.memory[section].append({"net": current - start_memory, "peak": peak - start_memory, "top": top})
+        return wrapper
+
+    def instrument(self, app_class) -> dict:
+        '''
+        Replaces the section methods of the WebApp class by their profiling wrappers.
+
+        Output:
+        - dictionary of the original methods, set back once the profiling is done
+        '''
+        originals = {section: getattr(app_class, section) for section in SECTIONS}
+        for section, method in originals.items():
+            setattr(app_class, section, self.wrap(section, method))
+
+        return originals
+
+    def start(self) -> None:
+        '''
+        Starts the stack sampler thread and the allocation tracking.
+        '''
+        if self.track_allocations:
+            tracemalloc.start()
+
+        self.running = True
+        self.sampler = threading.Thread(target=self.sample, name="stack-sampler", daemon=True)
+        self.sampler.start()
+
+    def stop(self) -> None:
+        '''
+        Stops the stack sampler thread and the allocation tracking started by start.
+        '''
+        if self.sampler is None:
+            raise RuntimeError("SectionProfiler.stop was called before start")
+
+        self.running = False
+        self.sampler.join()
+        self.sampler = None
+
+        if self.track_allocations:
+            tracemalloc.stop()
+
+    def stats(self, section: str) -> pstats.Stats:
+        '''
+        cProfile statistics of all runs of a section.
+        '''
+        return pstats.Stats(*self.profiles[section])
+
+
+def flame_graph(folded: Counter, title: str):
+    '''
+    Renders folded stacks as a plotly icicle chart oriented bottom-up like a flame graph, the width of each frame is its share of the samples.
+
+    Inputs:
+    - folded: Counter of "outer;...;inner" stack keys -> sample counts
+    - title: figure title
+    '''
+    import plotly.graph_objects as go
+
+    totals = Counter()
+    for stack, count in folded.items():
+        frames = stack.split(";")
+        for depth in range(1, len(frames) + 1):
+            totals[";".join(frames[:depth])] += count
+
+    ids = list(totals)
+    figure = go.Figure(go.Icicle(
+        ids=ids,
+        labels=[node.rsplit(";", 1)[-1] for node in ids],
+        parents=[node.rsplit(";", 1)[0] if ";" in node else "" for node in ids],
+        values=[totals[node] for node in ids],
+        branchvalues="total",
+        tiling={"orientation": "v", "flip": "y"},
+        hovertemplate="%{label}<br>%{value} samples<br>%{percentRoot:.1%} of the section<extra></extra>",
+    ))
+    figure.update_layout(title=title, margin={"l": 0, "r": 0, "t": 40, "b": 0}, height=900)
+
+    return figure
+
+
+def hot_functions(profiler: SectionProfiler):
+    '''
+    Ranks the profiled functions of every section by their own time.
+
+    Output:
+    - DataFrame with section, component, function, ncalls, tottime and cumtime columns, sorted by tottime
+    '''
+    import pandas as pd
+
+    rows = []
+    for section in profiler.profiles:
+        for (filename, line, function), (_, ncalls, tottime, cumtime, _) in profiler.stats(section).stats.items():
+            rows.append({
+                "section": section,
+                "component": component(filename),
+                "function": f"{os.path.basename(filename)}:{line}({function})",
+                "ncalls": ncalls,
+                "tottime": tottime,
+                "cumtime": cumtime,
+            })
+
+    ranked = pd.DataFrame(rows, columns=["section", "component", "function", "ncalls", "tottime", "cumtime"])
+    return ranked.sort_values("tottime", ascending=False).reset_index(drop=True)
+
+
+def write_report(profiler: SectionProfiler, output_dir: str, exceptions=(), top=30) -> str:
+    '''
+    Writes the profiling results to output_dir:
+
+    - {section}.prof: cProfile dump of all runs, readable with pstats or snakeviz
+    - {section}.folded: folded sampled stacks, readable with flamegraph.pl or speedscope
+    - flamegraph_{section}.html: flame graph of the sampled stacks
+    - hot_functions.csv: every profiled function ranked by tottime
+    - report.txt: section timings, memory, failed runs, component attribution and the top hot functions
+
+    Output:
+    - path of report.txt
+    '''
+    os.makedirs(output_dir, exist_ok=True)
+    ranked = hot_functions(profiler)
+    ranked.to_csv(os.path.join(output_dir, "hot_functions.csv"), index=False)
+
+    lines = ["Dashboard rerun profile", ""]
+    for error in exceptions:
+        lines.append(f"Exception during the run: {error}")
+    for section, failures in profiler.failures.items():
+        lines += [f"Section {section} failed in run {run}: {error}" for run, error in failures]
+
+    lines.append(f"{'section':<26}{'runs':>6}{'failed':>8}{'mean s':>10}{'max s':>10}{'peak MiB':>10}{'net MiB':>10}")
+    for section in SECTIONS:
+        if section not in profiler.profiles:
+            continue
+
+        profiler.stats(section).dump_stats(os.path.join(output_dir, f"{section}.prof"))
+        with open(os.path.join(output_dir, f"{section}.folded"), "w") as folded:
+            folded.writelines(f"{stack} {count}\n" for stack, count in profiler.samples[section].items())
+        if profiler.samples[section]:
+            flame_graph(profiler.samples[section], f"{section}: sampled stacks").write_html(os.path.join(output_dir, f"flamegraph_{section}.html"), include_plotlyjs="cdn")
+
+        wall_times = profiler.wall_times[section]
+        memory = profiler.memory.get(section, [])
+        peak = max((run["peak"] for run in memory), default=0) / 2 ** 20
+        net = sum(run["net"] for run in memory) / 2 ** 20
+        lines.append(f"{section:<26}{len(wall_times):>6}{len(profiler.failures.get(section, [])):>8}{sum(wall_times) / len(wall_times):>10.3f}{max(wall_times):>10.3f}{peak:>10.1f}{net:>10.1f}")
+
+    attribution = ranked.pivot_table(values="tottime", index="component", columns="section", aggfunc="sum", fill_value=0)
+    attribution["total"] = attribution.sum(axis=1)
+    lines += ["", "Own time in seconds by component", attribution.sort_values("total", ascending=False).round(3).to_string()]
+
+    lines += ["", f"Top {top} functions by own time", ranked.head(top).round(4).to_string(index=False)]
+
+    for section, runs in profiler.memory.items():
+        lines += ["", f"Top allocation sites of {section} (last run)"]
+        lines += [str(statistic) for statistic in runs[-1]["top"]]
+
+    path = os.path.join(output_dir, "report.txt")
+    with open(path, "w") as report:
+        report.write("\n".join(lines) + "\n")
+
+    print(f"Profile written to {output_dir}")
+    return path
+
+
+def import_time_report(output_dir: str, module="webview.wireframe", top=30) -> str:
+    '''
+    Imports module in a fresh interpreter with -X importtime and writes the breakdown to output_dir:
+
+    - importtime.log: raw -X importtime output
+    - importtime.txt: total import time, self time per top-level package and the slowest modules by cumulative time
+
+    Inputs:
+    - module: entry module of the cold start, the visualizations pipeline runs as part of its import
+    - top: number of modules listed
+
+    Output:
+    - path of importtime.txt
+    '''
+    import pandas as pd
+
+    os.makedirs(output_dir, exist_ok=True)
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], capture_output=True, text=True)
+    with open(os.path.join(output_dir, "importtime.log"), "w") as log:
+        log.write(result.stderr)
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        rows.append({"module": name.strip(), "package": name.strip().split(".")[0], "self_ms": int(own) / 1000, "cumulative_ms": int(cumulative) / 1000})
+    imports = pd.DataFrame(rows, columns=["module", "package", "self_ms", "cumulative_ms"])
+
+    lines = [f"Import time of {module}", ""]
+    if result.returncode != 0:
+        lines.append(f"Import failed: {result.stderr.strip().splitlines()[-1]}")
+    else:
+        lines.append(f"Total: {imports.loc[imports['module'] == module, 'cumulative_ms'].max():.1f} ms")
+        packages = imports.groupby("package")["self_ms"].sum().sort_values(ascending=False)
+        lines += ["", "Self time in ms by top-level package", packages.head(top).round(1).to_string()]
+        lines += ["", f"Top {top} modules by cumulative time", imports.nlargest(top, "cumulative_ms").round(1).to_string(index=False)]
+
+    path = os.path.join(output_dir, "importtime.txt")
+    with open(path, "w") as report:
+        report.write("\n".join(lines) + "\n")
+
+    return path
+
+
+def run_dashboard():
+    '''
+    Script executed by the AppTest runner.
+    '''
+    from webview.wireframe import WebApp
+
+    WebApp()
+
+
+def profile_dashboard(output_dir: str, runs=3, interval=0.005, track_allocations=True, timeout=120) -> int:
+    '''
+    Profiles full WebApp reruns under the headless streamlit AppTest runner, after the import time report of the cold start. The first run includes the cold figure caches, the following runs are the reruns of an interacting session.
+
+    Inputs:
+    - output_dir: folder receiving the report, dumps and flame graphs
+    - runs: number of script runs of one session
+    - interval: stack sampling interval in seconds
+    - track_allocations: enables tracemalloc allocation tracking
+    - timeout: seconds allowed per script run
+
+    Output:
+    - exit status, 1 when a section failed or the script raised, 0 otherwise
+    '''
+    # Measured first in a fresh interpreter, the imports below warm up this process
+    import_time_report(output_dir)
+
+    from streamlit.testing.v1 import AppTest
+    from webview.wireframe import WebApp
+
+    profiler = SectionProfiler(interval=interval, track_allocations=track_allocations)
+    originals = profiler.instrument(WebApp)
+    profiler.start()
+
+    exceptions = []
+    try:
+        app = AppTest.from_function(run_dashboard, default_timeout=timeout)
+        for _ in range(runs):
+            app.run()
+            exceptions.extend(error.value for error in app.exception)
+    finally:
+        profiler.stop()
+        for section, method in originals.items():
+            setattr(WebApp, section, method)
+
+    write_report(profiler, output_dir, exceptions)
+
+    failed = [section for section in SECTIONS if profiler.failures.get(section)]
+    if failed or exceptions:
+        print(f"Profiling run failed in the sections {failed} with {len(exceptions)} script exceptions, see report.txt")
+        return 1
+
+    return 0
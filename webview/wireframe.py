@@ -1,6 +1,6 @@
+import sys
 import streamlit
-import altair
-from visualizations import public_assist, pa, bsc, basics, melted_df, max_quarterly_value, sub_benefits, subsistence
+from visualizations import registry
 
 class WebApp:
     '''
@@ -19,20 +19,29 @@ class WebApp:
         '''
         self.title = title
         self.icon = icon
+
+        # The page is configured before the datasets load, so the first paint does not wait on the pipeline
+        self.page_configuration()
+
+        # One snapshot per script run, a refresh swapped in meanwhile is picked up by the next run
+        with streamlit.spinner("Loading the datasets"):
+            self.snapshot = registry.snapshot()
         self.col: str = "PublicAssistance"
-        self.filter_by_benefit: iter = pa.df[self.col].unique()
+        self.filter_by_benefit: iter = self.snapshot.pa.df[self.col].unique()
         self.values = ["Expenditure(TEUR)", "Revenue(TEUR)", "NetExpenditure(TEUR)"]
 
-        # Altair visualization sets the backgroun theme to darkmode
-        altair.themes.enable("dark")
+        # Altair visualization sets the backgroun theme to darkmode. The charts are drawn with plotly, so altair is not imported for the theme alone
+        altair = sys.modules.get("altair")
+        if altair is not None:
+            altair.themes.enable("dark")
 
         # Method calls upon instantiation to load the visualizations directly as the program loads up, all parameters are defined within each function definition with their respective datasets
-        self.page_configuration()
         self.develop_sidebar()
         self.establish_top_wireframe()
         self.middle_wireframe()
         self.second_dataset()
-        self.thirdataset(data=sub_benefits.filtered_df)
+        self.thirdataset()
+        self.joined_datasets()
 
     def page_configuration(self, theme="dark"):
         '''
@@ -60,7 +69,7 @@ class WebApp:
             self.value_measure: iter = streamlit.selectbox("Filter by Exp, Rev, NetExp", self.values)
 
 
-            self.region: str = streamlit.multiselect("Select Bundesland", pa.Länder_df["Länder"].unique(), default=pa.Länder_df["Länder"].unique())
+            self.region: str = streamlit.multiselect("Select Bundesland", self.snapshot.pa.Länder_df["Länder"].unique(), default=self.snapshot.pa.Länder_df["Länder"].unique())
 
             streamlit.markdown("***")
             streamlit.markdown("This project is part of the M605A Advanced Programming Module in GISMA University of Applied Sciences")
@@ -68,6 +77,11 @@ class WebApp:
             streamlit.markdown("Collaborators: Hamza Saleem | Durdona Juraeva")
             streamlit.markdown("***")
 
+        # Figure builder shared with the headless batch export, imported with plotly once the sidebar is drawn
+        from .figures import DashboardFigures
+
+        self.figures = DashboardFigures(self.filter_by, self.value_measure, self.region, col=self.col, snapshot=self.snapshot)
+
     def establish_top_wireframe(self):
         '''
         Creates the user first view container. The first container embodies the choropleth figure from the PublicAssistance Dataset, combined with the topic header and explanations.
@@ -79,19 +93,7 @@ class WebApp:
 
             streamlit.markdown("Deutschland's tax contribution bracket is coupled with social benefit payments - supported by the Sozialamt. This dashboard highlights the overall expenditures within this sector and looks into two specific areas: Basic Security benefits & Subsistence Payments.")
 
-            map_region_filter = pa.Länder_df[pa.Länder_df["Länder"].isin(self.region)] 
-
-
-
-            deutschland_map = public_assist.choropleth_figure(
-                                dataframe=map_region_filter,
-                                dimensions_url="1_sehr_hoch.geo.json", 
-                                locations="Länder", 
-                                color=self.value_measure, 
-                                labels={self.value_measure: f"{self.value_measure[:-5]}in Thousand Euros"}, 
-                                title=f"{self.value_measure} By State in Deutschland", 
-                                range_color=(0, pa.Länder_df["NetExpenditure(TEUR)"].max())
-                                )
+            deutschland_map = self.figures.choropleth()
             streamlit.plotly_chart(deutschland_map, use_container_width=True)
 
     def middle_wireframe(self):
@@ -100,20 +102,15 @@ class WebApp:
         '''
         with streamlit.container():
             
-            barplot_visual = public_assist.bar_plot_visual(
-                    data=pa.df, 
-                    column_name=self.col, 
-                    filter_by=self.filter_by, 
-                    fig_title=f"{self.value_measure} by {self.filter_by}", 
-                    value_measure=self.value_measure,
-                    chosen_states=self.region)
+            barplot_visual = self.figures.benefit_bar()
             
             streamlit.plotly_chart(barplot_visual)
 
             col1, col2 = streamlit.columns(2, gap="small")
 
             with col1:
-                table_view = public_assist.sorted_df_visual(data=pa.PublicAssistance_df, sort_by="PublicAssistance", asc_order=True)
+                table_view = self.figures.benefit_table()
+                maxima = self.figures.benefit_maxima()
 
                 streamlit.dataframe(
                     table_view,
@@ -125,25 +122,25 @@ class WebApp:
                             "Expenditure(TEUR)",
                             format="%f",
                             min_value=0,
-                            max_value=max(table_view["Expenditure(TEUR)"])
+                            max_value=maxima["Expenditure(TEUR)"]
                         ),
                         "Revenue(TEUR)": streamlit.column_config.ProgressColumn(
                             "Revenue",
                             format="%f",
                             min_value=0,
-                            max_value=max(table_view["Revenue(TEUR)"])
+                            max_value=maxima["Revenue(TEUR)"]
                         ),
                         "NetExpenditure(TEUR)": streamlit.column_config.ProgressColumn(
                             "NetExpenditure(TEUR)",
                             format="%f",
                             min_value=0,
-                            max_value=max(table_view["NetExpenditure(TEUR)"])
+                            max_value=maxima["NetExpenditure(TEUR)"]
                         )
                     }
                 )
 
             with col2:
-                do_visual = public_assist.donut_visual(data=pa.PublicAssistance_df, grouping_type=self.value_measure, col_name=self.col, in_percent=True)
+                do_visual = self.figures.benefit_donut()
 
                 streamlit.plotly_chart(do_visual)
 
@@ -157,52 +154,49 @@ class WebApp:
             col1, col2 = streamlit.columns(2, gap="medium")
 
             with col1:
-                do_chart = basics.donut_visual(data=bsc.Gender_df, grouping_type="Total", col_name="Gender")
+                do_chart = self.figures.gender_donut()
 
                 streamlit.plotly_chart(do_chart)
             
             with col2:
-                htmp = basics.generate_heatmap(x="Länder", y="Gender", color_by="Total Value", title="Total Recipients of Basic Security Benefits", pivot_table=bsc.pivot_table)
+                htmp = self.figures.gender_heatmap()
 
                 streamlit.plotly_chart(htmp)
 
 
-            grouped_bar = basics.grouped_bar_plot(data=melted_df, max_value=max_quarterly_value, X="Länder", y="Value", color_by="Quarter", title="Quarterly Values for Each Länder", color_sequence=["purple", "blueviolet", "lightblue", "azure"])
+            grouped_bar = self.figures.quarterly_bars()
 
             streamlit.plotly_chart(grouped_bar)
 
 
-    def thirdataset(self, data: object):
+    def thirdataset(self, data=None):
         '''
         Focusing the Subsistence Payment section of the relationships in social benefits. The Subsistence Payments relationship over time.
+
+        Inputs:
+        - data: subsistence dataframe, without it the materialized views are used when loaded and the year filtered dataframe otherwise
         '''
         with streamlit.container():
             streamlit.subheader("Social Benefits: Subsistence Payment Recipients", divider="blue")
             
             
             
-            visual_filter = data[sub_benefits.filtered_df["Länder"].isin(self.region)]
-
-            visual = subsistence.line_progression_chart(data=visual_filter, X="Year", y="Total", hue="Länder", title="Total Recipients of Subsistence Benefits By Bundesland")
+            visual = self.figures.subsistence_lines(data=data)
 
             streamlit.plotly_chart(visual)
 
 
+    def joined_datasets(self):
+        '''
+        Joins the three datasets on the Bundesland and year to relate the expenditure to its recipients. The metric is chosen within the section and shown for the Bundesländer of the sidebar selection.
+        '''
+        with streamlit.container():
+            streamlit.subheader("Social Benefits: Expenditure per Recipient and Growth", divider="green")
 
+            # Metrics without any value in the datasets are not offered
+            metrics = self.snapshot.joined().available_metrics()
+            metric = streamlit.selectbox("Metric", list(metrics), format_func=metrics.get)
 
+            visual = self.figures.joined_heatmap(metric=metric)
 
-
-                
-
-
-
-        
-
-
-
-
-
-
-
-
-
+            streamlit.plotly_chart(visual, use_container_width=True)